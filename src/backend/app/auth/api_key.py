@@ -15,20 +15,84 @@
 #     You should have received a copy of the GNU General Public License
 #     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
 #
-"""API key authentication dependencies and helpers."""
+"""API key authentication dependencies and helpers.
 
+Scripted integrations authenticate every request with an API key, so key
+lookups are cached per worker (see app.auth.auth_cache) and last_used_at
+timestamps are buffered in memory, then written in batches by a background
+task. A key's first recorded use is still written immediately.
+"""
+
+import asyncio
 import hashlib
+import logging
 import secrets
+from contextlib import suppress
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
 
 from hotosm_auth_litestar import get_current_user
-from litestar import Request
+from litestar import Litestar, Request
 from litestar import status_codes as status
 from litestar.exceptions import HTTPException
 from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool
 
+from app.auth.auth_cache import api_key_cache
 from app.auth.auth_schemas import AuthUser
+from app.config import settings
+from app.db.database import DbPool
 from app.db.models import DbApiKey, DbUser
 
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CachedApiKey:
+    """An authenticated API key, as held in the api_key_cache."""
+
+    key_id: int
+    user: AuthUser
+
+
+class LastUsedBuffer:
+    """Collect API key usage in memory and flush it in a single UPDATE."""
+
+    def __init__(self):
+        """Initialise an empty buffer."""
+        self._pending: dict[int, datetime] = {}
+
+    def record(self, key_id: int) -> None:
+        """Record that a key was used now."""
+        self._pending[key_id] = datetime.now(timezone.utc)
+
+    def __len__(self) -> int:
+        """Number of keys waiting to be flushed."""
+        return len(self._pending)
+
+    async def flush(self, db: AsyncConnection) -> int:
+        """Write all pending timestamps, returning the number of keys updated.
+
+        On failure the timestamps are put back, so the next flush retries them.
+        """
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, {}
+        try:
+            await DbApiKey.bulk_touch_last_used(db, pending)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            for key_id, used_at in pending.items():
+                self._pending[key_id] = max(used_at, self._pending.get(key_id, used_at))
+            raise
+        return len(pending)
+
+
+last_used_buffer = LastUsedBuffer()
+
 
 def generate_api_key() -> str:
     """Generate a random API key (shown once to the user)."""
@@ -60,6 +124,11 @@ async def _authenticate_api_key(db: AsyncConnection, raw_api_key: str) -> AuthUs
         )
 
     key_hash = hash_api_key(raw_api_key)
+    cached: Optional[CachedApiKey] = api_key_cache.get(key_hash)
+    if cached is not None:
+        _record_last_used(cached.key_id)
+        return cached.user.model_copy()
+
     db_key = await DbApiKey.get_by_hash(db, key_hash)
     if not db_key or not db_key.user_sub:
         raise HTTPException(
@@ -75,15 +144,72 @@ async def _authenticate_api_key(db: AsyncConnection, raw_api_key: str) -> AuthUs
             detail="API key user no longer exists",
         ) from e
 
-    await DbApiKey.touch_last_used(db, db_key.id)
-    await db.commit()
+    if db_key.last_used_at is None or settings.API_KEY_LAST_USED_FLUSH_SECONDS <= 0:
+        # Write through, so a newly issued key shows as used straight away
+        await DbApiKey.touch_last_used(db, db_key.id)
+        await db.commit()
+    else:
+        last_used_buffer.record(db_key.id)
 
-    return AuthUser(
+    auth_user = AuthUser(
         sub=db_user.sub,
         username=db_user.username or "unknown",
         is_admin=bool(db_user.is_admin),
         profile_img=db_user.profile_img,
     )
+    api_key_cache.set(key_hash, CachedApiKey(key_id=db_key.id, user=auth_user))
+    return auth_user.model_copy()
+
+
+def _record_last_used(key_id: int) -> None:
+    """Buffer a key usage, unless batching is disabled."""
+    if settings.API_KEY_LAST_USED_FLUSH_SECONDS > 0:
+        last_used_buffer.record(key_id)
+
+
+async def _flush_last_used(db_pool: AsyncConnectionPool) -> None:
+    """Flush buffered key usage, logging rather than raising on failure."""
+    if not len(last_used_buffer):
+        return
+    try:
+        async with db_pool.connection() as conn:
+            flushed = await last_used_buffer.flush(conn)
+        log.debug(f"Flushed last_used_at for {flushed} API keys")
+    except Exception as e:
+        log.warning(f"Failed to flush API key last_used_at: {e}")
+
+
+async def _flush_last_used_periodically(db_pool: AsyncConnectionPool) -> None:
+    """Background loop flushing buffered key usage."""
+    while True:
+        await asyncio.sleep(settings.API_KEY_LAST_USED_FLUSH_SECONDS)
+        await _flush_last_used(db_pool)
+
+
+async def start_api_key_last_used_flusher(server: Litestar) -> None:
+    """Start the background last_used_at flusher (Litestar startup hook)."""
+    if settings.API_KEY_LAST_USED_FLUSH_SECONDS <= 0:
+        return
+    server.state.api_key_flush_task = asyncio.create_task(
+        _flush_last_used_periodically(server.state.db_pools[DbPool.MAINTENANCE])
+    )
+
+
+async def stop_api_key_last_used_flusher(server: Litestar) -> None:
+    """Stop the flusher and write any remaining usage (Litestar shutdown hook).
+
+    Must run before the DB pool is closed.
+    """
+    task = getattr(server.state, "api_key_flush_task", None)
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        server.state.api_key_flush_task = None
+
+    db_pool = getattr(server.state, "db_pools", {}).get(DbPool.MAINTENANCE)
+    if db_pool is not None and not db_pool.closed:
+        await _flush_last_used(db_pool)
 
 
 async def api_key_required(
@@ -0,0 +1,151 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Short-lived caches for authentication and authorisation lookups.
+
+There are two layers:
+- A per-process TTL cache, shared by all requests handled by the worker.
+  Entries are invalidated explicitly when the underlying rows change, but
+  as each uvicorn worker has its own cache, the TTL bounds staleness for
+  changes made via another worker.
+- A per-request memo (ContextVar), so nested dependencies resolving the
+  same lookup during one request never repeat it.
+"""
+
+import logging
+from collections.abc import Callable, Hashable
+from contextvars import ContextVar
+from time import monotonic
+from typing import Any, Optional
+
+from litestar.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """A small in-process cache with per-entry expiry and a size bound."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        """Initialise the cache.
+
+        Args:
+            ttl_seconds (float): Lifetime of each entry. 0 disables caching.
+            max_entries (int): Oldest entries are evicted above this size.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value for the configured TTL."""
+        if self.ttl_seconds <= 0:
+            return
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # dicts keep insertion order, so the first key is the oldest
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a single entry."""
+        self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Remove all entries whose key matches the predicate."""
+        for key in [key for key in self._entries if predicate(key)]:
+            self._entries.pop(key, None)
+
+    def invalidate_values_where(self, predicate: Callable[[Any], bool]) -> None:
+        """Remove all entries whose cached value matches the predicate."""
+        for key in [
+            key for key, (_, value) in self._entries.items() if predicate(value)
+        ]:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Number of entries currently held (including expired)."""
+        return len(self._entries)
+
+
+# Keyed by (user_sub, project_id), project_id may be None
+access_cache = TTLCache(settings.AUTH_CACHE_TTL_SECONDS)
+# Keyed by API key hash, values carry the key id and owning user
+api_key_cache = TTLCache(settings.API_KEY_CACHE_TTL_SECONDS)
+
+_request_memo: ContextVar[Optional[dict]] = ContextVar("_request_memo", default=None)
+
+
+def get_request_memo() -> Optional[dict]:
+    """Return the memo dict for the current request, if inside one."""
+    return _request_memo.get()
+
+
+def invalidate_user_access(user_sub: str) -> None:
+    """Drop cached access for a user, e.g. after is_admin or roles change."""
+    access_cache.invalidate_where(lambda key: key[0] == user_sub)
+    api_key_cache.invalidate_values_where(lambda value: value.user.sub == user_sub)
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.clear()
+
+
+def invalidate_project_access(project_id: int) -> None:
+    """Drop cached access for a project, e.g. after status or roles change."""
+    access_cache.invalidate_where(lambda key: key[1] == project_id)
+    memo = _request_memo.get()
+    if memo is not None:
+        memo.clear()
+
+
+def invalidate_api_key(key_hash: str) -> None:
+    """Drop a cached API key, e.g. after it is deactivated."""
+    api_key_cache.invalidate(key_hash)
+
+
+def create_request_memo_middleware(app: ASGIApp) -> ASGIApp:
+    """ASGI middleware giving each HTTP request a fresh lookup memo."""
+
+    async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await app(scope, receive, send)
+            return
+
+        token = _request_memo.set({})
+        try:
+            await app(scope, receive, send)
+        finally:
+            _request_memo.reset(token)
+
+    return middleware
@@ -26,6 +26,7 @@ from psycopg import AsyncConnection
 from pydantic import BaseModel
 
 from app.auth.api_key import generate_api_key, hash_api_key
+from app.auth.auth_cache import invalidate_api_key
 from app.auth.auth_deps import (
     get_user_is_admin,
     get_user_sub,
@@ -139,6 +140,8 @@ async def revoke_api_key_route(
             detail=f"API key with id={key_id} not found.",
         )
     await db.commit()
+    if revoked.key_hash:
+        invalidate_api_key(revoked.key_hash)
 
 
 @get(
@@ -23,14 +23,16 @@ an AuthUser object in a standard format.
 """
 
 import logging
+from dataclasses import dataclass, fields, replace
 from typing import Annotated, Optional
 
 from litestar import status_codes as status
 from litestar.exceptions import HTTPException
 from litestar.params import Dependency
 from psycopg import AsyncConnection
-from psycopg.rows import class_row
+from psycopg.rows import dict_row
 
+from app.auth.auth_cache import access_cache, get_request_memo
 from app.auth.auth_deps import get_user_sub, get_user_username
 from app.auth.auth_schemas import ProjectUserDict
 from app.db.enums import (
@@ -44,6 +46,72 @@ from app.i18n import _
 log = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class UserAccess:
+    """A user, with their status and role for one project (if requested)."""
+
+    user: DbUser
+    project_status: Optional[ProjectStatus] = None
+    project_role: Optional[ProjectRole] = None
+
+
+_USER_COLUMNS = tuple(
+    field.name for field in fields(DbUser) if field.name != "project_roles"
+)
+
+
+async def get_user_access(
+    db: AsyncConnection,
+    user_sub: str,
+    project_id: Optional[int] = None,
+) -> Optional[UserAccess]:
+    """Get the user, admin flag, and project role in a single query.
+
+    Results are memoised for the current request, and cached per process
+    for AUTH_CACHE_TTL_SECONDS (see app.auth.auth_cache).
+    """
+    cache_key = (user_sub, project_id)
+    memo = get_request_memo()
+    if memo is not None and cache_key in memo:
+        return memo[cache_key]
+
+    access = access_cache.get(cache_key)
+    if access is None:
+        async with db.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
+                """
+                SELECT
+                    u.*,
+                    p.status AS project_status,
+                    ur.role AS project_role
+                FROM users u
+                LEFT JOIN projects p
+                    ON p.id = %(project_id)s
+                LEFT JOIN user_roles ur
+                    ON ur.user_sub = u.sub
+                    AND ur.project_id = %(project_id)s
+                WHERE u.sub = %(user_sub)s;
+                """,
+                {"user_sub": user_sub, "project_id": project_id},
+            )
+            row = await cur.fetchone()
+
+        if row is None:
+            # Do not cache misses, the user may be created at any time
+            return None
+
+        access = UserAccess(
+            user=DbUser(**{key: row[key] for key in _USER_COLUMNS if key in row}),
+            project_status=row["project_status"],
+            project_role=row["project_role"],
+        )
+        access_cache.set(cache_key, access)
+
+    if memo is not None:
+        memo[cache_key] = access
+    return access
+
+
 async def check_access(
     user: object,
     db: AsyncConnection,
@@ -61,62 +129,35 @@ async def check_access(
     - `check_completed=True` blocks access to COMPLETED / ARCHIVED projects.
     """
     user_sub = get_user_sub(user)
+    project_scoped = project_id is not None and role is not None
 
-    # Global admin shortcut – no further checks
-    async with db.cursor(row_factory=class_row(DbUser)) as cur:
-        await cur.execute(
-            """
-            SELECT *
-            FROM users
-            WHERE sub = %(user_sub)s
-            """,
-            {"user_sub": user_sub},
-        )
-        db_user = await cur.fetchone()
-
-    if not db_user:
+    access = await get_user_access(
+        db, user_sub, project_id=project_id if project_scoped else None
+    )
+    if access is None:
         return None
 
+    # Copy, so callers cannot modify the cached user
+    db_user = replace(access.user)
+
+    # Global admin shortcut – no further checks
     if db_user.is_admin or getattr(user, "is_admin", False):
         return db_user
 
     # If no project context or no specific project role required, return user
-    if project_id is None or role is None:
+    if not project_scoped:
         return db_user
 
-    async with db.cursor() as cur:
-        # Optionally block completed / archived projects
-        if check_completed:
-            await cur.execute(
-                """
-                SELECT 1
-                FROM projects
-                WHERE id = %(project_id)s
-                  AND status IN ('COMPLETED', 'ARCHIVED')
-                """,
-                {"project_id": project_id},
-            )
-            if await cur.fetchone():
-                return None
-
-        # Check project role
-        await cur.execute(
-            """
-            SELECT 1
-            FROM user_roles
-            WHERE user_sub = %(user_sub)s
-              AND project_id = %(project_id)s
-              AND role = %(role)s
-            """,
-            {
-                "user_sub": user_sub,
-                "project_id": project_id,
-                "role": role.value if isinstance(role, ProjectRole) else role,
-            },
-        )
-        has_role = await cur.fetchone()
+    # Optionally block completed / archived projects
+    if check_completed and access.project_status in (
+        ProjectStatus.COMPLETED,
+        ProjectStatus.ARCHIVED,
+    ):
+        return None
 
-    return db_user if has_role else None
+    # Check project role
+    role_value = role.value if isinstance(role, ProjectRole) else role
+    return db_user if access.project_role == role_value else None
 
 
 async def super_admin(
@@ -193,7 +234,9 @@ async def project_manager(
     Returns:
         ProjectUserDict containing user and project.
     """
-    project = await DbProject.one(db, project_id, warn_on_missing_token=False)
+    project = await DbProject.one(
+        db, project_id, minimal=True, warn_on_missing_token=False
+    )
     return await wrap_check_access(
         project,
         db,
@@ -223,7 +266,9 @@ async def mapper(
     Returns:
         ProjectUserDict containing user and project.
     """
-    project = await DbProject.one(db, project_id, warn_on_missing_token=False)
+    project = await DbProject.one(
+        db, project_id, minimal=True, warn_on_missing_token=False
+    )
 
     if check_completed and project.status in [
         ProjectStatus.COMPLETED,
@@ -237,8 +282,12 @@ async def mapper(
 
     # If project is public, skip permission check
     if project.visibility == ProjectVisibility.PUBLIC:
+        user_sub = get_user_sub(auth_user)
+        access = await get_user_access(db, user_sub)
+        if access is None:
+            raise KeyError(f"User ({user_sub}) not found.")
         return {
-            "user": await DbUser.one(db, get_user_sub(auth_user)),
+            "user": replace(access.user),
             "project": project,
         }
 
@@ -18,39 +18,52 @@
 """Logic for interaction with ODK Central & data."""
 
 import csv
+import hashlib
 import json
 import logging
 import secrets
 import string
 from asyncio import gather
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import suppress
+from importlib.metadata import version
 from io import BytesIO, StringIO
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 from uuid import UUID, uuid4
 
 from geojson_aoi import parse_aoi
 from litestar import status_codes as status
 from litestar.exceptions import HTTPException
-from osm_fieldwork.update_xlsform import append_field_mapping_fields
 from psycopg import AsyncConnection
-from pyodk.errors import PyODKError
-from pyxform.xls2xform import convert as xform_convert
 
 from app.central import central_deps, central_schemas
 from app.config import settings
 from app.db.enums import DbGeomType
-from app.db.models import DbProject, DbTemplateXLSForm
+from app.db.models import DbProject, DbTemplateXLSForm, DbXLSFormTransform
 from app.helpers.geometry_utils import (
     geojson_to_javarosa_geom,
     javarosa_to_geojson_geom,
 )
+from app.helpers.lazy_imports import pyodk_errors
+from app.helpers.process_pool import (
+    append_field_mapping_fields_job,
+    run_in_process,
+    xlsform_to_xform_job,
+)
 from app.i18n import _
 from app.projects import project_schemas
 
+if TYPE_CHECKING:
+    from pyodk.errors import PyODKError
+
 log = logging.getLogger(__name__)
 
 MIN_PYODK_ERROR_ARGS = 2
 HTTP_ERROR_STATUS_CODE = 400
+# Part of the XLSForm cache key, so upgrades invalidate cached transforms
+XLSFORM_TOOL_VERSIONS = (
+    f"osm-fieldwork=={version('osm-fieldwork')},pyxform=={version('pyxform')}"
+)
 
 
 def _extract_dataset_property_names(payload: object) -> set[str]:
@@ -84,7 +97,7 @@ def _is_duplicate_form_conflict(exc: Exception) -> bool:
 
 def _is_pyodk_duplicate_form_conflict(exc: Exception) -> bool:
     """Check PyODK-specific conflict metadata for duplicate forms."""
-    if not isinstance(exc, PyODKError):
+    if not isinstance(exc, pyodk_errors.PyODKError):
         return False
 
     if _matches_duplicate_form_error_code(exc):
@@ -97,7 +110,7 @@ def _is_pyodk_duplicate_form_conflict(exc: Exception) -> bool:
     return _duplicate_form_conflict_from_body(_safe_response_json(response))
 
 
-def _matches_duplicate_form_error_code(exc: PyODKError) -> bool:
+def _matches_duplicate_form_error_code(exc: "PyODKError") -> bool:
     """Use PyODK's central error inspection when available."""
     try:
         return exc.is_central_error(409.3)
@@ -106,7 +119,7 @@ def _matches_duplicate_form_error_code(exc: PyODKError) -> bool:
         return False
 
 
-def _get_pyodk_error_response(exc: PyODKError):
+def _get_pyodk_error_response(exc: "PyODKError"):
     """Return the response object attached to a PyODKError if present."""
     if len(exc.args) < MIN_PYODK_ERROR_ARGS:
         return None
@@ -227,7 +240,7 @@ async def create_odk_xform(
                     project_id=odk_id,
                     ignore_warnings=True,
                 )
-            except PyODKError as e:
+            except pyodk_errors.PyODKError as e:
                 if _is_duplicate_form_conflict(e):
                     log.info(
                         "Form already exists in ODK project %s; "
@@ -281,6 +294,24 @@ async def get_form_list(db: AsyncConnection) -> list:
         ) from e
 
 
+def _xlsform_pool_error() -> HTTPException:
+    """Error for XLSForm processing lost to a broken process pool."""
+    msg = _("XLSForm processing is temporarily unavailable, please try again.")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=msg,
+    )
+
+
+def _xlsform_timeout_error() -> HTTPException:
+    """Error for XLSForm processing killed by the process pool timeout."""
+    msg = _("XLSForm took too long to process, please try a smaller form.")
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail=msg,
+    )
+
+
 async def read_and_test_xform(input_data: BytesIO) -> None:
     """Read and validate an XForm.
 
@@ -295,8 +326,13 @@ async def read_and_test_xform(input_data: BytesIO) -> None:
             f"Parsing XLSForm --> XML data: input type {type(input_data)} | "
             f"data length {input_data.getbuffer().nbytes}"
         )
-        # NOTE pyxform.xls2xform.convert returns a ConvertResult object
-        return BytesIO(xform_convert(input_data).xform.encode("utf-8"))
+        return BytesIO(
+            await run_in_process(xlsform_to_xform_job, input_data.getvalue())
+        )
+    except TimeoutError as e:
+        raise _xlsform_timeout_error() from e
+    except BrokenProcessPool as e:
+        raise _xlsform_pool_error() from e
     except Exception as e:
         log.exception(f"Error: {e}", stack_info=True)
         msg = _("XLSForm is invalid: %(error)s") % {"error": e}
@@ -318,16 +354,23 @@ async def append_fields_to_user_xlsform(
 ) -> tuple[str, BytesIO]:  # noqa: PLR0913
     """Helper to return the intermediate XLSForm prior to convert."""
     log.debug("Appending mandatory Field-TM fields to XLSForm")
-    return await append_field_mapping_fields(
-        xlsform,
-        form_name=form_name,
-        new_geom_type=new_geom_type,
-        need_verification_fields=need_verification_fields,
-        include_photo_upload=include_photo_upload,
-        mandatory_photo_upload=mandatory_photo_upload,
-        default_language=default_language,
-        use_odk_collect=use_odk_collect,
-    )
+    try:
+        xform_id, updated_form = await run_in_process(
+            append_field_mapping_fields_job,
+            xlsform.getvalue(),
+            form_name=form_name,
+            new_geom_type=new_geom_type,
+            need_verification_fields=need_verification_fields,
+            include_photo_upload=include_photo_upload,
+            mandatory_photo_upload=mandatory_photo_upload,
+            default_language=default_language,
+            use_odk_collect=use_odk_collect,
+        )
+    except TimeoutError as e:
+        raise _xlsform_timeout_error() from e
+    except BrokenProcessPool as e:
+        raise _xlsform_pool_error() from e
+    return xform_id, BytesIO(updated_form)
 
 
 async def validate_and_update_user_xlsform(
@@ -357,6 +400,71 @@ async def validate_and_update_user_xlsform(
     return await read_and_test_xform(updated_file_bytes)
 
 
+def xlsform_cache_key(xlsform_bytes: bytes, **options) -> str:
+    """Content-addressed cache key for an XLSForm and its processing options."""
+    digest = hashlib.sha256(xlsform_bytes)
+    digest.update(XLSFORM_TOOL_VERSIONS.encode())
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+async def transform_user_xlsform(  # noqa: PLR0913
+    db: AsyncConnection,
+    xlsform: BytesIO,
+    *,
+    form_name: str = "buildings",
+    new_geom_type: Optional[DbGeomType] = DbGeomType.POINT,
+    need_verification_fields: bool = True,
+    include_photo_upload: bool = True,
+    mandatory_photo_upload: bool = False,
+    default_language: str | None = None,
+    use_odk_collect: bool = False,
+) -> tuple[str, BytesIO, BytesIO]:
+    """Append mandatory fields and validate an XLSForm, memoized in the db.
+
+    The same forms are uploaded and processed repeatedly, so results are
+    cached by input digest and options, evicting least recently used
+    entries once the cache exceeds XLSFORM_CACHE_MAX_MB.
+
+    Returns:
+        tuple[str, BytesIO, BytesIO]: The xFormId, updated XLSForm and XForm XML.
+    """
+    options = {
+        "form_name": form_name,
+        "new_geom_type": new_geom_type,
+        "need_verification_fields": need_verification_fields,
+        "include_photo_upload": include_photo_upload,
+        "mandatory_photo_upload": mandatory_photo_upload,
+        "default_language": default_language,
+        "use_odk_collect": use_odk_collect,
+    }
+    cache_enabled = settings.XLSFORM_CACHE_MAX_MB > 0
+    cache_key = xlsform_cache_key(xlsform.getvalue(), **options)
+
+    if cache_enabled and (cached := await DbXLSFormTransform.one(db, cache_key)):
+        log.debug(f"XLSForm transform cache hit ({cache_key[:12]})")
+        return cached.xform_id, BytesIO(cached.xlsform), BytesIO(cached.xform_xml)
+
+    xform_id, updated_xlsform = await append_fields_to_user_xlsform(xlsform, **options)
+    xform_xml = await read_and_test_xform(updated_xlsform)
+
+    if cache_enabled:
+        await DbXLSFormTransform.create(
+            db,
+            cache_key,
+            xform_id,
+            updated_xlsform.getvalue(),
+            xform_xml.getvalue(),
+        )
+        evicted = await DbXLSFormTransform.evict(
+            db, settings.XLSFORM_CACHE_MAX_MB * 1024 * 1024
+        )
+        if evicted:
+            log.debug(f"Evicted {evicted} entries from the XLSForm transform cache")
+
+    return xform_id, updated_xlsform, xform_xml
+
+
 async def update_odk_central_xform(
     xform_id: str,
     odk_id: int,
@@ -658,7 +766,7 @@ def _is_property_conflict(exc: Exception) -> bool:
     )
 
 
-def _is_entity_version_conflict(exc: PyODKError) -> bool:
+def _is_entity_version_conflict(exc: "PyODKError") -> bool:
     """Return True for entity update version conflicts."""
     msg = str(exc)
     return "Status: 409" in msg and "version" in msg
@@ -782,7 +890,7 @@ def _upsert_entity_rows(
                 data=update_data,
                 base_version=target_row["__system"]["version"],
             )
-        except PyODKError as exc:
+        except pyodk_errors.PyODKError as exc:
             if _is_entity_version_conflict(exc):
                 log.warning(
                     "Skipping Entity update due to version conflict for "
@@ -870,6 +978,131 @@ async def create_entity_list(
         _upsert_entity_rows(client, pid, dataset_name, merge_rows)
 
 
+def _index_entities_by_property(
+    entity_table: dict | list | None,
+    key: str,
+) -> dict[str, dict]:
+    """Map existing dataset rows by the value of a property."""
+    target_rows = (
+        entity_table.get("value", []) if isinstance(entity_table, dict) else []
+    )
+    return {
+        str(row[key]): row
+        for row in target_rows
+        if isinstance(row, dict) and row.get(key) is not None
+    }
+
+
+def _apply_entity_changes(
+    client,
+    project_id: int,
+    dataset_name: str,
+    key: str,
+    upsert_rows: list[dict[str, str]],
+    delete_keys: list[str],
+) -> dict[str, int]:
+    """Create, update and delete only the given entities, matched by a property."""
+    target_by_key = _index_entities_by_property(
+        client.entities.get_table(
+            entity_list_name=dataset_name,
+            project_id=project_id,
+            select=f"__id,__system,{key}",
+        ),
+        key,
+    )
+    counts = {"created": 0, "updated": 0, "deleted": 0}
+
+    to_insert = []
+    for source_row in upsert_rows:
+        target_row = target_by_key.get(str(source_row.get(key)))
+        if not target_row:
+            to_insert.append(source_row)
+            continue
+
+        try:
+            client.entities.update(
+                uuid=target_row["__id"],
+                entity_list_name=dataset_name,
+                project_id=project_id,
+                data={k: v for k, v in source_row.items() if k != "label"},
+                base_version=target_row["__system"]["version"],
+            )
+        except pyodk_errors.PyODKError as exc:
+            if _is_entity_version_conflict(exc):
+                log.warning(
+                    "Skipping Entity update due to version conflict for "
+                    "%s='%s' in dataset '%s' (ODK project %s): %s",
+                    key,
+                    source_row.get(key),
+                    dataset_name,
+                    project_id,
+                    exc,
+                )
+                continue
+            raise
+        counts["updated"] += 1
+
+    for value in delete_keys:
+        target_row = target_by_key.get(value)
+        if not target_row:
+            continue
+        client.entities.delete(
+            uuid=target_row["__id"],
+            entity_list_name=dataset_name,
+            project_id=project_id,
+        )
+        counts["deleted"] += 1
+
+    if to_insert:
+        client.entities.create_many(
+            data=to_insert,
+            entity_list_name=dataset_name,
+            project_id=project_id,
+            create_source="Field-TM",
+            source_size=len(to_insert),
+        )
+        counts["created"] = len(to_insert)
+
+    return counts
+
+
+async def push_entity_changes(
+    odk_creds: Optional[central_schemas.ODKCentral],
+    odk_id: int,
+    key: str,
+    entities_list: list[central_schemas.EntityDict],
+    delete_keys: list[str],
+    dataset_name: str = "features",
+) -> dict[str, int]:
+    """Push only changed entities to an existing Entity list (dataset).
+
+    Unlike `create_entity_list`, entities are matched by the value of the
+    `key` property (e.g. osm_id) instead of the label, and only the given
+    entities are created, updated or deleted. Entities being updated keep
+    their other properties, e.g. a status set by mappers.
+
+    Returns:
+        The number of entities created, updated and deleted.
+    """
+    merge_rows = _build_entity_merge_rows(entities_list)
+    if not merge_rows and not delete_keys:
+        return {"created": 0, "updated": 0, "deleted": 0}
+
+    async with central_deps.pyodk_client(odk_creds) as client:
+        pid = int(odk_id)
+        if merge_rows:
+            _ensure_dataset_properties(
+                client,
+                pid,
+                dataset_name,
+                _collect_required_property_keys([], merge_rows),
+                _get_existing_dataset_property_names(client, pid, dataset_name),
+            )
+        return _apply_entity_changes(
+            client, pid, dataset_name, key, merge_rows, delete_keys
+        )
+
+
 async def create_entity(
     odk_creds: Optional[central_schemas.ODKCentral],
     entity_uuid: UUID,
@@ -988,7 +1221,7 @@ async def get_appuser_token(
 
         return f"{odk_url}/v1/key/{appuser_token}/projects/{project_odk_id}"
 
-    except PyODKError as e:
+    except pyodk_errors.PyODKError as e:
         log.exception(f"PyODK error while creating app user token: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
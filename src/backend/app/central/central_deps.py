@@ -31,11 +31,12 @@ from litestar import status_codes as status
 from litestar.datastructures import UploadFile
 from litestar.exceptions import HTTPException
 from osm_fieldwork.OdkCentralAsync import OdkDataset, OdkForm, OdkProject
-from pyodk.client import Client
 
 from app.central.central_schemas import ODKCentral
 from app.config import settings
+from app.helpers.lazy_imports import pyodk_sdk
 from app.i18n import _
+from app.metrics import aiohttp_trace_config, instrument_requests_session
 
 
 def _resolve_backend_odk_url(url: str) -> str:
@@ -124,8 +125,9 @@ async def pyodk_client(odk_creds: Optional[ODKCentral]):
         loop = get_running_loop()
         client = await loop.run_in_executor(
             None,
-            lambda: Client(config_path=cfg.name).open(),
+            lambda: pyodk_sdk.Client(config_path=cfg.name).open(),
         )
+        instrument_requests_session(client.session, "odk")
 
         try:
             yield client
@@ -142,6 +144,7 @@ async def get_odk_dataset(odk_creds: Optional[ODKCentral]):
             url=creds.external_project_instance_url,
             user=creds.external_project_username,
             passwd=creds.external_project_password,
+            trace_configs=[aiohttp_trace_config("odk")],
         ) as odk_central:
             yield odk_central
     except ConnectionError as conn_error:
@@ -160,6 +163,7 @@ async def get_odk_project(odk_creds: Optional[ODKCentral]):
             url=creds.external_project_instance_url,
             user=creds.external_project_username,
             passwd=creds.external_project_password,
+            trace_configs=[aiohttp_trace_config("odk")],
         ) as odk_central:
             yield odk_central
     except ConnectionError as conn_error:
@@ -178,6 +182,7 @@ async def get_async_odk_form(odk_creds: Optional[ODKCentral]):
             url=creds.external_project_instance_url,
             user=creds.external_project_username,
             passwd=creds.external_project_password,
+            trace_configs=[aiohttp_trace_config("odk")],
         ) as odk_central:
             yield odk_central
     except ConnectionError as conn_error:
@@ -200,6 +200,14 @@ class Settings(BaseSettings):
     # NOTE HS384 is used for simplicity of implementation and compatibility with
     # existing Fernet based database value encryption
     JWT_ENCRYPTION_ALGORITHM: str = "HS384"
+    # Per-worker cache of user / project role lookups (0 to disable)
+    AUTH_CACHE_TTL_SECONDS: float = 30
+    # API key lookups are cached per worker; last_used_at writes are batched.
+    # A revoked key is dropped from the cache of the worker revoking it, but
+    # other workers keep accepting it for up to API_KEY_CACHE_TTL_SECONDS,
+    # so keep this short (0 to disable)
+    API_KEY_CACHE_TTL_SECONDS: float = 5
+    API_KEY_LAST_USED_FLUSH_SECONDS: float = 60
 
     EXTRA_CORS_ORIGINS: Optional[str | list[str]] = None
 
@@ -271,6 +279,46 @@ class Settings(BaseSettings):
         )
         return pg_url.unicode_string()
 
+    # DB connection pools, per worker (see app/db/database.py DbPool):
+    # - interactive: HTTP requests.
+    # - background: long-running work, e.g. project finalization, splitting
+    #   and basemap attachment, so it cannot starve page renders.
+    # - maintenance: startup tasks and periodic flushes.
+    # TIMEOUT is how long to wait for a free connection, in seconds.
+    DB_POOL_INTERACTIVE_MIN_SIZE: int = 1
+    DB_POOL_INTERACTIVE_MAX_SIZE: int = 10
+    DB_POOL_INTERACTIVE_TIMEOUT: float = 30.0
+    DB_POOL_BACKGROUND_MIN_SIZE: int = 0
+    DB_POOL_BACKGROUND_MAX_SIZE: int = 4
+    DB_POOL_BACKGROUND_TIMEOUT: float = 120.0
+    DB_POOL_MAINTENANCE_MIN_SIZE: int = 0
+    DB_POOL_MAINTENANCE_MAX_SIZE: int = 2
+    DB_POOL_MAINTENANCE_TIMEOUT: float = 60.0
+
+    # Optional read replica, used by read-only routes (db_conn_ro). Reads go
+    # to the primary instead if the replica lags by more than
+    # DB_REPLICA_MAX_LAG_SECONDS, or for DB_REPLICA_READ_YOUR_WRITES_SECONDS
+    # after the client made a write request
+    FTM_DB_REPLICA_URL: Optional[str] = None
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_READ_YOUR_WRITES_SECONDS: int = 10
+    DB_POOL_REPLICA_MIN_SIZE: int = 1
+    DB_POOL_REPLICA_MAX_SIZE: int = 10
+    DB_POOL_REPLICA_TIMEOUT: float = 30.0
+
+    # Per-request DB query budget (0 to disable, skipping query tracking).
+    # Exceeding it, or repeating an identical query, logs a warning, or
+    # raises if DB_QUERY_BUDGET_RAISE
+    DB_QUERY_BUDGET: int = 30
+    DB_QUERY_BUDGET_RAISE: bool = False
+
+    # Slow query log (0 to disable). Statements slower than this are logged
+    # and kept in the slow_queries table (newest DB_SLOW_QUERY_MAX_ROWS rows),
+    # with an EXPLAIN plan captured for a sample of them
+    DB_SLOW_QUERY_MS: int = 0
+    DB_SLOW_QUERY_EXPLAIN_RATE: float = 0.1
+    DB_SLOW_QUERY_MAX_ROWS: int = 10000
+
     # ODK
     ODK_CENTRAL_URL: Optional[HttpUrlStr] = ""
     ODK_CENTRAL_PUBLIC_URL: Optional[HttpUrlStr] = ""
@@ -328,6 +376,26 @@ class Settings(BaseSettings):
 
     RAW_DATA_API_URL: HttpUrlStr = "https://api-prod.raw-data.hotosm.org/v1"
     RAW_DATA_API_AUTH_TOKEN: Optional[SecretStr] = None
+    # Upstream AOI size limit, used to tile larger areas for tiled extracts
+    RAW_DATA_API_MAX_AREA_KM2: float = 200
+    # Max number of tile extracts requested from raw-data-api at once
+    RAW_DATA_API_TILE_CONCURRENCY: int = 4
+    # Share of the OSM features a data extract refresh may delete, above
+    # which it is refused unless forced (e.g. a broken upstream extract)
+    DATA_EXTRACT_REFRESH_MAX_DELETED_RATIO: float = 0.2
+
+    # Defaults for projects without their own settings. Saved data extracts
+    # and task areas are rounded to GEOMETRY_PRECISION decimal places (None
+    # to keep all; OSM itself uses 7, about 1cm), and simplified with
+    # GEOMETRY_SIMPLIFY_TOLERANCE_METERS (0 to skip)
+    GEOMETRY_PRECISION: Optional[int] = 7
+    GEOMETRY_SIMPLIFY_TOLERANCE_METERS: float = 0
+
+    # Worker processes for CPU-bound XLSForm processing (0 to use threads)
+    XLSFORM_WORKERS: int = 2
+    XLSFORM_TIMEOUT_SECONDS: float = 120
+    # Size bound for the processed XLSForm cache table (0 to disable)
+    XLSFORM_CACHE_MAX_MB: int = 256
 
     # Offline basemap providers
     OAM_STAC_URL: HttpUrlStr = "https://api.imagery.hotosm.org/stac"
@@ -345,6 +413,13 @@ class Settings(BaseSettings):
             return None
         return v
 
+    # Prometheus metrics, per worker unless METRICS_MULTIPROC_DIR is set, in
+    # which case workers share snapshots via files in that (empty) directory
+    METRICS_ENABLED: bool = True
+    METRICS_PATH: str = "/__metrics__"
+    METRICS_MULTIPROC_DIR: Optional[str] = None
+    METRICS_FLUSH_SECONDS: float = 5
+
     MONITORING: Optional[MonitoringTypes] = None
 
     @computed_field
@@ -16,58 +16,124 @@
 #     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
 #
 
-"""Config for the Field-TM database connection."""
+"""Config for the Field-TM database connection.
 
+Each worker has several named connection pools (DbPool), so long-running
+work cannot exhaust the connections used to serve pages. Sizes and
+timeouts are set per pool in settings, as DB_POOL_<NAME>_*.
+
+If FTM_DB_REPLICA_URL is set, read-only routes (db_conn_ro) use a read
+replica, unless it lags too far behind, or the client wrote recently and
+must see its own writes.
+"""
+
+import asyncio
 import logging
-from collections.abc import AsyncGenerator
-from typing import cast
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from time import monotonic, time
+from typing import Optional, cast
 
-from litestar import Litestar
+from litestar import Litestar, Request
+from litestar import status_codes as status
 from litestar.datastructures import State
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
 from psycopg import AsyncConnection
 from psycopg_pool import AsyncConnectionPool
 
 from app.config import settings
+from app.db.query_stats import configure_query_counting
 
 log = logging.getLogger(__name__)
 
+# Set after a write request, until when reads go to the primary
+READ_YOUR_WRITES_COOKIE = "ftm_primary_until"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+# How often each worker re-checks the replica lag
+REPLICA_LAG_CHECK_SECONDS = 1.0
+# Time allowed for a lag check, after which the replica counts as lagging
+REPLICA_LAG_PROBE_TIMEOUT_SECONDS = 2.0
+
+
+class DbPool(StrEnum):
+    """Named connection pools."""
+
+    # HTTP requests
+    INTERACTIVE = "interactive"
+    # Long-running work, e.g. project finalization and background tasks
+    BACKGROUND = "background"
+    # Startup tasks and periodic flushes
+    MAINTENANCE = "maintenance"
+    # Read-only routes, if a read replica is configured
+    REPLICA = "replica"
+
+
+# The pools of this worker, for code running outside a request
+_pools: dict[DbPool, AsyncConnectionPool] = {}
+
+
+async def _configure_replica(conn: AsyncConnection) -> None:
+    """Configure a new replica pool connection (pool configure hook)."""
+    await configure_query_counting(conn)
+    await conn.set_read_only(True)
+
+
+def _create_pool(name: DbPool) -> AsyncConnectionPool:
+    prefix = f"DB_POOL_{name.upper()}"
+    replica = name == DbPool.REPLICA
+    return AsyncConnectionPool(
+        conninfo=settings.FTM_DB_REPLICA_URL if replica else settings.FTM_DB_URL,
+        min_size=getattr(settings, f"{prefix}_MIN_SIZE"),
+        max_size=getattr(settings, f"{prefix}_MAX_SIZE"),
+        timeout=getattr(settings, f"{prefix}_TIMEOUT"),
+        name=name.value,
+        configure=_configure_replica if replica else configure_query_counting,
+        open=False,
+    )
+
 
 async def get_db_connection_pool(server: Litestar) -> AsyncConnectionPool:
-    """Get the connection pool for psycopg.
+    """Open the connection pools for psycopg, returning the interactive pool.
+
+    The pools are stored as server.state.db_pools, with the interactive pool
+    also as server.state.db_pool.
 
-    NOTE the pool connection is opened in the Litestar server startup (lifespan).
+    NOTE the pool connections are opened in the Litestar server startup (lifespan).
     """
     log.debug(
-        "Creating database connection pool: "
+        "Creating database connection pools: "
         f"{settings.FTM_DB_USER}@{settings.FTM_DB_HOST}"
     )
 
-    pool = getattr(server.state, "db_pool", None)
+    pools = getattr(server.state, "db_pools", None) or {}
+    for name in DbPool:
+        if name == DbPool.REPLICA and not settings.FTM_DB_REPLICA_URL:
+            continue
+        pool = pools.get(name)
+        if pool is None or pool.closed:
+            if pool is not None:
+                log.debug(f"Existing {name} DB pool is closed; creating a new one")
+            pool = _create_pool(name)
+            await pool.open()
+            log.debug(f"Database connection pool {name} opened")
+        pools[name] = pool
 
-    if pool is None or pool.closed:
-        if pool is not None:
-            log.debug("Existing DB pool is closed; creating a new one")
-
-        pool = AsyncConnectionPool(
-            conninfo=settings.FTM_DB_URL,
-            min_size=1,
-            max_size=10,  # max 10 concurrent DB connections (less than max_connections)
-            timeout=30.0,  # how long to wait if all connections are busy
-            open=False,
-        )
-        server.state.db_pool = pool
-        await pool.open()
-        log.debug("Database connection pool opened")
-
-    return cast(AsyncConnectionPool, pool)
+    _pools.update(pools)
+    server.state.db_pools = pools
+    server.state.db_pool = pools[DbPool.INTERACTIVE]
+    return cast(AsyncConnectionPool, server.state.db_pool)
 
 
 async def close_db_connection_pool(server: Litestar) -> None:
-    """Close the psycopg connection pool."""
-    pool = getattr(server.state, "db_pool", None)
-    if pool and not pool.closed:
-        await cast("AsyncConnectionPool", server.state.db_pool).close()
-        log.debug("Database connection pool closed")
+    """Close the psycopg connection pools."""
+    pools = getattr(server.state, "db_pools", None) or {}
+    for name, pool in pools.items():
+        if not pool.closed:
+            await cast("AsyncConnectionPool", pool).close()
+            log.debug(f"Database connection pool {name} closed")
+        if _pools.get(name) is pool:
+            del _pools[name]
 
 
 async def db_conn(state: State) -> AsyncGenerator[AsyncConnection, None]:
@@ -79,3 +145,165 @@ async def db_conn(state: State) -> AsyncGenerator[AsyncConnection, None]:
     db_pool = cast(AsyncConnectionPool, state.db_pool)
     async with db_pool.connection() as conn:
         yield conn
+
+
+async def background_db_conn(state: State) -> AsyncGenerator[AsyncConnection, None]:
+    """Get a connection from the background pool, for long-running requests.
+
+    e.g. project finalization, which can hold a connection for minutes.
+    """
+    db_pool = cast(AsyncConnectionPool, state.db_pools[DbPool.BACKGROUND])
+    async with db_pool.connection() as conn:
+        yield conn
+
+
+class ReplicaLag:
+    """Replication lag of the read replica, cached for a short interval.
+
+    The lag is checked in the background, so requests never wait for it,
+    using the primary until the first check or while the replica is down.
+    """
+
+    def __init__(self, interval: float = REPLICA_LAG_CHECK_SECONDS):
+        """Create an unchecked lag, so the first use measures it."""
+        self.interval = interval
+        self.seconds: Optional[float] = None
+        self.checked_at = float("-inf")
+        self._probe: Optional[asyncio.Task] = None
+
+    async def _measure(
+        self, primary: AsyncConnectionPool, replica: AsyncConnectionPool
+    ) -> Optional[float]:
+        timeout = REPLICA_LAG_PROBE_TIMEOUT_SECONDS
+        try:
+            async with asyncio.timeout(timeout):
+                async with primary.connection(timeout=timeout) as conn:
+                    cur = await conn.execute("SELECT pg_current_wal_lsn()::text;")
+                    (primary_lsn,) = await cur.fetchone()
+                async with (
+                    replica.connection(timeout=timeout) as conn,
+                    conn.cursor() as cur,
+                ):
+                    # No lag once the WAL written on the primary before the
+                    # check is replayed, even if the last replayed transaction
+                    # is old (i.e. the primary is idle). If the WAL stream has
+                    # stopped, the replay falls behind, so the lag grows.
+                    await cur.execute(
+                        """
+                        SELECT CASE
+                            WHEN NOT pg_is_in_recovery() THEN 0
+                            WHEN pg_last_wal_replay_lsn() >= %(primary_lsn)s::pg_lsn
+                                THEN 0
+                            ELSE extract(
+                                epoch FROM now() - pg_last_xact_replay_timestamp()
+                            )
+                        END::float8;
+                    """,
+                        {"primary_lsn": primary_lsn},
+                    )
+                    row = await cur.fetchone()
+        except Exception as e:
+            log.warning(f"Failed to check the read replica lag: {e}")
+            return None
+        return row[0] if row and row[0] is not None else None
+
+    async def _check(
+        self, primary: AsyncConnectionPool, replica: AsyncConnectionPool
+    ) -> None:
+        self.seconds = await self._measure(primary, replica)
+        self.checked_at = monotonic()
+        if self.seconds is None or self.seconds > settings.DB_REPLICA_MAX_LAG_SECONDS:
+            log.debug(f"Read replica lag {self.seconds}s; using primary")
+
+    def acceptable(
+        self, primary: AsyncConnectionPool, replica: AsyncConnectionPool
+    ) -> bool:
+        """Whether the replica was within DB_REPLICA_MAX_LAG_SECONDS when checked.
+
+        Starts a new check once the interval has passed.
+        """
+        if monotonic() - self.checked_at >= self.interval and (
+            self._probe is None or self._probe.done()
+        ):
+            self._probe = asyncio.create_task(self._check(primary, replica))
+        return (
+            self.seconds is not None
+            and self.seconds <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        )
+
+
+replica_lag = ReplicaLag()
+
+
+def _wrote_recently(request: Request) -> bool:
+    """Whether the client made a write request in the read-your-writes window."""
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time()
+    except ValueError:
+        return False
+
+
+async def db_conn_ro(
+    request: Request, state: State
+) -> AsyncGenerator[AsyncConnection, None]:
+    """Get a connection for a read-only handler, from the replica if usable.
+
+    Uses the primary (interactive pool) if there is no replica, it lags by
+    more than DB_REPLICA_MAX_LAG_SECONDS, or the client wrote recently.
+    """
+    db_pool = cast(AsyncConnectionPool, state.db_pool)
+    replica = state.db_pools.get(DbPool.REPLICA)
+    if (
+        replica is not None
+        and not _wrote_recently(request)
+        and replica_lag.acceptable(db_pool, replica)
+    ):
+        db_pool = replica
+    async with db_pool.connection() as conn:
+        yield conn
+
+
+def create_read_your_writes_middleware(app: ASGIApp) -> ASGIApp:
+    """ASGI middleware marking clients that wrote, so they read from the primary.
+
+    Successful write requests set a cookie for
+    DB_REPLICA_READ_YOUR_WRITES_SECONDS, checked by db_conn_ro.
+    """
+
+    async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and message["status"] < status.HTTP_400_BAD_REQUEST
+            ):
+                window = settings.DB_REPLICA_READ_YOUR_WRITES_SECONDS
+                cookie = (
+                    f"{READ_YOUR_WRITES_COOKIE}={time() + window:.0f}; "
+                    f"Max-Age={window}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode()),
+                ]
+            await send(message)
+
+        await app(scope, receive, send_wrapper)
+
+    return middleware
+
+
+@asynccontextmanager
+async def pool_connection(name: DbPool) -> AsyncIterator[AsyncConnection]:
+    """Get a connection from a named pool, outside a request.
+
+    e.g. for background tasks started with asyncio.create_task.
+    """
+    pool = _pools.get(name)
+    if pool is None or pool.closed:
+        raise RuntimeError(f"The {name} DB connection pool is not open")
+    async with pool.connection() as conn:
+        yield conn
@@ -130,3 +130,11 @@ class FieldMappingApp(StrEnum, Enum):
 
     QFIELD = "QField"
     ODK = "ODK"
+
+
+class ExtractChangeType(StrEnum, Enum):
+    """How an OSM feature changed between two downloads of a data extract."""
+
+    NEW = "NEW"
+    CHANGED = "CHANGED"
+    DELETED = "DELETED"
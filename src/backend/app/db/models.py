@@ -21,28 +21,33 @@ Most fields are defined as Optional to allow for flexibility in the returned dat
 from SQL statements. Sometimes we only need a subset of the fields.
 """
 
+import hashlib
 import json
 import logging
-from dataclasses import asdict, dataclass, is_dataclass
-from datetime import date
+from dataclasses import asdict, dataclass, fields, is_dataclass
+from datetime import date, datetime
 from re import sub
 from typing import Any, Mapping, Optional, Self
 
 from litestar import status_codes as status
 from litestar.exceptions import HTTPException
 from psycopg import AsyncConnection, sql
+from psycopg.adapt import Buffer, Loader
 from psycopg.rows import class_row
 from pydantic import AwareDatetime, BaseModel
 
+from app.auth.auth_cache import invalidate_project_access, invalidate_user_access
 from app.central.central_schemas import ODKCentral
 from app.config import settings
 from app.db.enums import (
+    ExtractChangeType,
     FieldMappingApp,
     ProjectRole,
     ProjectStatus,
     ProjectVisibility,
     XLSFormType,
 )
+from app.helpers.geojson_serializer import dumps_str
 from app.i18n import _
 
 log = logging.getLogger(__name__)
@@ -98,19 +103,31 @@ def _add_encrypted_odk_credentials(
     model_dump.pop("external_project_password", None)
 
 
+def _add_xlsform_digest(model_dump: dict[str, Any]) -> None:
+    """Set the SHA-256 digest of a new XLSForm, used as its ETag."""
+    if model_dump.get("xlsform_content"):
+        model_dump["xlsform_digest"] = hashlib.sha256(
+            model_dump["xlsform_content"]
+        ).hexdigest()
+
+
 def _normalize_project_jsonb_fields(model_dump: dict[str, Any]) -> None:
-    """Serialize project GeoJSON dicts for JSONB columns."""
-    jsonb_fields = ("data_extract_geojson", "task_areas_geojson")
+    """Serialize project dicts (GeoJSON and extract options) for JSONB columns."""
+    jsonb_fields = (
+        "data_extract_geojson",
+        "task_areas_geojson",
+        "data_extract_options",
+    )
     for key in jsonb_fields:
         if isinstance(model_dump.get(key), dict):
-            model_dump[key] = json.dumps(model_dump[key])
+            model_dump[key] = dumps_str(model_dump[key])
 
 
 def _project_update_placeholders(model_dump: dict[str, Any]) -> list[sql.Composable]:
     """Build SQL placeholder assignments for project updates."""
     placeholders: list[sql.Composable] = []
     for key in model_dump:
-        if key == "task_areas_geojson":
+        if key in ("task_areas_geojson", "data_extract_options"):
             placeholders.append(
                 sql.SQL("{column} = {value}::jsonb").format(
                     column=sql.Identifier(key),
@@ -239,7 +256,8 @@ class DbUser:
             """,
                 {"user_sub": user_sub},
             )
-            return True
+        invalidate_user_access(user_sub)
+        return True
 
     @classmethod
     async def create(
@@ -288,6 +306,8 @@ class DbUser:
                 detail=msg,
             )
 
+        # An upsert may have changed is_admin
+        invalidate_user_access(new_user.sub)
         return new_user
 
     @classmethod
@@ -322,6 +342,7 @@ class DbUser:
                 detail=msg,
             )
 
+        invalidate_user_access(user_sub)
         return updated_user
 
 
@@ -413,7 +434,11 @@ class DbApiKey:
     async def deactivate(
         cls, db: AsyncConnection, key_id: int, user_sub: str
     ) -> Optional[Self]:
-        """Deactivate an API key owned by a given user."""
+        """Deactivate an API key owned by a given user.
+
+        Call invalidate_api_key after committing, so a concurrent request
+        cannot cache the key again while it is still active.
+        """
         async with db.cursor(row_factory=class_row(cls)) as cur:
             await cur.execute(
                 """
@@ -425,7 +450,9 @@ class DbApiKey:
             """,
                 {"key_id": key_id, "user_sub": user_sub},
             )
-            return await cur.fetchone()
+            revoked = await cur.fetchone()
+
+        return revoked
 
     @classmethod
     async def touch_last_used(cls, db: AsyncConnection, key_id: int) -> None:
@@ -440,6 +467,33 @@ class DbApiKey:
                 {"key_id": key_id},
             )
 
+    @classmethod
+    async def bulk_touch_last_used(
+        cls, db: AsyncConnection, last_used: dict[int, datetime]
+    ) -> None:
+        """Update last used timestamps for many API keys in one statement.
+
+        Timestamps never move backwards, so flushes from several workers
+        can be applied in any order.
+        """
+        if not last_used:
+            return
+        async with db.cursor() as cur:
+            await cur.execute(
+                """
+                UPDATE api_keys AS k
+                SET last_used_at = GREATEST(k.last_used_at, u.used_at)
+                FROM unnest(
+                    %(key_ids)s::integer[], %(used_at)s::timestamptz[]
+                ) AS u(id, used_at)
+                WHERE k.id = u.id;
+            """,
+                {
+                    "key_ids": list(last_used.keys()),
+                    "used_at": list(last_used.values()),
+                },
+            )
+
 
 @dataclass(slots=True)
 class DbTemplateXLSForm:
@@ -451,6 +505,7 @@ class DbTemplateXLSForm:
     id: Optional[int] = None
     title: Optional[str] = None
     xls: Optional[bytes] = None
+    source_hash: Optional[str] = None
 
     @classmethod
     async def all(  # noqa: PLR0913
@@ -496,6 +551,220 @@ class DbTemplateXLSForm:
         return form
 
 
+# Minimum interval between last_used_at updates of a cached XLSForm transform
+XLSFORM_CACHE_TOUCH_SECONDS = 3600
+
+
+@dataclass(slots=True)
+class DbXLSFormTransform:
+    """Table xlsform_transform_cache.
+
+    Processed XLSForms keyed by a digest of the input form and options.
+    """
+
+    cache_key: Optional[str] = None
+    xform_id: Optional[str] = None
+    xlsform: Optional[bytes] = None
+    xform_xml: Optional[bytes] = None
+    size_bytes: Optional[int] = None
+    created_at: Optional[AwareDatetime] = None
+    last_used_at: Optional[AwareDatetime] = None
+
+    @classmethod
+    async def one(cls, db: AsyncConnection, cache_key: str) -> Optional[Self]:
+        """Get a cached transform, marking it as recently used.
+
+        last_used_at is only written once per XLSFORM_CACHE_TOUCH_SECONDS,
+        as it is only used for eviction, so most hits do not write.
+        """
+        async with db.cursor(row_factory=class_row(cls)) as cur:
+            await cur.execute(
+                """
+                WITH touched AS (
+                    UPDATE xlsform_transform_cache
+                    SET last_used_at = NOW()
+                    WHERE cache_key = %(cache_key)s
+                        AND last_used_at
+                            < NOW() - make_interval(secs => %(touch_seconds)s)
+                )
+                SELECT *
+                FROM xlsform_transform_cache
+                WHERE cache_key = %(cache_key)s;
+            """,
+                {"cache_key": cache_key, "touch_seconds": XLSFORM_CACHE_TOUCH_SECONDS},
+            )
+            return await cur.fetchone()
+
+    @classmethod
+    async def create(
+        cls,
+        db: AsyncConnection,
+        cache_key: str,
+        xform_id: str,
+        xlsform: bytes,
+        xform_xml: bytes,
+    ) -> None:
+        """Insert a transform result, replacing any existing entry."""
+        async with db.cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO xlsform_transform_cache (
+                    cache_key, xform_id, xlsform, xform_xml, size_bytes
+                )
+                VALUES (
+                    %(cache_key)s, %(xform_id)s, %(xlsform)s, %(xform_xml)s,
+                    %(size_bytes)s
+                )
+                ON CONFLICT (cache_key) DO UPDATE
+                SET
+                    xform_id = EXCLUDED.xform_id,
+                    xlsform = EXCLUDED.xlsform,
+                    xform_xml = EXCLUDED.xform_xml,
+                    size_bytes = EXCLUDED.size_bytes,
+                    last_used_at = NOW();
+            """,
+                {
+                    "cache_key": cache_key,
+                    "xform_id": xform_id,
+                    "xlsform": xlsform,
+                    "xform_xml": xform_xml,
+                    "size_bytes": len(xlsform) + len(xform_xml),
+                },
+            )
+
+    @classmethod
+    async def evict(cls, db: AsyncConnection, max_bytes: int) -> int:
+        """Delete least recently used entries beyond max_bytes in total size.
+
+        Returns the number of entries deleted.
+        """
+        async with db.cursor() as cur:
+            await cur.execute(
+                """
+                DELETE FROM xlsform_transform_cache
+                WHERE cache_key IN (
+                    SELECT cache_key
+                    FROM (
+                        SELECT
+                            cache_key,
+                            SUM(size_bytes) OVER (
+                                ORDER BY last_used_at DESC, cache_key
+                            ) AS cumulative_bytes
+                        FROM xlsform_transform_cache
+                    ) AS ranked
+                    WHERE cumulative_bytes > %(max_bytes)s
+                );
+            """,
+                {"max_bytes": max_bytes},
+            )
+            return cur.rowcount
+
+
+@dataclass(slots=True)
+class DbSlowQuery:
+    """Table slow_queries.
+
+    Statements slower than DB_SLOW_QUERY_MS, bounded to the newest rows.
+    """
+
+    id: Optional[int] = None
+    recorded_at: Optional[AwareDatetime] = None
+    duration_ms: Optional[float] = None
+    query: Optional[str] = None
+    params_shape: Optional[Any] = None
+    call_site: Optional[str] = None
+    request: Optional[str] = None
+    plan: Optional[Any] = None
+
+    @classmethod
+    async def create_many(cls, db: AsyncConnection, entries: list[Self]) -> None:
+        """Insert recorded slow queries."""
+        async with db.cursor() as cur:
+            await cur.executemany(
+                """
+                INSERT INTO slow_queries (
+                    recorded_at, duration_ms, query, params_shape, call_site,
+                    request, plan
+                )
+                VALUES (
+                    %(recorded_at)s, %(duration_ms)s, %(query)s, %(params_shape)s,
+                    %(call_site)s, %(request)s, %(plan)s
+                );
+            """,
+                [
+                    {
+                        "recorded_at": entry.recorded_at,
+                        "duration_ms": entry.duration_ms,
+                        "query": entry.query,
+                        "params_shape": json.dumps(entry.params_shape),
+                        "call_site": entry.call_site,
+                        "request": entry.request,
+                        "plan": json.dumps(entry.plan) if entry.plan else None,
+                    }
+                    for entry in entries
+                ],
+            )
+
+    @classmethod
+    async def trim(cls, db: AsyncConnection, max_rows: int) -> int:
+        """Delete all but the newest max_rows entries.
+
+        Returns the number of entries deleted.
+        """
+        async with db.cursor() as cur:
+            await cur.execute(
+                """
+                DELETE FROM slow_queries
+                WHERE id <= (
+                    SELECT id FROM slow_queries
+                    ORDER BY id DESC
+                    OFFSET %(max_rows)s
+                    LIMIT 1
+                );
+            """,
+                {"max_rows": max_rows},
+            )
+            return cur.rowcount
+
+
+# Heavy DbProject columns, by group. These are skipped by
+# DbProject.one(minimal=True) unless included, or loaded later with
+# DbProject.load
+PROJECT_COLUMN_GROUPS: dict[str, tuple[str, ...]] = {
+    "task_areas": ("task_areas_geojson",),
+    "extract": ("data_extract_geojson",),
+    "form": ("xlsform_content",),
+}
+
+
+# JSONB columns holding GeoJSON, for DbProject.raw_geojson
+RAW_GEOJSON_COLUMNS = ("data_extract_geojson", "task_areas_geojson")
+
+
+class RawJsonLoader(Loader):
+    """Load json/jsonb values as their JSON text (bytes), without parsing."""
+
+    def load(self, data: Buffer) -> bytes:
+        """Return the value as sent by Postgres."""
+        return bytes(data)
+
+
+def _bbox_params(bbox: tuple[float, float, float, float]) -> dict[str, float]:
+    """Query parameters for a (xmin, ymin, xmax, ymax) envelope."""
+    xmin, ymin, xmax, ymax = bbox
+    return {"xmin": xmin, "ymin": ymin, "xmax": xmax, "ymax": ymax}
+
+
+def _project_group_columns(groups: tuple[str, ...]) -> list[str]:
+    """Column names for the given groups, validating the group names."""
+    columns = []
+    for group in groups:
+        if group not in PROJECT_COLUMN_GROUPS:
+            raise ValueError(f"Unknown project column group: {group}")
+        columns.extend(PROJECT_COLUMN_GROUPS[group])
+    return columns
+
+
 @dataclass(slots=True)
 class DbProject:
     """Table projects."""
@@ -514,6 +783,8 @@ class DbProject:
     outline: Optional[dict] = None
     status: Optional[ProjectStatus] = None
     visibility: Optional[ProjectVisibility] = None
+    # SHA-256 of the XLSForm, the ETag of its download
+    xlsform_digest: Optional[str] = None
     xlsform_content: Optional[bytes] = None
     hashtags: Optional[list[str]] = None
     custom_tms_url: Optional[str] = None
@@ -525,18 +796,39 @@ class DbProject:
     basemap_attach_status: Optional[str] = None
     basemap_attach_error: Optional[str] = None
     basemap_attach_updated_at: Optional[AwareDatetime] = None
+    # Geometry rounding and simplification when saving the extract and task
+    # areas (None for the GEOMETRY_* settings)
+    geometry_precision: Optional[int] = None
+    simplify_tolerance_meters: Optional[float] = None
     created_at: Optional[AwareDatetime] = None
     updated_at: Optional[AwareDatetime] = None
+    # Generated from the searchable text fields (read only)
+    search_vector: Optional[str] = None
     # Encrypted ODK appuser token (may be null until generated)
     odk_token: Optional[str] = None
     # GeoJSON data extract stored directly in database (replaces S3 URL approach)
     data_extract_geojson: Optional[dict] = None
     # GeoJSON task areas/boundaries stored directly in database
     task_areas_geojson: Optional[dict] = None
+    # OSM options the data extract was downloaded with, reused to refresh it
+    data_extract_options: Optional[dict] = None
 
     # Computed
     manager_username: Optional[str] = None
 
+    @classmethod
+    def _minimal_columns(cls, include: tuple[str, ...]) -> sql.Composable:
+        """Project metadata columns, plus the included heavy column groups."""
+        heavy = {column for group in PROJECT_COLUMN_GROUPS.values() for column in group}
+        skipped = heavy.difference(_project_group_columns(include))
+        # Computed in the query, not stored in the projects table, or unused
+        skipped.update(("outline", "manager_username", "odk_token", "search_vector"))
+        return sql.SQL(", ").join(
+            sql.SQL("p.{}").format(sql.Identifier(field.name))
+            for field in fields(cls)
+            if field.name not in skipped
+        )
+
     @classmethod
     async def one(
         cls,
@@ -544,11 +836,22 @@ class DbProject:
         project_id: int,
         minimal: Optional[bool] = None,
         warn_on_missing_token: Optional[bool] = None,
+        include: tuple[str, ...] = (),
     ) -> Self:
-        """Get project by ID."""
-        sql = """
+        """Get project by ID.
+
+        Args:
+            db: The database connection.
+            project_id: The project ID.
+            minimal: Skip the heavy columns in PROJECT_COLUMN_GROUPS (the data
+                extract, task areas and XLSForm), leaving them as None.
+            warn_on_missing_token: Unused.
+            include: Heavy column groups to load anyway, if minimal.
+        """
+        columns = cls._minimal_columns(include) if minimal else sql.SQL("p.*")
+        query = sql.SQL("""
             SELECT
-                p.*,
+                {columns},
                 u.username AS manager_username,
                 ST_AsGeoJSON(p.outline)::jsonb AS outline
             FROM
@@ -556,11 +859,11 @@ class DbProject:
             LEFT JOIN users u ON u.sub = p.created_by_sub
             WHERE
                 p.id = %(project_id)s;
-        """
+        """).format(columns=columns)
 
         async with db.cursor(row_factory=class_row(cls)) as cur:
             await cur.execute(
-                sql,
+                query,
                 {"project_id": project_id},
             )
             db_project = await cur.fetchone()
@@ -570,6 +873,64 @@ class DbProject:
 
         return db_project
 
+    async def load(self, db: AsyncConnection, *groups: str) -> Self:
+        """Load heavy column groups skipped by DbProject.one(minimal=True).
+
+        All groups are fetched in one query, e.g.
+        `await project.load(db, "extract", "form")`.
+        """
+        columns = _project_group_columns(groups)
+        if not columns:
+            return self
+
+        query = sql.SQL("SELECT {columns} FROM projects WHERE id = %(project_id)s;")
+        async with db.cursor() as cur:
+            await cur.execute(
+                query.format(columns=sql.SQL(", ").join(map(sql.Identifier, columns))),
+                {"project_id": self.id},
+            )
+            row = await cur.fetchone()
+
+        if row is None:
+            raise KeyError(f"Project ({self.id}) not found.")
+
+        for column, value in zip(columns, row, strict=True):
+            setattr(self, column, value)
+        return self
+
+    @classmethod
+    async def raw_geojson(
+        cls, db: AsyncConnection, project_id: int, column: str
+    ) -> Optional[bytes]:
+        """Get a stored GeoJSON column as JSON bytes, skipping the JSON loader.
+
+        For responses returning the stored value as-is, this avoids parsing
+        to dicts and serializing again, which is slow for large extracts.
+
+        Args:
+            db: The database connection.
+            project_id: The project ID.
+            column: data_extract_geojson or task_areas_geojson.
+
+        Returns:
+            The JSON text, or None if the column is empty.
+        """
+        if column not in RAW_GEOJSON_COLUMNS:
+            raise ValueError(f"Not a stored GeoJSON column: {column}")
+
+        query = sql.SQL("SELECT {column} FROM projects WHERE id = %(project_id)s;")
+        async with db.cursor() as cur:
+            cur.adapters.register_loader("jsonb", RawJsonLoader)
+            await cur.execute(
+                query.format(column=sql.Identifier(column)),
+                {"project_id": project_id},
+            )
+            row = await cur.fetchone()
+
+        if row is None:
+            raise KeyError(f"Project ({project_id}) not found.")
+        return row[0]
+
     @classmethod
     async def all(  # noqa: PLR0913
         cls,
@@ -601,20 +962,24 @@ class DbProject:
             params["status"] = status
 
         if search:
+            # Whole words or prefixes via search_vector, else any substring
+            # via the trigram index (same expression as the index)
             filters.append(
                 """
                 (
-                    project_name ILIKE %(search)s
-                    OR description ILIKE %(search)s
-                    OR location_str ILIKE %(search)s
-                    OR slug ILIKE %(search)s
-                    OR LOWER(REPLACE(REPLACE(slug, '-', ' '), '_', ' '))
-                        ILIKE %(search)s
-                    OR array_to_string(hashtags, ' ') ILIKE %(search)s
+                    p.search_vector @@ search.query
+                    OR project_search_text(
+                        p.project_name,
+                        p.slug,
+                        p.hashtags,
+                        p.location_str,
+                        p.description
+                    ) ILIKE %(search_pattern)s
                 )
                 """
             )
-            params["search"] = f"%{search}%"
+            params["search"] = search
+            params["search_pattern"] = f"%{search}%"
 
         sort_options = {
             "newest": sql.SQL("created_at DESC NULLS LAST, id DESC"),
@@ -628,6 +993,12 @@ class DbProject:
                 "created_at DESC NULLS LAST, id DESC"
             ),
         }
+        if search:
+            sort_options["relevance"] = sql.SQL(
+                "ts_rank_cd(p.search_vector, search.query) DESC NULLS LAST, "
+                "created_at DESC NULLS LAST, id DESC"
+            )
+            sort_by = sort_by or "relevance"
         selected_sort = sort_options.get(sort_by or "newest", sort_options["newest"])
 
         query = sql.SQL(
@@ -638,6 +1009,19 @@ class DbProject:
             FROM projects p
         """
         )
+        if search:
+            # Every search word, matched as a prefix (for search-as-you-type).
+            # NULL if there are no words, e.g. only punctuation.
+            query += sql.SQL(
+                """
+                CROSS JOIN (
+                    SELECT to_tsquery('simple', string_agg(
+                        quote_literal(lexeme) || ':*', ' & '
+                    )) AS query
+                    FROM unnest(to_tsvector('simple', %(search)s))
+                ) AS search
+            """
+            )
         if filters:
             query += sql.SQL(" WHERE ")
             query += sql.SQL(" AND ").join(sql.SQL(clause) for clause in filters)
@@ -655,6 +1039,84 @@ class DbProject:
             await cur.execute(query, params)
             return await cur.fetchall()
 
+    @classmethod
+    async def centroids_within(
+        cls,
+        db: AsyncConnection,
+        bbox: tuple[float, float, float, float],
+        limit: int,
+    ) -> list[tuple[int, float, float, str]]:
+        """Projects with a centroid in the bbox, as (id, lon, lat, status).
+
+        The outline GiST index is used to find candidates.
+        """
+        async with db.cursor() as cur:
+            await cur.execute(
+                """
+                WITH bounds AS (
+                    SELECT ST_MakeEnvelope(
+                        %(xmin)s, %(ymin)s, %(xmax)s, %(ymax)s, 4326
+                    ) AS envelope
+                ),
+                visible AS (
+                    SELECT p.id, p.status, ST_Centroid(p.outline) AS centroid
+                    FROM projects p, bounds
+                    WHERE p.outline && bounds.envelope
+                )
+                SELECT
+                    visible.id,
+                    round(ST_X(centroid)::numeric, 6)::float8,
+                    round(ST_Y(centroid)::numeric, 6)::float8,
+                    visible.status::text
+                FROM visible, bounds
+                WHERE centroid && bounds.envelope
+                ORDER BY visible.id
+                LIMIT %(limit)s;
+            """,
+                {**_bbox_params(bbox), "limit": limit},
+            )
+            return await cur.fetchall()
+
+    @classmethod
+    async def clusters_within(
+        cls,
+        db: AsyncConnection,
+        bbox: tuple[float, float, float, float],
+        cell_size: float,
+    ) -> list[tuple[int, float, float, int, str]]:
+        """Projects in the bbox, grouped by centroid into grid cells.
+
+        Returns (count, lon, lat, id, status) per cell, with the mean
+        centroid. The id and status are only meaningful if count is 1.
+        """
+        async with db.cursor() as cur:
+            await cur.execute(
+                """
+                WITH bounds AS (
+                    SELECT ST_MakeEnvelope(
+                        %(xmin)s, %(ymin)s, %(xmax)s, %(ymax)s, 4326
+                    ) AS envelope
+                ),
+                visible AS (
+                    SELECT p.id, p.status, ST_Centroid(p.outline) AS centroid
+                    FROM projects p, bounds
+                    WHERE p.outline && bounds.envelope
+                )
+                SELECT
+                    count(*)::int,
+                    round(avg(ST_X(centroid))::numeric, 6)::float8,
+                    round(avg(ST_Y(centroid))::numeric, 6)::float8,
+                    min(visible.id),
+                    min(visible.status::text)
+                FROM visible, bounds
+                WHERE centroid && bounds.envelope
+                GROUP BY ST_SnapToGrid(centroid, %(cell_size)s)
+                ORDER BY 1 DESC;
+            """,
+                {**_bbox_params(bbox), "cell_size": cell_size},
+            )
+            return await cur.fetchall()
+
     @classmethod
     async def count(cls, db: AsyncConnection) -> int:
         """Return total project count."""
@@ -684,6 +1146,8 @@ class DbProject:
             # Remove plaintext password if present
             model_dump.pop("external_project_password", None)
 
+        _add_xlsform_digest(model_dump)
+
         columns = []
         value_placeholders: list[sql.Composable] = []
 
@@ -694,13 +1158,13 @@ class DbProject:
                     sql.SQL("ST_GeomFromGeoJSON({})").format(sql.Placeholder(key))
                 )
                 # Must be string json for db input
-                model_dump[key] = json.dumps(model_dump[key])
+                model_dump[key] = dumps_str(model_dump[key])
             elif key == "data_extract_geojson" and isinstance(model_dump[key], dict):
                 # Convert GeoJSON dict to JSON string for JSONB column
                 value_placeholders.append(
                     sql.SQL("{}::jsonb").format(sql.Placeholder(key))
                 )
-                model_dump[key] = json.dumps(model_dump[key])
+                model_dump[key] = dumps_str(model_dump[key])
             else:
                 value_placeholders.append(sql.Placeholder(key))
 
@@ -767,6 +1231,7 @@ class DbProject:
         model_dump = dump_and_check_model(project_update)
         _add_encrypted_odk_credentials(project_update, model_dump)
         _normalize_project_jsonb_fields(model_dump)
+        _add_xlsform_digest(model_dump)
         placeholders = _project_update_placeholders(model_dump)
         _ensure_ftm_project_hashtag(model_dump, project_id)
 
@@ -793,6 +1258,8 @@ class DbProject:
                 detail=msg,
             )
 
+        if "status" in model_dump:
+            invalidate_project_access(project_id)
         return updated_project
 
     def get_odk_credentials(self) -> Optional["ODKCentral"]:
@@ -827,6 +1294,68 @@ class DbProject:
             """,
                 {"project_id": project_id},
             )
+        invalidate_project_access(project_id)
+
+
+@dataclass(slots=True)
+class DbDataExtractChange:
+    """Table data_extract_changes.
+
+    OSM features new, changed or deleted by each refresh of a project
+    data extract.
+    """
+
+    id: Optional[int] = None
+    project_id: Optional[int] = None
+    refreshed_at: Optional[AwareDatetime] = None
+    osm_id: Optional[str] = None
+    change: Optional[ExtractChangeType] = None
+    old_version: Optional[int] = None
+    new_version: Optional[int] = None
+
+    @classmethod
+    async def create_many(cls, db: AsyncConnection, changes: list[Self]) -> None:
+        """Insert the changes found by one refresh."""
+        async with db.cursor() as cur:
+            await cur.executemany(
+                """
+                INSERT INTO data_extract_changes (
+                    project_id, osm_id, change, old_version, new_version
+                )
+                VALUES (
+                    %(project_id)s, %(osm_id)s, %(change)s, %(old_version)s,
+                    %(new_version)s
+                );
+            """,
+                [
+                    {
+                        "project_id": change.project_id,
+                        "osm_id": change.osm_id,
+                        "change": change.change,
+                        "old_version": change.old_version,
+                        "new_version": change.new_version,
+                    }
+                    for change in changes
+                ],
+            )
+
+    @classmethod
+    async def all_for_project(
+        cls, db: AsyncConnection, project_id: int, limit: int = 1000
+    ) -> list[Self]:
+        """The most recent changes for a project, newest first."""
+        async with db.cursor(row_factory=class_row(cls)) as cur:
+            await cur.execute(
+                """
+                SELECT *
+                FROM data_extract_changes
+                WHERE project_id = %(project_id)s
+                ORDER BY id DESC
+                LIMIT %(limit)s;
+            """,
+                {"project_id": project_id, "limit": limit},
+            )
+            return await cur.fetchall()
 
 
 def slugify(name: Optional[str]) -> Optional[str]:
@@ -17,7 +17,6 @@
 #
 """PostGIS helper funcs for DB-backed geometry operations."""
 
-import json
 import logging
 from datetime import datetime, timezone
 from random import getrandbits
@@ -30,6 +29,7 @@ from psycopg.rows import dict_row
 from psycopg.types.json import Json
 
 from app.db.enums import DbGeomType
+from app.helpers.geojson_serializer import dumps_str
 
 log = logging.getLogger(__name__)
 
@@ -105,7 +105,7 @@ def _split_feature_arrays(
     for feature in features:
         feature_ids.append(str(feature["properties"].get("osm_id")))
         feature_properties.append(Json(feature["properties"]))
-        feature_geometries.append(json.dumps(feature["geometry"]))
+        feature_geometries.append(dumps_str(feature["geometry"]))
     return feature_ids, feature_properties, feature_geometries
 
 
@@ -118,7 +118,7 @@ def _split_task_boundary_arrays(
     for idx, task_feature in enumerate(task_boundary_features, start=1):
         if not task_feature.get("geometry"):
             continue
-        task_geometries.append(json.dumps(task_feature["geometry"]))
+        task_geometries.append(dumps_str(task_feature["geometry"]))
         task_indices.append(idx)
     return task_indices, task_geometries
 
@@ -216,6 +216,153 @@ def _split_records_to_feature_collections(
     return result_dict
 
 
+# Metres per degree of latitude, to convert simplification tolerances
+METERS_PER_DEGREE = 111_320
+# ST_AsGeoJSON decimal digits if not reducing precision (its default is 9)
+MAX_GEOJSON_DECIMAL_DIGITS = 15
+
+_SIMPLIFY_EXPRESSIONS = {
+    # Simplify each geometry on its own
+    False: sql.SQL("ST_SimplifyPreserveTopology(geom, %(tolerance)s)"),
+    # Simplify polygons together, so shared edges stay shared (gap-free)
+    True: sql.SQL("ST_CoverageSimplify(geom, %(tolerance)s) OVER ()"),
+}
+
+# Add the vertices of neighbouring polygons lying on each polygon's edges
+# (T-junctions), so rounding moves shared boundaries identically
+_NODED_COVERAGE = sql.SQL("""
+    SELECT
+        s.idx,
+        s.feature,
+        s.original,
+        COALESCE(
+            (
+                SELECT ST_Snap(s.geom, ST_Collect(n.geom), %(snap_tolerance)s)
+                FROM simplified AS n
+                WHERE n.idx <> s.idx AND n.geom && s.geom
+            ),
+            s.geom
+        ) AS geom
+    FROM simplified AS s
+""")
+
+
+async def reduce_featcol_precision(
+    db: AsyncConnection,
+    featcol: dict,
+    precision: Optional[int],
+    simplify_tolerance_meters: float = 0,
+    coverage: bool = False,
+) -> dict:
+    """Simplify and round the geometries of a FeatureCollection in PostGIS.
+
+    Geometries are snapped to a grid of `precision` decimal places with
+    ST_ReducePrecision, which keeps them valid (unlike rounding the JSON),
+    and identical vertices of adjacent polygons stay identical. For a
+    coverage, vertices of neighbours lying on a polygon's edges are first
+    added to it, so T-junctions do not open slivers when rounded.
+
+    Args:
+        db: The database connection.
+        featcol: The FeatureCollection (not modified).
+        precision: Decimal places to keep, or None to keep all.
+        simplify_tolerance_meters: Simplification tolerance, 0 to skip.
+        coverage: Whether the features are a polygonal coverage (e.g. task
+            areas), simplified with ST_CoverageSimplify to stay gap-free.
+
+    Returns:
+        The FeatureCollection, with feature order and properties kept.
+        Geometries that would collapse (e.g. tiny polygons) are kept as-is.
+    """
+    simplified = (
+        _SIMPLIFY_EXPRESSIONS[coverage]
+        if simplify_tolerance_meters > 0
+        else sql.SQL("geom")
+    )
+    reduced = (
+        sql.SQL("ST_ReducePrecision(geom, %(grid_size)s)")
+        if precision is not None
+        else sql.SQL("geom")
+    )
+    noded = (
+        _NODED_COVERAGE
+        if coverage and precision is not None
+        else sql.SQL("SELECT idx, feature, original, geom FROM simplified")
+    )
+    grid_size = 10**-precision if precision is not None else 0
+    query = sql.SQL("""
+        WITH
+        input AS (SELECT %(featcol)s::jsonb AS featcol),
+        features AS (
+            SELECT
+                f.ordinality AS idx,
+                f.feature,
+                ST_SetSRID(
+                    ST_GeomFromGeoJSON(NULLIF(f.feature -> 'geometry', 'null')),
+                    4326
+                ) AS geom
+            FROM input,
+                jsonb_array_elements(input.featcol -> 'features')
+                WITH ORDINALITY AS f(feature, ordinality)
+        ),
+        simplified AS (
+            SELECT idx, feature, geom AS original, {simplified} AS geom
+            FROM features
+            WHERE geom IS NOT NULL
+        ),
+        noded AS ({noded}),
+        reduced AS (
+            SELECT idx, feature, original, {reduced} AS geom
+            FROM noded
+        ),
+        output AS (
+            SELECT
+                features.idx,
+                CASE
+                    WHEN reduced.geom IS NULL THEN features.feature
+                    ELSE jsonb_set(
+                        features.feature,
+                        '{{geometry}}',
+                        ST_AsGeoJSON(
+                            CASE
+                                WHEN ST_IsEmpty(reduced.geom) THEN reduced.original
+                                ELSE reduced.geom
+                            END,
+                            %(digits)s
+                        )::jsonb
+                    )
+                END AS feature
+            FROM features
+            LEFT JOIN reduced ON reduced.idx = features.idx
+        )
+        SELECT input.featcol || jsonb_build_object(
+            'features',
+            COALESCE(
+                (SELECT jsonb_agg(feature ORDER BY idx) FROM output),
+                '[]'::jsonb
+            )
+        )
+        FROM input;
+    """).format(simplified=simplified, noded=noded, reduced=reduced)
+
+    async with db.cursor() as cur:
+        await cur.execute(
+            query,
+            {
+                "featcol": dumps_str(featcol),
+                "tolerance": simplify_tolerance_meters / METERS_PER_DEGREE,
+                "grid_size": grid_size,
+                # Only vertices on the edges (up to floating point error)
+                "snap_tolerance": grid_size / 100,
+                "digits": (
+                    precision if precision is not None else MAX_GEOJSON_DECIMAL_DIGITS
+                ),
+            },
+        )
+        row = await cur.fetchone()
+    return row[0]
+
+
 def add_required_geojson_properties(
     featcol: dict,
 ) -> dict:
@@ -0,0 +1,253 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Per-request DB query counting, to catch N+1 patterns.
+
+Pool connections use a cursor class that records each query into the
+QueryStats of the current request (a ContextVar set by the middleware).
+At the end of the request, exceeding DB_QUERY_BUDGET or repeating an
+identical query (same SQL and parameters) logs a warning, or raises if
+DB_QUERY_BUDGET_RAISE is set (e.g. in tests). Nothing is tracked if the
+budget is disabled.
+
+The same cursor also passes statements slower than DB_SLOW_QUERY_MS to the
+slow query log, for requests and background tasks alike.
+"""
+
+import logging
+from collections import Counter
+from collections.abc import Hashable, Iterator, Mapping, Sized
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from time import perf_counter
+from typing import Any, Optional
+from uuid import UUID
+
+from litestar.types import ASGIApp, Receive, Scope, Send
+from psycopg import AsyncConnection, AsyncCursor, sql
+
+from app.config import MonitoringTypes, settings
+from app.db.slow_queries import record_slow_query
+
+log = logging.getLogger(__name__)
+
+# Length of SQL shown in warnings
+SQL_PREVIEW_CHARS = 120
+# Longer str / bytes parameters are compared by type and length only
+PARAM_FINGERPRINT_MAX_LEN = 256
+
+# Parameter types compared by value
+_SCALAR_PARAM_TYPES = (bool, int, float, Decimal, date, datetime, UUID)
+
+
+class QueryBudgetError(AssertionError):
+    """A request ran too many, or repeated, DB queries."""
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """DB queries run while handling one request."""
+
+    name: str = ""
+    queries: int = 0
+    rows: int = 0
+    seconds: float = 0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, query: str, params: Any, seconds: float, rows: int) -> None:
+        """Record one executed query."""
+        self.queries += 1
+        self.rows += max(rows, 0)
+        self.seconds += seconds
+        self.statements[(query, params_fingerprint(params))] += 1
+
+    def record_batch(self, seconds: float, rows: int) -> None:
+        """Record one executemany batch, not checked for repeats."""
+        self.queries += 1
+        self.rows += max(rows, 0)
+        self.seconds += seconds
+
+    def repeated(self) -> list[tuple[str, int]]:
+        """Queries run more than once with identical parameters."""
+        return [
+            (query, count)
+            for (query, _), count in self.statements.most_common()
+            if count > 1
+        ]
+
+
+def _param_fingerprint(value: Any) -> Hashable:
+    if value is None or isinstance(value, _SCALAR_PARAM_TYPES):
+        return value
+    if isinstance(value, (str, bytes)) and len(value) <= PARAM_FINGERPRINT_MAX_LEN:
+        return value
+    if isinstance(value, Sized):
+        return (type(value).__name__, len(value))
+    return type(value).__name__
+
+
+def params_fingerprint(params: Any) -> Hashable:
+    """Cheap key telling repeated query parameters apart, without copying them.
+
+    Large values (e.g. GeoJSON, XLSForms) are only compared by type and
+    length, so queries differing in those alone count as repeats.
+    """
+    if isinstance(params, Mapping):
+        return tuple((key, _param_fingerprint(value)) for key, value in params.items())
+    if isinstance(params, (list, tuple)):
+        return tuple(_param_fingerprint(value) for value in params)
+    return _param_fingerprint(params)
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries(name: str = "") -> Iterator[QueryStats]:
+    """Record the queries run within the block (and tasks it starts)."""
+    stats = QueryStats(name=name)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _query_text(query: Any, conn: AsyncConnection) -> str:
+    if isinstance(query, sql.Composable):
+        return query.as_string(conn)
+    if isinstance(query, bytes):
+        return query.decode(errors="replace")
+    return str(query)
+
+
+class QueryCountingCursor(AsyncCursor):
+    """Cursor recording queries into the current request's QueryStats."""
+
+    async def execute(self, query: Any, params: Any = None, **kwargs: Any) -> Any:
+        """Execute a query, recording it if a request is being tracked."""
+        stats = _query_stats.get()
+        slow_seconds = settings.DB_SLOW_QUERY_MS / 1000
+        if stats is None and slow_seconds <= 0:
+            return await super().execute(query, params, **kwargs)
+
+        start = perf_counter()
+        try:
+            result = await super().execute(query, params, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            query_text = _query_text(query, self.connection)
+            if stats is not None:
+                stats.record(query_text, params, seconds, self.rowcount)
+
+        if 0 < slow_seconds <= seconds:
+            await record_slow_query(
+                self.connection,
+                query_text,
+                params,
+                seconds,
+                stats.name if stats is not None else "",
+            )
+        return result
+
+    async def executemany(self, query: Any, params_seq: Any, **kwargs: Any) -> None:
+        """Execute a batch, recorded as one query."""
+        stats = _query_stats.get()
+        if stats is None:
+            return await super().executemany(query, params_seq, **kwargs)
+
+        start = perf_counter()
+        try:
+            return await super().executemany(query, params_seq, **kwargs)
+        finally:
+            stats.record_batch(perf_counter() - start, self.rowcount)
+
+
+async def configure_query_counting(conn: AsyncConnection) -> None:
+    """Use the counting cursor for a new pool connection (pool configure hook)."""
+    conn.cursor_factory = QueryCountingCursor
+
+
+def _preview(query: str) -> str:
+    query = " ".join(query.split())
+    if len(query) <= SQL_PREVIEW_CHARS:
+        return query
+    return f"{query[:SQL_PREVIEW_CHARS]}..."
+
+
+def check_query_stats(stats: QueryStats, request_name: str) -> None:
+    """Warn (or raise) if a request exceeded the budget or repeated queries."""
+    problems = []
+    if 0 < settings.DB_QUERY_BUDGET < stats.queries:
+        problems.append(f"{stats.queries} queries (budget {settings.DB_QUERY_BUDGET})")
+    problems.extend(
+        f"identical query run {count} times: {_preview(query)}"
+        for query, count in stats.repeated()
+    )
+    if not problems:
+        return
+
+    message = f"{request_name}: " + "; ".join(problems)
+    if settings.DB_QUERY_BUDGET_RAISE:
+        raise QueryBudgetError(message)
+    log.warning(message)
+
+
+def _set_span_attributes(stats: QueryStats) -> None:
+    """Attach the counts to the current OpenTelemetry span."""
+    from opentelemetry import trace
+
+    trace.get_current_span().set_attributes(
+        {
+            "db.query_count": stats.queries,
+            "db.row_count": stats.rows,
+            "db.query_seconds": stats.seconds,
+            "db.repeated_query_count": len(stats.repeated()),
+        }
+    )
+
+
+def create_query_stats_middleware(app: ASGIApp) -> ASGIApp:
+    """ASGI middleware counting the DB queries of each HTTP request."""
+    tracing = settings.MONITORING in (
+        MonitoringTypes.SENTRY,
+        MonitoringTypes.OPENOBSERVE,
+    )
+
+    async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or settings.DB_QUERY_BUDGET <= 0:
+            await app(scope, receive, send)
+            return
+
+        request_name = f"{scope['method']} {scope.get('path_template', scope['path'])}"
+        with track_queries(request_name) as stats:
+            try:
+                await app(scope, receive, send)
+            finally:
+                if tracing:
+                    _set_span_attributes(stats)
+                log.debug(
+                    f"{scope['method']} {scope['path']}: {stats.queries} queries, "
+                    f"{stats.rows} rows in {stats.seconds * 1000:.1f}ms"
+                )
+
+        check_query_stats(stats, request_name)
+
+    return middleware
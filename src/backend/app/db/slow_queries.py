@@ -0,0 +1,228 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Slow query log, with EXPLAIN plans for a sample of statements.
+
+Opt in by setting DB_SLOW_QUERY_MS. Each statement slower than this is
+logged with its normalized SQL (literals replaced by ``?``), the shape of
+its parameters (types, not values), duration, the calling app code and the
+request route, if any.
+
+For DB_SLOW_QUERY_EXPLAIN_RATE of them, ``EXPLAIN (FORMAT JSON)`` is run on
+the same connection (in a savepoint, without ANALYZE, so nothing is
+executed twice). Entries are buffered in memory and periodically written to
+the slow_queries table, keeping the newest DB_SLOW_QUERY_MAX_ROWS rows.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import sys
+from collections import deque
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import Any, Mapping, Optional
+
+from litestar import Litestar
+from psycopg import AsyncClientCursor, AsyncConnection
+from psycopg_pool import AsyncConnectionPool
+
+from app.config import settings
+from app.db.models import DbSlowQuery
+
+log = logging.getLogger(__name__)
+
+FLUSH_SECONDS = 30
+# Entries beyond this, e.g. if the DB is unreachable, drop the oldest
+MAX_PENDING = 1000
+# Length of SQL shown in log messages
+SQL_PREVIEW_CHARS = 200
+EXPLAINABLE_STATEMENTS = ("SELECT", "WITH", "VALUES", "INSERT", "UPDATE", "DELETE")
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames in these files are skipped when looking for the call site
+INSTRUMENTATION_FILES = (
+    os.path.join(APP_DIR, "db", "query_stats.py"),
+    os.path.join(APP_DIR, "db", "slow_queries.py"),
+)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+pending: deque[DbSlowQuery] = deque(maxlen=MAX_PENDING)
+
+
+def normalize_sql(query: str) -> str:
+    """Replace literals with ``?`` and collapse whitespace."""
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    return " ".join(query.split())
+
+
+def _value_shape(value: Any) -> str:
+    if isinstance(value, (list, tuple, set, dict, bytes)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def params_shape(params: Any) -> Any:
+    """Describe query parameters by type (and length), without their values."""
+    if params is None:
+        return None
+    if isinstance(params, Mapping):
+        return {str(key): _value_shape(value) for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [_value_shape(value) for value in params]
+    return _value_shape(params)
+
+
+def call_site() -> str:
+    """The innermost app frame running the query, e.g. a DbProject method."""
+    frame = sys._getframe(1)  # noqa: SLF001
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APP_DIR) and filename not in INSTRUMENTATION_FILES:
+            path = os.path.relpath(filename, os.path.dirname(APP_DIR))
+            return f"{path}:{frame.f_lineno} ({frame.f_code.co_qualname})"
+        frame = frame.f_back
+    return "unknown"
+
+
+async def explain(conn: AsyncConnection, query: str, params: Any) -> Optional[Any]:
+    """Get the query plan, without running the query or affecting the transaction.
+
+    Returns None if the statement cannot be explained.
+    """
+    if not query.lstrip(" \n\t(").upper().startswith(EXPLAINABLE_STATEMENTS):
+        return None
+    try:
+        # A savepoint if the query ran in a transaction, so an error here
+        # does not abort it. Parameters are bound client side, as EXPLAIN
+        # cannot always infer their types.
+        async with conn.transaction(), AsyncClientCursor(conn) as cur:
+            await cur.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+            row = await cur.fetchone()
+    except Exception as e:
+        log.debug(f"Could not EXPLAIN slow query: {e}")
+        return None
+    return row[0] if row else None
+
+
+async def record_slow_query(
+    conn: AsyncConnection,
+    query: str,
+    params: Any,
+    seconds: float,
+    request: str = "",
+) -> None:
+    """Log a slow statement, buffering it to be written to slow_queries."""
+    normalized = normalize_sql(query)
+    site = call_site()
+    duration_ms = round(seconds * 1000, 1)
+    context = f"{site}, {request}" if request else site
+    log.warning(
+        f"Slow query ({duration_ms}ms) at {context}: {normalized[:SQL_PREVIEW_CHARS]}"
+    )
+
+    plan = None
+    if random.random() < settings.DB_SLOW_QUERY_EXPLAIN_RATE:  # noqa: S311
+        plan = await explain(conn, query, params)
+
+    pending.append(
+        DbSlowQuery(
+            recorded_at=datetime.now(timezone.utc),
+            duration_ms=duration_ms,
+            query=normalized,
+            params_shape=params_shape(params),
+            call_site=site,
+            request=request or None,
+            plan=plan,
+        )
+    )
+
+
+async def flush_slow_queries(db: AsyncConnection) -> int:
+    """Write buffered entries, returning the number written.
+
+    On failure the entries are dropped, as this is diagnostic data only.
+    """
+    if not pending:
+        return 0
+
+    entries = list(pending)
+    pending.clear()
+    try:
+        await DbSlowQuery.create_many(db, entries)
+        await DbSlowQuery.trim(db, settings.DB_SLOW_QUERY_MAX_ROWS)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    return len(entries)
+
+
+async def _flush(db_pool: AsyncConnectionPool) -> None:
+    """Flush buffered entries, logging rather than raising on failure."""
+    if not pending:
+        return
+    try:
+        async with db_pool.connection() as conn:
+            flushed = await flush_slow_queries(conn)
+        log.debug(f"Wrote {flushed} slow queries")
+    except Exception as e:
+        log.warning(f"Failed to write slow queries: {e}")
+
+
+async def _flush_periodically(db_pool: AsyncConnectionPool) -> None:
+    """Background loop writing buffered entries."""
+    while True:
+        await asyncio.sleep(FLUSH_SECONDS)
+        await _flush(db_pool)
+
+
+async def start_slow_query_log(server: Litestar) -> None:
+    """Start writing slow queries to the DB (Litestar startup hook)."""
+    if settings.DB_SLOW_QUERY_MS <= 0:
+        return
+    # Imported here, as app.db.database imports this module
+    from app.db.database import DbPool
+
+    log.info(f"Logging DB queries slower than {settings.DB_SLOW_QUERY_MS}ms")
+    server.state.slow_query_flush_task = asyncio.create_task(
+        _flush_periodically(server.state.db_pools[DbPool.MAINTENANCE])
+    )
+
+
+async def stop_slow_query_log(server: Litestar) -> None:
+    """Stop the flusher and write any remaining entries (Litestar shutdown hook).
+
+    Must run before the DB pool is closed.
+    """
+    task = getattr(server.state, "slow_query_flush_task", None)
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        server.state.slow_query_flush_task = None
+
+    from app.db.database import DbPool
+
+    db_pool = getattr(server.state, "db_pools", {}).get(DbPool.MAINTENANCE)
+    if db_pool is not None and not db_pool.closed:
+        await _flush(db_pool)
@@ -11,6 +11,7 @@ from litestar.exceptions import HTTPException
 
 from app.config import settings
 from app.i18n import _
+from app.metrics import observe_outbound
 
 REQUEST_TIMEOUT_SECONDS = 30
 BBOX_COORDINATE_COUNT = 4
@@ -197,9 +198,10 @@ async def search_oam_imagery(bbox: list[float]) -> list[dict[str, Any]]:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
-            response = await client.post(endpoint, json=body)
-            response.raise_for_status()
+        with observe_outbound("oam"):
+            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
+                response = await client.post(endpoint, json=body)
+                response.raise_for_status()
     except httpx.HTTPStatusError as exc:
         _raise_remote_http_error(exc, "OAM imagery search")
     except httpx.HTTPError as exc:
@@ -228,8 +230,9 @@ async def trigger_tilepack_generation(stac_item_id: str) -> tuple[str, str | Non
     """Trigger tilepack generation for a STAC item."""
     endpoint = _tilepack_endpoint(stac_item_id)
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
-            response = await client.post(endpoint)
+        with observe_outbound("oam"):
+            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
+                response = await client.post(endpoint)
     except httpx.HTTPError as exc:
         _raise_remote_request_error(exc, "Tilepack generation trigger")
 
@@ -241,8 +244,9 @@ async def check_tilepack_status(stac_item_id: str) -> tuple[str, str | None]:
     """Check tilepack generation status for a STAC item."""
     endpoint = _tilepack_endpoint(stac_item_id)
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
-            response = await client.get(endpoint)
+        with observe_outbound("oam"):
+            async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT_SECONDS) as client:
+                response = await client.get(endpoint)
     except httpx.HTTPError as exc:
         _raise_remote_request_error(exc, "Tilepack status check")
 
@@ -0,0 +1,119 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Fast JSON serialization for GeoJSON payloads.
+
+Use these instead of `json.dumps` for FeatureCollections and geometries:
+msgspec (which Litestar already uses to serialize responses) encodes them
+several times faster, falling back to the standard library if msgspec is
+unavailable. Output is compact JSON, without spaces.
+
+- `dumps` returns bytes, e.g. for a response body, without decoding.
+- `dumps_str` returns text, e.g. for SQL parameters or HTML.
+- `precision` rounds coordinates to that many decimal places first
+  (6 is about 0.1m). This shrinks the output by about a third, but
+  rounding in Python costs more than encoding, so only use it where the
+  payload size matters more than CPU.
+"""
+
+import json
+from typing import Any, Optional
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+
+if msgspec is not None:
+    _encode = msgspec.json.Encoder().encode
+else:  # pragma: no cover
+
+    def _encode(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _round_positions(coordinates: Any, precision: int) -> Any:
+    """Round a position, or nested lists of positions."""
+    if not coordinates:
+        return coordinates
+    first = coordinates[0]
+    if isinstance(first, (int, float)):
+        return [round(value, precision) for value in coordinates]
+    if first and isinstance(first[0], (int, float)):
+        # A list of positions, e.g. a ring: the most common case
+        return [
+            [round(value, precision) for value in position] for position in coordinates
+        ]
+    return [_round_positions(nested, precision) for nested in coordinates]
+
+
+def round_geometry(geometry: Optional[dict], precision: int) -> Optional[dict]:
+    """Copy of a GeoJSON geometry with coordinates rounded."""
+    if not geometry:
+        return geometry
+    if geometry.get("type") == "GeometryCollection":
+        return {
+            **geometry,
+            "geometries": [
+                round_geometry(part, precision)
+                for part in geometry.get("geometries", [])
+            ],
+        }
+    if "coordinates" not in geometry:
+        return geometry
+    return {
+        **geometry,
+        "coordinates": _round_positions(geometry["coordinates"], precision),
+    }
+
+
+def round_coordinates(geojson: Any, precision: int) -> Any:
+    """Copy of a FeatureCollection, Feature or geometry with coordinates rounded.
+
+    The input is not modified. Other values are returned unchanged.
+    """
+    if not isinstance(geojson, dict):
+        return geojson
+    geojson_type = geojson.get("type")
+    if geojson_type == "FeatureCollection":
+        return {
+            **geojson,
+            "features": [
+                round_coordinates(feature, precision)
+                for feature in geojson.get("features", [])
+            ],
+        }
+    if geojson_type == "Feature":
+        return {
+            **geojson,
+            "geometry": round_geometry(geojson.get("geometry"), precision),
+        }
+    return round_geometry(geojson, precision)
+
+
+def dumps(obj: Any, precision: Optional[int] = None) -> bytes:
+    """Serialize to JSON bytes, optionally rounding GeoJSON coordinates."""
+    if precision is not None:
+        obj = round_coordinates(obj, precision)
+    return _encode(obj)
+
+
+def dumps_str(obj: Any, precision: Optional[int] = None) -> str:
+    """Serialize to JSON text, optionally rounding GeoJSON coordinates."""
+    return dumps(obj, precision).decode()
@@ -17,14 +17,16 @@
 #
 """GeoJSON and geometry helper functions."""
 
-import json
 import logging
 import types
+from dataclasses import dataclass, field
 from typing import Optional
 
 from litestar import status_codes as status
 from litestar.exceptions import HTTPException
-from psycopg import AsyncConnection
+from psycopg import AsyncConnection, sql
+
+from app.helpers.geojson_serializer import dumps_str
 
 log = logging.getLogger(__name__)
 
@@ -57,12 +59,118 @@ async def geojson_area_km2(db: AsyncConnection, geojson_geom: dict) -> float:
                    ST_GeomFromGeoJSON(%s), 4326
                 )::geography) / 1000000
             """,
-            (json.dumps(geojson_geom),),
+            (dumps_str(geojson_geom),),
         )
         row = await cur.fetchone()
     return float(row[0]) if row and row[0] is not None else 0.0
 
 
+async def split_geom_into_tiles(
+    db: AsyncConnection,
+    geojson_geom: dict,
+    max_area_km2: float,
+) -> list[dict]:
+    """Split a GeoJSON polygon into square tiles smaller than an area limit.
+
+    The grid is generated in Web Mercator. As Mercator lengths are inflated
+    by 1/cos(lat), the cell size is scaled using the latitude closest to the
+    equator, so no tile exceeds the limit anywhere in the AOI.
+
+    Args:
+        db (AsyncConnection): The database connection.
+        geojson_geom (dict): The Polygon / MultiPolygon geometry to split.
+        max_area_km2 (float): Maximum geodesic area of each tile in km².
+
+    Returns:
+        list[dict]: The tile geometries, clipped to the input geometry.
+    """
+    # Keep a 10% margin below the limit, to allow for projection error
+    side_m = (max_area_km2 * 0.9) ** 0.5 * 1000
+    async with db.cursor() as cur:
+        await cur.execute(
+            """
+            WITH aoi AS (
+                SELECT ST_SetSRID(ST_GeomFromGeoJSON(%(geom)s), 4326) AS geom
+            ),
+            merc AS (
+                SELECT
+                    ST_Transform(geom, 3857) AS geom,
+                    CASE
+                        WHEN ST_YMin(geom) <= 0 AND ST_YMax(geom) >= 0 THEN 1.0
+                        ELSE COS(RADIANS(
+                            LEAST(ABS(ST_YMin(geom)), ABS(ST_YMax(geom)))
+                        ))
+                    END AS scale
+                FROM aoi
+            ),
+            tiles AS (
+                SELECT
+                    grid.i,
+                    grid.j,
+                    ST_CollectionExtract(
+                        ST_Intersection(grid.geom, merc.geom), 3
+                    ) AS geom
+                FROM merc,
+                    ST_SquareGrid(%(side_m)s / merc.scale, merc.geom) AS grid
+                WHERE ST_Intersects(grid.geom, merc.geom)
+            )
+            SELECT ST_AsGeoJSON(ST_Transform(geom, 4326))::jsonb
+            FROM tiles
+            WHERE NOT ST_IsEmpty(geom) AND ST_Area(geom) > 0
+            ORDER BY i, j;
+            """,
+            {"geom": dumps_str(geojson_geom), "side_m": side_m},
+        )
+        rows = await cur.fetchall()
+    return [row[0] for row in rows]
+
+
+async def filter_featcol_by_geom(
+    db: AsyncConnection,
+    featcol: dict,
+    geojson_geom: dict,
+    within: bool = True,
+) -> dict:
+    """Keep only the features within (or intersecting) a geometry.
+
+    Used to trim tiled extracts, fetched by intersection so features crossing
+    tile edges are not lost, back to the project AOI.
+
+    Args:
+        db (AsyncConnection): The database connection.
+        featcol (dict): The FeatureCollection (not modified).
+        geojson_geom (dict): The Polygon / MultiPolygon to filter by.
+        within (bool): Keep features fully within the geometry, else any
+            feature intersecting it.
+
+    Returns:
+        dict: A FeatureCollection, in the same order, without features
+            missing a geometry.
+    """
+    predicate = sql.SQL("ST_Within" if within else "ST_Intersects")
+    query = sql.SQL("""
+        WITH aoi AS (
+            SELECT ST_SetSRID(ST_GeomFromGeoJSON(%(geom)s), 4326) AS geom
+        )
+        SELECT COALESCE(jsonb_agg(f.feature ORDER BY f.idx), '[]'::jsonb)
+        FROM aoi,
+            jsonb_array_elements(%(featcol)s::jsonb -> 'features')
+            WITH ORDINALITY AS f(feature, idx)
+        WHERE jsonb_typeof(f.feature -> 'geometry') = 'object'
+            AND {predicate}(
+                ST_SetSRID(ST_GeomFromGeoJSON(f.feature -> 'geometry'), 4326),
+                aoi.geom
+            );
+        """).format(predicate=predicate)
+    async with db.cursor() as cur:
+        await cur.execute(
+            query,
+            {"geom": dumps_str(geojson_geom), "featcol": dumps_str(featcol)},
+        )
+        (features,) = await cur.fetchone()
+    return {"type": "FeatureCollection", "features": features}
+
+
 async def polygon_to_centroid(
     polygon: dict,
 ) -> types.SimpleNamespace:
@@ -127,6 +235,68 @@ def get_featcol_dominant_geom_type(featcol: dict) -> str:
     return max(geometry_counts, key=lambda key: geometry_counts[key])
 
 
+@dataclass(slots=True)
+class FeatcolDiff:
+    """OSM features new, changed and deleted between two extracts.
+
+    Changed features are (old, new) pairs, deleted features the old copies.
+    """
+
+    new: list[dict] = field(default_factory=list)
+    changed: list[tuple[dict, dict]] = field(default_factory=list)
+    deleted: list[dict] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def osm_feature_id(feature: dict) -> Optional[str]:
+    """The osm_id of a feature as text, or None if it is not from OSM."""
+    osm_id = (feature.get("properties") or {}).get("osm_id")
+    return None if osm_id is None else str(osm_id)
+
+
+def osm_feature_version(feature: dict) -> Optional[int]:
+    """The OSM version of a feature, if the extract includes it."""
+    version = (feature.get("properties") or {}).get("version")
+    try:
+        return int(version)
+    except (TypeError, ValueError):
+        return None
+
+
+def _osm_feature_changed(old_feature: dict, new_feature: dict) -> bool:
+    # Tag edits bump the version, included in the properties, but moving
+    # the nodes of a way does not, so the geometry is compared too
+    return old_feature.get("properties") != new_feature.get(
+        "properties"
+    ) or old_feature.get("geometry") != new_feature.get("geometry")
+
+
+def diff_featcol_by_osm_id(old_featcol: dict, new_featcol: dict) -> FeatcolDiff:
+    """Compare two downloads of an OSM extract, matching features by osm_id.
+
+    Old features without an osm_id (e.g. uploaded) cannot be matched, so
+    are left out, and new ones are always new.
+    """
+    old_by_id = {}
+    for feature in old_featcol.get("features") or []:
+        osm_id = osm_feature_id(feature)
+        if osm_id is not None:
+            old_by_id[osm_id] = feature
+
+    diff = FeatcolDiff()
+    for feature in new_featcol.get("features") or []:
+        osm_id = osm_feature_id(feature)
+        old_feature = old_by_id.pop(osm_id, None) if osm_id is not None else None
+        if old_feature is None:
+            diff.new.append(feature)
+        elif _osm_feature_changed(old_feature, feature):
+            diff.changed.append((old_feature, feature))
+        else:
+            diff.unchanged += 1
+    diff.deleted.extend(old_by_id.values())
+    return diff
+
+
 async def check_crs(  # noqa: C901
     input_geojson: dict,
 ):
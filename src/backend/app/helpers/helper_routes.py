@@ -18,7 +18,6 @@
 """Routes to help with common processes in the Field-TM workflow (Litestar)."""
 
 import csv
-import json
 import logging
 from io import BytesIO, StringIO
 from pathlib import Path
@@ -31,7 +30,6 @@ from litestar import status_codes as status
 from litestar.datastructures import UploadFile
 from litestar.di import Provide
 from litestar.exceptions import HTTPException
-from osm_fieldwork.conversion_to_xlsform import convert_to_xlsform
 from osm_fieldwork.xlsforms import xlsforms_path
 
 from app.auth.auth_deps import login_required
@@ -43,10 +41,12 @@ from app.central.central_crud import (
 from app.central.central_schemas import ODKCentral
 from app.config import settings
 from app.db.enums import XLSFormType
+from app.helpers.geojson_serializer import dumps
 from app.helpers.geometry_utils import (
     javarosa_to_geojson_geom,
     multigeom_to_singlegeom,
 )
+from app.helpers.lazy_imports import conversion_to_xlsform
 from app.i18n import _
 
 log = logging.getLogger(__name__)
@@ -63,7 +63,7 @@ async def download_template(
     """Download example XLSForm from Field-TM."""
     form_filename = XLSFormType(form_type).name
     form_path = f"{xlsforms_path}/{form_filename}.yaml"
-    xlsx_bytes = convert_to_xlsform(str(form_path))
+    xlsx_bytes = conversion_to_xlsform.convert_to_xlsform(str(form_path))
     if xlsx_bytes:
         return Response(
             content=xlsx_bytes,
@@ -195,7 +195,7 @@ async def convert_odk_submission_json_to_geojson_wrapper(
 
     contents = await json_file.read()
     submission_geojson = await convert_odk_submission_json_to_geojson(BytesIO(contents))
-    submission_data = BytesIO(json.dumps(submission_geojson).encode("utf-8"))
+    submission_data = BytesIO(dumps(submission_geojson))
 
     headers = {"Content-Disposition": f"attachment; filename={filename.stem}.geojson"}
     return Response(
@@ -259,7 +259,7 @@ async def flatten_multipolygons_to_polygons(
             "Content-Type": "application/media",
         }
         return Response(
-            content=json.dumps(multi_to_single_polygons).encode("utf-8"),
+            content=dumps(multi_to_single_polygons),
             headers=headers,
             status_code=status.HTTP_200_OK,
         )
@@ -0,0 +1,81 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Lazily imported heavy dependencies.
+
+pandas (via osm-fieldwork), openpyxl (via yxf), pyxform, segno, pyodk and
+the QFieldCloud SDK add seconds to startup and tens of MB to every uvicorn
+worker, even though most requests never touch them. Import them from here
+and access attributes at call time (e.g. `segno.make(...)`), so the real
+import happens on first use instead of when `app.main` is loaded.
+
+Type annotations should import the real names under `TYPE_CHECKING`.
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any
+
+# Top-level packages that must not be imported by `import app.main`
+HEAVY_MODULES = (
+    "pandas",
+    "python_calamine",
+    "openpyxl",
+    "yxf",
+    "pyxform",
+    "segno",
+    "pyodk",
+    "qfieldcloud_sdk",
+)
+
+
+class LazyModule(ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        """Create the proxy without importing anything."""
+        super().__init__(name)
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        """Import the module if needed, then delegate attribute access."""
+        # Only called for attributes missing from the proxy itself, so
+        # values set on the proxy (e.g. by monkeypatch) take precedence
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        """List attributes of the real module."""
+        return dir(self._load())
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real module has been imported yet."""
+        return self._module is not None
+
+
+segno = LazyModule("segno")
+pyodk_sdk = LazyModule("pyodk.client")
+pyodk_errors = LazyModule("pyodk.errors")
+qfc_sdk = LazyModule("qfieldcloud_sdk.sdk")
+qfc_interfaces = LazyModule("qfieldcloud_sdk.interfaces")
+update_xlsform = LazyModule("osm_fieldwork.update_xlsform")
+conversion_to_xlsform = LazyModule("osm_fieldwork.conversion_to_xlsform")
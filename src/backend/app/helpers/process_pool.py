@@ -0,0 +1,183 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Bounded process pool for CPU-bound XLSForm processing.
+
+pandas/openpyxl merging and pyxform conversion can take seconds for large
+forms, which would otherwise block the event loop. Jobs take and return
+plain bytes so they are cheap to pickle, and worker processes pre-import
+the heavy libraries when they start.
+
+NOTE this module is imported by the worker processes, so keep its imports
+light (heavy libraries are imported inside the job functions).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from io import BytesIO
+from typing import Any, Callable, Optional
+
+from litestar import Litestar
+
+from app.config import settings
+from app.metrics import track_background_job
+
+log = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _warm_worker() -> None:
+    """Pre-import heavy libraries, so the first job does not pay for it."""
+    import osm_fieldwork.update_xlsform  # noqa: F401
+    import pyxform.xls2xform  # noqa: F401
+
+
+def _noop() -> None:
+    """Job used to start worker processes ahead of real work."""
+
+
+def get_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the shared process pool, creating it on first use.
+
+    Returns None if XLSFORM_WORKERS is 0, in which case jobs run in threads.
+    """
+    global _executor
+    if settings.XLSFORM_WORKERS <= 0:
+        return None
+    if _executor is None:
+        # spawn, as forking a process with running threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.XLSFORM_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+    return _executor
+
+
+def _discard_process_pool(executor: ProcessPoolExecutor) -> None:
+    """Terminate the pool workers, so a runaway job cannot keep running.
+
+    Other jobs running in the pool at the time fail with BrokenProcessPool.
+    The next job starts a fresh pool.
+    """
+    global _executor
+    if _executor is executor:
+        _executor = None
+    # There is no public API to stop a running job, so kill its process
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_process(
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """Run a picklable function in the process pool and await the result.
+
+    Args:
+        func (Callable): A module level function.
+        *args: Positional arguments for func.
+        timeout (float, optional): Seconds before the job is killed.
+            Defaults to XLSFORM_TIMEOUT_SECONDS.
+        **kwargs: Keyword arguments for func.
+
+    Returns:
+        Any: The function result.
+
+    Raises:
+        TimeoutError: If the job did not complete in time.
+        BrokenProcessPool: If the pool broke again when the job was retried.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = settings.XLSFORM_TIMEOUT_SECONDS if timeout is None else timeout
+    job = partial(func, *args, **kwargs)
+
+    with track_background_job("xlsform"):
+        if get_process_pool() is None:
+            # NOTE a thread cannot be killed, so on timeout the job runs to completion
+            return await asyncio.wait_for(loop.run_in_executor(None, job), timeout)
+
+        # The pool can break under a job through no fault of its own, e.g. when
+        # another job timed out and the workers were killed, so retry once
+        for attempt in range(2):
+            executor = get_process_pool()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(executor, job), timeout
+                )
+            except TimeoutError:
+                log.error(
+                    f"Process pool job {func.__name__} timed out after {timeout}s"
+                )
+                _discard_process_pool(executor)
+                raise
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory), so start afresh
+                log.error(f"Process pool broken while running {func.__name__}")
+                _discard_process_pool(executor)
+                if attempt:
+                    raise
+
+
+async def start_process_pool(server: Litestar) -> None:  # noqa: ARG001
+    """Start and warm the worker processes (Litestar startup hook)."""
+    executor = get_process_pool()
+    if executor is None:
+        return
+    # Not awaited, the workers warm up in the background
+    for _ in range(settings.XLSFORM_WORKERS):
+        executor.submit(_noop)
+    log.info(f"Started XLSForm process pool with {settings.XLSFORM_WORKERS} workers")
+
+
+async def stop_process_pool(server: Litestar) -> None:  # noqa: ARG001
+    """Shut down the worker processes (Litestar shutdown hook)."""
+    global _executor
+    executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def append_field_mapping_fields_job(
+    xlsform: bytes, **options: Any
+) -> tuple[str, bytes]:
+    """Process pool job: append the Field-TM fields to XLSForm bytes."""
+    from osm_fieldwork.update_xlsform import (
+        append_field_mapping_fields,
+    )
+
+    # The osm-fieldwork function is async, but does no IO
+    xform_id, updated_form = asyncio.run(
+        append_field_mapping_fields(BytesIO(xlsform), **options)
+    )
+    return xform_id, updated_form.getvalue()
+
+
+def xlsform_to_xform_job(xlsform: bytes) -> bytes:
+    """Process pool job: convert XLSForm bytes to XForm XML bytes via pyxform."""
+    from pyxform.xls2xform import convert
+
+    # NOTE pyxform.xls2xform.convert returns a ConvertResult object
+    return convert(BytesIO(xlsform)).xform.encode("utf-8")
@@ -0,0 +1,109 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Admin routes to control the sampling profiler at runtime.
+
+Each uvicorn worker has its own profiler, so requests are answered by
+whichever worker receives them: check the `pid` in the responses.
+"""
+
+from time import strftime
+from typing import Literal, Optional
+
+from litestar import Response, Router, get, post
+from litestar import status_codes as status
+from litestar.di import Provide
+from litestar.params import Parameter
+
+from app.auth.api_key import login_or_api_key
+from app.auth.roles import super_admin
+from app.db.database import db_conn
+from app.db.models import DbUser
+from app.helpers.sampling_profiler import profiler
+
+MAX_DURATION_SECONDS = 600
+MIN_INTERVAL_MS = 1
+
+admin_dependencies = {
+    "db": Provide(db_conn),
+    "auth_user": Provide(login_or_api_key),
+    "current_user": Provide(super_admin),
+}
+
+
+@get("", dependencies=admin_dependencies)
+async def profiler_status(current_user: DbUser) -> dict:
+    """Show whether the profiler is running, with sample counts by route."""
+    return profiler.status()
+
+
+@post("/start", dependencies=admin_dependencies, status_code=status.HTTP_200_OK)
+async def start_profiler(
+    current_user: DbUser,
+    duration: int = Parameter(default=60, gt=0, le=MAX_DURATION_SECONDS),
+    interval_ms: int = Parameter(default=10, ge=MIN_INTERVAL_MS, le=1000),
+) -> dict:
+    """Start a new sampling window, discarding any previous samples."""
+    await profiler.start(duration=duration, interval=interval_ms / 1000)
+    return profiler.status()
+
+
+@post("/stop", dependencies=admin_dependencies, status_code=status.HTTP_200_OK)
+async def stop_profiler(current_user: DbUser) -> dict:
+    """Stop sampling early, keeping the samples for export."""
+    await profiler.stop()
+    return profiler.status()
+
+
+@get("/export", dependencies=admin_dependencies)
+async def export_profile(
+    current_user: DbUser,
+    format: Literal["speedscope", "collapsed"] = "speedscope",  # noqa: A002
+    label: Optional[str] = None,
+) -> Response[str]:
+    """Download the samples, optionally for a single route or task label.
+
+    - speedscope: open in https://www.speedscope.app, one profile per label.
+    - collapsed: for flamegraph.pl or inferno.
+    """
+    filename = f"profile-{strftime('%Y%m%d-%H%M%S')}"
+    if format == "collapsed":
+        content = profiler.to_collapsed(label)
+        media_type = "text/plain"
+        filename = f"{filename}.txt"
+    else:
+        content = profiler.to_speedscope(label)
+        media_type = "application/json"
+        filename = f"{filename}.speedscope.json"
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+profiler_router = Router(
+    path="/api/v1/admin/profiler",
+    tags=["admin"],
+    route_handlers=[
+        profiler_status,
+        start_profiler,
+        stop_profiler,
+        export_profile,
+    ],
+)
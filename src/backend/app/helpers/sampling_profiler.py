@@ -0,0 +1,261 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Low-overhead sampling profiler, aggregating stacks for a time window.
+
+Unlike the per-request pyinstrument profiler (DEBUG only), this runs in
+production: a daemon thread samples the stacks of all threads at a fixed
+interval, and nothing is added to the request path.
+
+Each sample is attributed to a label:
+- ``GET /projects/{project_id}`` for code running on behalf of a request,
+  found from the ASGI ``scope`` of a frame in the coroutine chain.
+- ``task:<function>`` for other asyncio tasks, e.g. basemap generation.
+- ``thread:<name>`` for other threads, e.g. executor threads running SDK
+  calls.
+
+Idle samples (waiting on the event loop, a lock or a queue) are dropped.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+# Frames in these stdlib modules at the top of a stack mean the thread is idle
+IDLE_MODULES = (
+    f"{os.sep}selectors.py",
+    f"{os.sep}threading.py",
+    f"{os.sep}queue.py",
+    os.path.join("concurrent", "futures", "thread.py"),
+)
+# Frames from these packages are skipped when naming an asyncio task
+EVENT_LOOP_MODULES = ("asyncio", "uvloop", "uvicorn", "anyio")
+MAX_STACK_DEPTH = 128
+
+
+class SamplingProfiler:
+    """Aggregates stack samples of all threads into per-label counts."""
+
+    def __init__(self):
+        """Create a stopped profiler with no samples."""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._frame_names: dict[CodeType, str] = {}
+        self.stacks: Counter[tuple[str, tuple[str, ...]]] = Counter()
+        self.interval = 0.01
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self.loop_thread_id: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether a sampling window is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    async def start(self, duration: float, interval: float) -> None:
+        """Discard previous samples and sample for up to `duration` seconds.
+
+        Must be called from the event loop thread, so its tasks can be told
+        apart from other threads.
+        """
+        await self.stop()
+        with self._lock:
+            self.stacks = Counter()
+        self.interval = interval
+        self.loop_thread_id = threading.get_ident()
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(duration,),
+            name="sampling-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+        log.info(f"Sampling profiler started for {duration}s every {interval}s")
+
+    async def stop(self) -> None:
+        """Stop sampling, keeping the samples for export.
+
+        The sampling thread finishes its current sample first, so is joined
+        off the event loop.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+
+    def _run(self, duration: float) -> None:
+        deadline = time.monotonic() + duration
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval) and time.monotonic() < deadline:
+            try:
+                self._sample(own_id)
+            except Exception as e:
+                log.warning(f"Sampling profiler failed to sample: {e}")
+                break
+        self.stopped_at = time.time()
+        log.info("Sampling profiler stopped")
+
+    def _sample(self, own_id: int) -> None:
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        samples = []
+        for thread_id, frame in sys._current_frames().items():  # noqa: SLF001
+            if thread_id == own_id or frame.f_code.co_filename.endswith(IDLE_MODULES):
+                continue
+            if thread_id == self.loop_thread_id:
+                label = self._loop_label(frame)
+                if label is None:
+                    # The event loop is waiting for I/O
+                    continue
+            else:
+                label = f"thread:{thread_names.get(thread_id, thread_id)}"
+            samples.append((label, self._stack(frame)))
+
+        with self._lock:
+            self.stacks.update(samples)
+
+    def _frame_name(self, code: CodeType) -> str:
+        name = self._frame_names.get(code)
+        if name is None:
+            filename = code.co_filename
+            for path in sys.path:
+                if path and filename.startswith(path):
+                    filename = filename[len(path) :].lstrip(os.sep)
+                    break
+            name = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+            self._frame_names[code] = name
+        return name
+
+    def _stack(self, frame: Optional[FrameType]) -> tuple[str, ...]:
+        """Return the stack, outermost frame first."""
+        names = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            names.append(self._frame_name(frame.f_code))
+            frame = frame.f_back
+        names.reverse()
+        return tuple(names)
+
+    @staticmethod
+    def _loop_label(frame: FrameType) -> Optional[str]:
+        """Label an event loop sample by request route, or by task.
+
+        Returns None if only event loop code is running, i.e. it is idle.
+        """
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+
+        task_name = None
+        for outer in reversed(frames):
+            scope = outer.f_locals.get("scope")
+            if isinstance(scope, dict) and scope.get("type") == "http":
+                route = scope.get("path_template", "unmatched")
+                return f"{scope.get('method', '')} {route}"
+            if task_name is None and not any(
+                module in outer.f_code.co_filename for module in EVENT_LOOP_MODULES
+            ):
+                task_name = f"task:{outer.f_code.co_qualname}"
+        return task_name
+
+    def snapshot(self) -> Counter[tuple[str, tuple[str, ...]]]:
+        """Return a copy of the samples collected so far."""
+        with self._lock:
+            return self.stacks.copy()
+
+    def status(self) -> dict:
+        """Summarise the current window, with sample counts by label."""
+        stacks = self.snapshot()
+        labels: Counter[str] = Counter()
+        for (label, _), count in stacks.items():
+            labels[label] += count
+        return {
+            "running": self.running,
+            "pid": os.getpid(),
+            "interval_seconds": self.interval,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+            "samples": sum(labels.values()),
+            "labels": dict(labels.most_common()),
+        }
+
+    def to_collapsed(self, label: Optional[str] = None) -> str:
+        """Export in the collapsed stack format (e.g. for flamegraph.pl).
+
+        Each line is ``label;outer;...;inner count``.
+        """
+        lines = [
+            ";".join((stack_label, *stack)) + f" {count}"
+            for (stack_label, stack), count in sorted(self.snapshot().items())
+            if label is None or stack_label == label
+        ]
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, label: Optional[str] = None) -> str:
+        """Export in the speedscope format, with one profile per label."""
+        frame_index: dict[str, int] = {}
+        profiles: dict[str, dict] = {}
+        for (stack_label, stack), count in sorted(self.snapshot().items()):
+            if label is not None and stack_label != label:
+                continue
+            profile = profiles.setdefault(
+                stack_label,
+                {
+                    "type": "sampled",
+                    "name": stack_label,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": 0,
+                    "samples": [],
+                    "weights": [],
+                },
+            )
+            weight = count * self.interval
+            profile["samples"].append(
+                [frame_index.setdefault(name, len(frame_index)) for name in stack]
+            )
+            profile["weights"].append(weight)
+            profile["endValue"] += weight
+
+        return json.dumps(
+            {
+                "$schema": "https://www.speedscope.app/file-format-schema.json",
+                "exporter": "field-tm",
+                "name": f"field-tm worker {os.getpid()}",
+                "activeProfileIndex": 0,
+                "shared": {"frames": [{"name": name} for name in frame_index]},
+                "profiles": sorted(
+                    profiles.values(), key=lambda p: p["endValue"], reverse=True
+                ),
+            }
+        )
+
+
+profiler = SamplingProfiler()
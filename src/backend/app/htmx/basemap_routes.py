@@ -34,8 +34,7 @@ from psycopg import AsyncConnection
 from app.auth.auth_deps import login_required
 from app.auth.auth_schemas import ProjectUserDict
 from app.auth.roles import project_manager
-from app.config import settings
-from app.db.database import db_conn
+from app.db.database import DbPool, db_conn, pool_connection
 from app.db.enums import FieldMappingApp, ProjectStatus
 from app.db.models import DbProject
 from app.helpers.basemap_services import (
@@ -44,6 +43,7 @@ from app.helpers.basemap_services import (
     trigger_tilepack_generation,
 )
 from app.i18n import _
+from app.metrics import track_background_job
 from app.projects.project_schemas import ProjectUpdate
 from app.qfield.qfield_crud import (
     _outline_to_bbox_str,
@@ -453,56 +453,59 @@ async def _start_basemap_attach(
 
     asyncio.create_task(_run_basemap_attach_background(project_id, basemap_url))
 
-    refreshed_project = await DbProject.one(db, project_id)
+    refreshed_project = await DbProject.one(db, project_id, minimal=True)
     return _progress_fragment(refreshed_project, progress_scope="attach")
 
 
 async def _run_basemap_attach_background(project_id: int, basemap_url: str) -> None:
     """Run heavy basemap attach flow in background and persist terminal state."""
-    await asyncio.sleep(AUTOSTART_ATTACH_INITIAL_DELAY_SECONDS)
-    now = datetime.now(timezone.utc)
-
-    for attempt in range(AUTOSTART_ATTACH_MAX_RETRY_ATTEMPTS + 1):
-        try:
-            async with await AsyncConnection.connect(settings.FTM_DB_URL) as db:
-                project = await DbProject.one(db, project_id)
-                await attach_basemap_to_qfield_project(db, project, basemap_url)
-                await DbProject.update(
-                    db,
-                    project_id,
-                    ProjectUpdate(
-                        basemap_attach_status="ready",
-                        basemap_attach_error=None,
-                        basemap_attach_updated_at=now,
-                    ),
-                )
-                await db.commit()
+    with track_background_job("basemap_attach") as job:
+        await asyncio.sleep(AUTOSTART_ATTACH_INITIAL_DELAY_SECONDS)
+        now = datetime.now(timezone.utc)
+
+        for attempt in range(AUTOSTART_ATTACH_MAX_RETRY_ATTEMPTS + 1):
+            try:
+                async with pool_connection(DbPool.BACKGROUND) as db:
+                    project = await DbProject.one(db, project_id, minimal=True)
+                    await attach_basemap_to_qfield_project(db, project, basemap_url)
+                    await DbProject.update(
+                        db,
+                        project_id,
+                        ProjectUpdate(
+                            basemap_attach_status="ready",
+                            basemap_attach_error=None,
+                            basemap_attach_updated_at=now,
+                        ),
+                    )
+                    await db.commit()
+                    return
+            except Exception as exc:
+                is_last_attempt = attempt >= AUTOSTART_ATTACH_MAX_RETRY_ATTEMPTS
+                retryable = _is_transient_attach_exception(exc)
+                if retryable and not is_last_attempt:
+                    log.warning(
+                        "Basemap attach transient failure for project %s; "
+                        "retrying once",
+                        project_id,
+                        exc_info=exc,
+                    )
+                    continue
+
+                job.failed = True
+                log.exception("Basemap attach failed for project %s", project_id)
+                error_text = _attach_error_text(exc)
+                async with pool_connection(DbPool.BACKGROUND) as db:
+                    await DbProject.update(
+                        db,
+                        project_id,
+                        ProjectUpdate(
+                            basemap_attach_status="failed",
+                            basemap_attach_error=error_text,
+                            basemap_attach_updated_at=now,
+                        ),
+                    )
+                    await db.commit()
                 return
-        except Exception as exc:
-            is_last_attempt = attempt >= AUTOSTART_ATTACH_MAX_RETRY_ATTEMPTS
-            retryable = _is_transient_attach_exception(exc)
-            if retryable and not is_last_attempt:
-                log.warning(
-                    "Basemap attach transient failure for project %s; retrying once",
-                    project_id,
-                    exc_info=exc,
-                )
-                continue
-
-            log.exception("Basemap attach failed for project %s", project_id)
-            error_text = _attach_error_text(exc)
-            async with await AsyncConnection.connect(settings.FTM_DB_URL) as db:
-                await DbProject.update(
-                    db,
-                    project_id,
-                    ProjectUpdate(
-                        basemap_attach_status="failed",
-                        basemap_attach_error=error_text,
-                        basemap_attach_updated_at=now,
-                    ),
-                )
-                await db.commit()
-            return
 
 
 @post(
@@ -543,7 +546,7 @@ async def basemap_search_htmx(
             ProjectUpdate(basemap_status="searching"),
         )
         await db.commit()
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(db, project_id, minimal=True)
         return Template(
             template_name="partials/project_details/fragments/basemap_search_results.html",
             context={
@@ -593,7 +596,7 @@ async def basemap_generate_htmx(
         current_status = project.basemap_status or ""
 
         if current_item == stac_item_id and current_status == "generating":
-            refreshed_project = await DbProject.one(db, project_id)
+            refreshed_project = await DbProject.one(db, project_id, minimal=True)
             return _progress_fragment(
                 refreshed_project,
                 basemap_size_bytes=basemap_size_bytes,
@@ -602,7 +605,7 @@ async def basemap_generate_htmx(
             )
 
         if current_item == stac_item_id and current_status == "ready":
-            refreshed_project = await DbProject.one(db, project_id)
+            refreshed_project = await DbProject.one(db, project_id, minimal=True)
             return _ready_fragment(
                 refreshed_project,
                 basemap_size_bytes=basemap_size_bytes,
@@ -639,7 +642,7 @@ async def basemap_generate_htmx(
         )
         await db.commit()
 
-        refreshed_project = await DbProject.one(db, project_id)
+        refreshed_project = await DbProject.one(db, project_id, minimal=True)
         return (
             _ready_fragment(
                 refreshed_project,
@@ -719,7 +722,7 @@ async def basemap_status_htmx(
         )
         await db.commit()
 
-        refreshed_project = await DbProject.one(db, project_id)
+        refreshed_project = await DbProject.one(db, project_id, minimal=True)
         return (
             _ready_fragment(
                 refreshed_project,
@@ -801,5 +804,5 @@ async def basemap_attach_status_htmx(
     if not project or project.id != project_id:
         return _project_not_found_response()
 
-    refreshed_project = await DbProject.one(db, project_id)
+    refreshed_project = await DbProject.one(db, project_id, minimal=True)
     return _attach_status_fragment(refreshed_project)
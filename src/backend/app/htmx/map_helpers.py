@@ -18,9 +18,10 @@
 
 """HTMX map helper utilities."""
 
-import json
 import time
 
+from app.helpers.geojson_serializer import dumps_str
+
 
 def render_leaflet_map(
     map_id: str,
@@ -48,22 +49,22 @@ def render_leaflet_map(
     # Generate unique map ID to avoid conflicts with previous maps
     unique_map_id = f"{map_id}-{int(time.time() * 1000)}"
 
-    # Escape GeoJSON for JavaScript
-    escaped_layers = []
-    for layer in geojson_layers:
-        geojson_escaped = json.dumps(layer["data"]).replace("</script>", "<\\/script>")
-        layer_config = {
-            "data": geojson_escaped,
-            "name": layer.get("name", "Layer"),
-            "color": layer.get("color", "#3388ff"),
-            "weight": layer.get("weight", 2),
-            "opacity": layer.get("opacity", 0.8),
-            "fillOpacity": layer.get("fillOpacity", 0.3),
-            "popupOptions": layer.get("popup_options", {}),
-        }
-        escaped_layers.append(layer_config)
-
-    layers_json = json.dumps(escaped_layers).replace("</script>", "<\\/script>")
+    # The GeoJSON is embedded as-is (not as nested JSON strings), escaping
+    # "</" so that "</script>" in the data cannot end the script element
+    layers_json = dumps_str(
+        [
+            {
+                "data": layer["data"],
+                "name": layer.get("name", "Layer"),
+                "color": layer.get("color", "#3388ff"),
+                "weight": layer.get("weight", 2),
+                "opacity": layer.get("opacity", 0.8),
+                "fillOpacity": layer.get("fillOpacity", 0.3),
+                "popupOptions": layer.get("popup_options", {}),
+            }
+            for layer in geojson_layers
+        ]
+    ).replace("</", "<\\/")
 
     div_style = (  # noqa: E501
         f"height: {height}; width: 100%;"
@@ -153,7 +154,7 @@ def render_leaflet_map(
                         var allBounds = [];
 
                         lc.forEach(function(cfg, i) {{
-                            var gd = JSON.parse(cfg.data);
+                            var gd = cfg.data;
                             var gl = L.geoJSON(gd, {{
                                 style: function(f) {{
                                     return {{
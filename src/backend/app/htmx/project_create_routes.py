@@ -37,7 +37,6 @@ from litestar.exceptions import HTTPException
 from litestar.params import Body, Parameter
 from litestar.plugins.htmx import HTMXRequest, HTMXTemplate
 from litestar.response import Response, Template
-from osm_fieldwork.conversion_to_xlsform import convert_to_xlsform
 from osm_fieldwork.xlsforms import xlsforms_path
 from psycopg import AsyncConnection
 from psycopg.rows import dict_row
@@ -46,7 +45,7 @@ from app.auth.auth_deps import get_optional_auth_user, get_user_sub, login_requi
 from app.auth.auth_schemas import ProjectUserDict
 from app.auth.roles import mapper
 from app.config import AuthProvider, settings
-from app.db.database import db_conn
+from app.db.database import DbPool, background_db_conn, db_conn, pool_connection
 from app.db.enums import FieldMappingApp, XLSFormType
 from app.db.models import DbProject
 from app.helpers.basemap_services import (
@@ -54,8 +53,10 @@ from app.helpers.basemap_services import (
     search_oam_imagery,
     trigger_tilepack_generation,
 )
+from app.helpers.lazy_imports import conversion_to_xlsform
 from app.htmx.htmx_schemas import XLSFormUploadData
 from app.i18n import _
+from app.metrics import track_background_job
 from app.projects import project_schemas
 from app.projects.project_crud import (
     claim_simple_project_basemap_generation,
@@ -69,6 +70,7 @@ from app.projects.project_services import (
     derive_simple_project_metadata,
     download_osm_data,
     finalize_qfield_project,
+    osm_extract_options,
     process_xlsform,
     save_data_extract,
     save_task_areas,
@@ -441,7 +443,7 @@ async def _run_simple_project_basemap_autostart(
 async def _persist_simple_project_basemap_autostart_failure(project_id: int) -> None:
     """Best-effort persistence for background basemap autostart failures."""
     try:
-        async with await AsyncConnection.connect(settings.FTM_DB_URL) as bg_db:
+        async with pool_connection(DbPool.BACKGROUND) as bg_db:
             await _mark_basemap_autostart_failed(bg_db, project_id)
     except Exception:
         log.exception(
@@ -451,14 +453,16 @@ async def _persist_simple_project_basemap_autostart_failure(project_id: int) ->
 
 async def _autostart_basemap_for_simple_project(project_id: int, outline: dict) -> None:
     """Auto-start basemap generation for simple projects in the background."""
-    try:
-        async with await AsyncConnection.connect(settings.FTM_DB_URL) as bg_db:
-            await _run_simple_project_basemap_autostart(bg_db, project_id, outline)
-    except Exception:
-        log.exception(
-            "Simple-project basemap autostart failed for project %s", project_id
-        )
-        await _persist_simple_project_basemap_autostart_failure(project_id)
+    with track_background_job("basemap_autostart") as job:
+        try:
+            async with pool_connection(DbPool.BACKGROUND) as bg_db:
+                await _run_simple_project_basemap_autostart(bg_db, project_id, outline)
+        except Exception:
+            job.failed = True
+            log.exception(
+                "Simple-project basemap autostart failed for project %s", project_id
+            )
+            await _persist_simple_project_basemap_autostart_failure(project_id)
 
 
 def _is_simple_basemap_reconcile_candidate(project_row: dict) -> bool:
@@ -507,7 +511,7 @@ async def reconcile_simple_project_basemap_autostarts(server: Litestar) -> None:
     """Re-enqueue simple basemap autostarts stranded across process restarts."""
     enqueued = 0
 
-    async with server.state.db_pool.connection() as conn:
+    async with server.state.db_pools[DbPool.MAINTENANCE].connection() as conn:
         async with conn.cursor(row_factory=dict_row) as cur:
             await cur.execute(
                 """
@@ -782,7 +786,7 @@ async def _get_template_xlsform_bytes(
 
     try:
         form_path = f"{xlsforms_path}/{form_type.name}.yaml"
-        xlsx_bytes = convert_to_xlsform(str(form_path))
+        xlsx_bytes = conversion_to_xlsform.convert_to_xlsform(str(form_path))
         if xlsx_bytes:
             return xlsx_bytes
     except Exception as e:
@@ -812,7 +816,7 @@ async def _get_default_buildings_template_bytes(db: AsyncConnection) -> bytes |
 
     try:
         fallback_path = f"{xlsforms_path}/{XLSFormType.buildings.name}.yaml"
-        return convert_to_xlsform(fallback_path)
+        return conversion_to_xlsform.convert_to_xlsform(fallback_path)
     except Exception as e:
         log.error(
             "Error converting default OSM Buildings YAML to XLSForm: %s",
@@ -827,18 +831,18 @@ async def _prepare_simple_project_data_extract(
     project_id: int,
 ) -> None:
     """Populate simple workflow extract, falling back to collect-new-data mode."""
+    extract_options = osm_extract_options(
+        osm_category="buildings", geom_type="POLYGON", centroid=False, tiled=False
+    )
     try:
         geojson_data = await download_osm_data(
-            db=db,
-            project_id=project_id,
-            osm_category="buildings",
-            geom_type="POLYGON",
-            centroid=False,
+            db=db, project_id=project_id, **extract_options
         )
         await save_data_extract(
             db=db,
             project_id=project_id,
             geojson_data=geojson_data,
+            extract_options=extract_options,
         )
         return
     except SvcValidationError as e:
@@ -990,7 +994,7 @@ async def create_project_htmx(
 @post(
     path="/projects/create-simple",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(background_db_conn),
         "auth_user": Provide(login_required),
     },
 )
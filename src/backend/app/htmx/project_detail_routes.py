@@ -37,7 +37,7 @@ from app.auth.auth_deps import (
 )
 from app.central import central_crud
 from app.config import decrypt_value
-from app.db.database import db_conn
+from app.db.database import db_conn, db_conn_ro
 from app.db.enums import FieldMappingApp
 from app.db.models import DbProject
 from app.i18n import _
@@ -185,7 +185,7 @@ def _friendly_qr_error(exc: Exception) -> str:
 @get(
     path="/projects/{project_id:int}",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(db_conn_ro),
         "auth_user": Provide(get_optional_auth_user),
     },
 )
@@ -237,7 +237,7 @@ async def delete_project_htmx(
 ) -> Response:
     """Delete a project after deleting the downstream ODK/QField project."""
     try:
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(db, project_id, minimal=True)
     except KeyError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -288,7 +288,7 @@ async def project_qrcode_htmx(
 ) -> Response:
     """Generate and return QR code for a published project."""
     try:
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(db, project_id, minimal=True)
     except KeyError:
         return Response(
             content=_callout("danger", _("Project not found.")),
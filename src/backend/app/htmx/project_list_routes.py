@@ -26,11 +26,12 @@ from psycopg import AsyncConnection
 
 from app.auth.auth_deps import get_optional_auth_user
 from app.config import AuthProvider, settings
-from app.db.database import db_conn
+from app.db.database import db_conn_ro
 from app.db.enums import ProjectStatus
 from app.db.models import DbProject
 
 PROJECT_SORT_OPTIONS = {
+    "relevance",
     "newest",
     "oldest",
     "name_asc",
@@ -48,7 +49,7 @@ def _create_project_href(auth_user: object | None) -> str:
 @get(
     path="/projects",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(db_conn_ro),
         "auth_user": Provide(get_optional_auth_user),
     },
 )
@@ -58,9 +59,10 @@ async def project_listing(
     """Render public project listing page."""
     status_param = request.query_params.get("status")
     search_query = (request.query_params.get("search") or "").strip()
-    sort_param = request.query_params.get("sort") or "newest"
+    # Relevance (best search matches first) is newest first when not searching
+    sort_param = request.query_params.get("sort") or "relevance"
     selected_status = None
-    selected_sort = sort_param if sort_param in PROJECT_SORT_OPTIONS else "newest"
+    selected_sort = sort_param if sort_param in PROJECT_SORT_OPTIONS else "relevance"
 
     if status_param:
         try:
@@ -28,7 +28,7 @@ import json
 import logging
 from asyncio import get_running_loop
 from functools import partial
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from litestar import Response, delete, get, patch, post
 from litestar import status_codes as status
@@ -36,14 +36,17 @@ from litestar.enums import RequestEncodingType
 from litestar.params import Body, Parameter
 from litestar.plugins.htmx import HTMXRequest, HTMXTemplate
 from litestar.response import Template
-from qfieldcloud_sdk.sdk import Client, ProjectCollaboratorRole
 
+from app.helpers.lazy_imports import qfc_sdk
 from app.i18n import _
 from app.qfield.qfield_crud import add_qfc_project_collaborator
 from app.qfield.qfield_utils import resolve_backend_qfc_url, strip_qfc_api_suffix
 
 from .htmx_helpers import callout as _callout
 
+if TYPE_CHECKING:
+    from qfieldcloud_sdk.sdk import Client
+
 log = logging.getLogger(__name__)
 
 # ── Roles available in the collaborator dropdown ────────────────────────
@@ -59,9 +62,9 @@ COLLABORATOR_ROLES = [
 # ── Helpers ─────────────────────────────────────────────────────────────
 
 
-def _qfc_client(url: str, token: str) -> Client:
+def _qfc_client(url: str, token: str) -> "Client":
     """Build an authenticated QFieldCloud SDK client from raw values."""
-    return Client(url=url, token=token)
+    return qfc_sdk.Client(url=url, token=token)
 
 
 def _strip_api_suffix(url: str) -> str:
@@ -151,7 +154,7 @@ async def qfc_admin_login(
     loop = get_running_loop()
 
     try:
-        client = await loop.run_in_executor(None, partial(Client, url=qfc_url))
+        client = await loop.run_in_executor(None, partial(qfc_sdk.Client, url=qfc_url))
         result = await loop.run_in_executor(
             None, partial(client.login, username, password)
         )
@@ -464,7 +467,7 @@ async def add_collaborator(
             media_type="text/html",
         )
 
-    role = ProjectCollaboratorRole(role_str)
+    role = qfc_sdk.ProjectCollaboratorRole(role_str)
     loop = get_running_loop()
 
     try:
@@ -530,7 +533,7 @@ async def update_collaborator(
     qfc_token = data.get("qfc_token", "")
     role_str = data.get("role", "editor")
 
-    role = ProjectCollaboratorRole(role_str)
+    role = qfc_sdk.ProjectCollaboratorRole(role_str)
     loop = get_running_loop()
 
     try:
@@ -558,7 +561,7 @@ async def update_collaborator(
 
 
 async def _reload_collaborators(
-    loop, client: Client, project_id: str, qfc_url: str, qfc_token: str
+    loop, client: "Client", project_id: str, qfc_url: str, qfc_token: str
 ) -> Response:
     """Re-fetch collaborators and return the full panel HTML."""
     try:
@@ -39,8 +39,9 @@ from app.auth.auth_schemas import ProjectUserDict
 from app.auth.roles import mapper, project_manager
 from app.central.central_schemas import ODKCentral
 from app.config import settings
-from app.db.database import db_conn
+from app.db.database import background_db_conn, db_conn, db_conn_ro
 from app.db.models import DbProject
+from app.helpers.geojson_serializer import dumps_str
 from app.helpers.geometry_utils import (
     AREA_LIMIT_KM2,
     AREA_WARN_KM2,
@@ -58,6 +59,7 @@ from app.projects.project_services import (
     download_osm_data,
     finalize_odk_project,
     finalize_qfield_project,
+    osm_extract_options,
     save_data_extract,
     save_task_areas,
     split_aoi,
@@ -208,7 +210,9 @@ async def _get_submitted_geojson_data(
     """Load GeoJSON from the request body or fall back to the stored project extract."""
     if "geojson-data" not in data:
         log.debug("No geojson-data in request, falling back to database")
-        project_db = await DbProject.one(db, project_id)
+        project_db = await DbProject.one(
+            db, project_id, minimal=True, include=("extract",)
+        )
         return project_db.data_extract_geojson, None
 
     try:
@@ -443,7 +447,7 @@ def _build_split_preview_response(
         height="600px",
         show_controls=True,
     )
-    tasks_geojson_str = json.dumps(tasks_featcol)
+    tasks_geojson_str = dumps_str(tasks_featcol)
     data_extract_info = ""
     if data_extract:
         data_feature_count = len(data_extract.get("features", []))
@@ -502,7 +506,7 @@ def _build_qfield_finalize_success_html(result: QFieldFinalizeResult) -> Templat
 @post(
     path="/download-osm-data-htmx",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(background_db_conn),
         "auth_user": Provide(login_required),
         "current_user": Provide(mapper),
     },
@@ -512,10 +516,12 @@ async def download_osm_data_htmx(  # noqa: PLR0913
     db: AsyncConnection,
     current_user: ProjectUserDict,
     auth_user: object,
+    *,
     project_id: int = Parameter(),
     osm_category: str = Parameter(default="buildings"),
     geom_type: str = Parameter(default="POLYGON"),
     centroid: bool = Parameter(default=False),
+    tiled: bool = Parameter(default=False),
 ) -> Response:
     """Download OSM data extract via HTMX and store GeoJSON in database."""
     project = current_user.get("project")
@@ -529,15 +535,14 @@ async def download_osm_data_htmx(  # noqa: PLR0913
             osm_category=osm_category,
             geom_type=geom_type,
             centroid=centroid,
+            tiled=tiled,
         )
         feature_count = len(featcol_single_geom_type.get("features", []))
 
         # Encode GeoJSON for the Accept button (don't save yet)
-        geojson_str = json.dumps(featcol_single_geom_type)
+        geojson_str = dumps_str(featcol_single_geom_type)
 
         # Automatically show preview after successful download
-        project = await DbProject.one(db, project_id)
-
         # Use reusable map rendering function
         map_html_content = render_leaflet_map(
             map_id="leaflet-map-download",
@@ -573,6 +578,10 @@ async def download_osm_data_htmx(  # noqa: PLR0913
                 "map_html_content": map_html_content,
                 "geojson_str": geojson_str,
                 "project_id": project_id,
+                # Stored on accept, to refresh the extract later
+                "extract_options": osm_extract_options(
+                    osm_category, geom_type, centroid, tiled
+                ),
             },
             media_type="text/html",
             status_code=status.HTTP_200_OK,
@@ -669,7 +678,7 @@ async def upload_geojson_htmx(  # noqa: PLR0913
         feature_count = len(featcol.get("features", []))
 
         # Encode GeoJSON for the Accept button (don't save yet)
-        geojson_str = json.dumps(featcol)
+        geojson_str = dumps_str(featcol)
 
         # Use reusable map rendering function
         map_html_content = render_leaflet_map(
@@ -744,7 +753,9 @@ async def preview_geojson_htmx(
 
     try:
         # Get stored GeoJSON
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(
+            db, project_id, minimal=True, include=("extract",)
+        )
         geojson_data = project.data_extract_geojson
 
         if not geojson_data:
@@ -938,6 +949,8 @@ async def submit_geojson_data_extract_htmx(
             db=db,
             project_id=project_id,
             geojson_data=geojson_data,
+            # Uploaded data has no OSM options, the stored extract keeps its own
+            extract_options={} if "geojson-data" in (data or {}) else None,
         )
         log.info(
             f"Saved data extract to database for project {project_id} "
@@ -989,7 +1002,7 @@ async def submit_geojson_data_extract_htmx(
 @get(
     path="/preview-tasks-and-data-htmx",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(db_conn_ro),
         "auth_user": Provide(login_required),
         "current_user": Provide(mapper),
     },
@@ -1007,7 +1020,9 @@ async def preview_tasks_and_data_htmx(
         return _project_not_found_response()
 
     try:
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(
+            db, project_id, minimal=True, include=("extract", "task_areas")
+        )
         data_extract = project.data_extract_geojson
 
         if not data_extract:
@@ -1023,8 +1038,14 @@ async def preview_tasks_and_data_htmx(
                 status_code=status.HTTP_404_NOT_FOUND,
             )
 
-        task_boundaries_json = await project_crud.get_task_geometry(db, project_id)
-        task_boundaries = _parse_task_boundaries_json(task_boundaries_json, project_id)
+        # Stored task areas are already loaded, so only fetch from elsewhere
+        # (ODK or QField) if missing
+        task_boundaries = project.task_areas_geojson
+        if not task_boundaries:
+            task_boundaries_json = await project_crud.get_task_geometry(db, project_id)
+            task_boundaries = _parse_task_boundaries_json(
+                task_boundaries_json, project_id
+            )
         is_no_splitting, preview_blocker = _task_preview_state(project, task_boundaries)
         if preview_blocker:
             return preview_blocker
@@ -1106,7 +1127,7 @@ async def skip_task_split_htmx(
 
     try:
         # Get project with outline
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(db, project_id, minimal=True)
 
         if not project.outline:
             return Response(
@@ -1163,7 +1184,7 @@ async def skip_task_split_htmx(
 @post(
     path="/split-aoi-htmx",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(background_db_conn),
         "auth_user": Provide(login_required),
         "current_user": Provide(mapper),
     },
@@ -1229,7 +1250,9 @@ async def split_aoi_htmx(
                 headers={"HX-Refresh": "true"},
             )
 
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(
+            db, project_id, minimal=True, include=("extract",)
+        )
         data_extract = project.data_extract_geojson
         return _build_split_preview_response(
             project_id,
@@ -1253,6 +1276,18 @@ async def split_aoi_htmx(
         )
 
 
+def _accepted_extract_options(data: dict) -> dict:
+    """The OSM options of an accepted extract, or {} if it was uploaded."""
+    if not data.get("osm_category"):
+        return {}
+    return osm_extract_options(
+        osm_category=data["osm_category"],
+        geom_type=data.get("geom_type", "POLYGON"),
+        centroid=data.get("centroid") == "true",
+        tiled=data.get("tiled") == "true",
+    )
+
+
 @post(
     path="/accept-data-extract-htmx",
     dependencies={
@@ -1293,6 +1328,7 @@ async def accept_data_extract_htmx(
             db=db,
             project_id=project_id,
             geojson_data=geojson_data,
+            extract_options=_accepted_extract_options(data),
         )
         log.info(
             f"Accepted and saved data extract with {feature_count} "
@@ -1397,7 +1433,7 @@ async def accept_split_htmx(
 @post(
     path="/create-project-odk-htmx",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(background_db_conn),
         "auth_user": Provide(login_required),
         "current_user": Provide(project_manager),
     },
@@ -1465,7 +1501,7 @@ async def create_project_odk_htmx(  # noqa: PLR0913
 @post(
     path="/create-project-qfield-htmx",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(background_db_conn),
         "auth_user": Provide(login_required),
         "current_user": Provide(project_manager),
     },
@@ -16,110 +16,246 @@
 #     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
 #
 
-"""Static asset HTMX routes (favicon, icons, images)."""
-
+"""Static asset HTMX routes (favicon, icons, images).
+
+All assets are read once, fingerprinted and precompressed, then served
+from memory. Templates should reference assets via the `static_url` Jinja
+global, which returns a content-hashed URL that can be cached immutably.
+"""
+
+import gzip
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
-from litestar import get
+from litestar import Litestar, Request, get
 from litestar import status_codes as status
 from litestar.response import Response
 
+log = logging.getLogger(__name__)
 
-@get("/static/css/{filename:str}")
-async def serve_static_css(filename: str) -> Response:
-    """Serve static CSS files."""
-    static_dir = Path(__file__).parent.parent / "static" / "css"
-    file_path = static_dir / filename
+STATIC_DIR = Path(__file__).parent.parent / "static"
 
-    # Security: only allow .css and no path traversal
-    if (
-        not filename.endswith(".css")
-        or ".." in filename
-        or "/" in filename
-        or "\\" in filename
-    ):
-        return Response(content="Forbidden", status_code=status.HTTP_403_FORBIDDEN)
+# Allowed extensions per static sub-directory
+STATIC_MEDIA_TYPES = {
+    "css": {".css": "text/css"},
+    "images": {
+        ".svg": "image/svg+xml",
+        ".png": "image/png",
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+    },
+    "icons": {
+        ".svg": "image/svg+xml",
+        ".png": "image/png",
+    },
+}
+# Already compressed formats (png/jpg) gain nothing from gzip
+COMPRESSIBLE_MEDIA_TYPES = {"text/css", "image/svg+xml"}
 
-    if not file_path.exists():
-        return Response(content="Not Found", status_code=status.HTTP_404_NOT_FOUND)
+FINGERPRINT_LENGTH = 12
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# e.g. app.0123456789ab.css
+_FINGERPRINTED_NAME = re.compile(
+    rf"^(?P<stem>.+)\.(?P<digest>[0-9a-f]{{{FINGERPRINT_LENGTH}}})(?P<suffix>\.\w+)$"
+)
 
-    with open(file_path, "rb") as f:
-        content = f.read()
 
-    return Response(
+@dataclass(slots=True)
+class StaticAsset:
+    """A static file held in memory, with a precompressed gzip variant."""
+
+    content: bytes
+    media_type: str
+    digest: str
+    gzip: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        """Total bytes held for this asset, including the gzip variant."""
+        return len(self.content) + len(self.gzip or b"")
+
+
+def _build_asset(content: bytes, media_type: str) -> StaticAsset:
+    """Fingerprint and, where worthwhile, precompress file content."""
+    asset = StaticAsset(
         content=content,
-        media_type="text/css",
-        headers={"Cache-Control": "public, max-age=3600"},
+        media_type=media_type,
+        digest=hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH],
     )
+    if media_type in COMPRESSIBLE_MEDIA_TYPES:
+        # mtime=0 keeps the output (and so the ETag) stable across restarts
+        gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(gzipped) < len(content):
+            asset.gzip = gzipped
+    return asset
+
+
+class StaticAssetStore:
+    """In-memory store of static assets, keyed by path relative to STATIC_DIR."""
+
+    def __init__(self, root: Path):
+        """Initialise an empty store, loaded on first use."""
+        self.root = root
+        self._assets: Optional[dict[str, StaticAsset]] = None
+
+    @property
+    def assets(self) -> dict[str, StaticAsset]:
+        """All assets, loading them from disk if not done yet."""
+        if self._assets is None:
+            self.load()
+        return self._assets
+
+    def load(self) -> None:
+        """Read every allowed file under the static directory into memory."""
+        assets = {}
+        for subdir, media_types in STATIC_MEDIA_TYPES.items():
+            for file_path in sorted((self.root / subdir).glob("*")):
+                media_type = media_types.get(file_path.suffix.lower())
+                if media_type is None or not file_path.is_file():
+                    continue
+                assets[f"{subdir}/{file_path.name}"] = _build_asset(
+                    file_path.read_bytes(), media_type
+                )
+        self._assets = assets
+
+        total_bytes = sum(asset.size for asset in assets.values())
+        log.info(
+            f"Loaded {len(assets)} static assets into memory "
+            f"({total_bytes / 1024:.1f} KiB incl. gzip variants)"
+        )
 
+    def get(self, path: str) -> Optional[StaticAsset]:
+        """Get an asset by its relative path, e.g. css/app.css."""
+        return self.assets.get(path)
 
-@get("/static/images/{filename:str}")
-async def serve_static_image(filename: str) -> Response:
-    """Serve static image files."""
-    allowed_media_types = {
-        ".svg": "image/svg+xml",
-        ".png": "image/png",
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-    }
-    static_dir = Path(__file__).parent.parent / "static" / "images"
-    file_path = static_dir / filename
+    def url_for(self, path: str) -> str:
+        """Return the content-hashed URL for an asset.
+
+        Unknown paths are returned unhashed, so a missing asset 404s as before.
+        """
+        asset = self.get(path)
+        if asset is None:
+            return f"/static/{path}"
+        file_path = Path(path)
+        hashed_name = f"{file_path.stem}.{asset.digest}{file_path.suffix}"
+        return f"/static/{file_path.parent.as_posix()}/{hashed_name}"
+
+
+static_assets = StaticAssetStore(STATIC_DIR)
+
+
+def static_url(path: str) -> str:
+    """Jinja global returning the fingerprinted URL for a static asset."""
+    return static_assets.url_for(path)
+
+
+async def load_static_assets(server: Litestar) -> None:  # noqa: ARG001
+    """Load static assets into memory on startup."""
+    static_assets.load()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def _asset_response(
+    request: Request, asset: StaticAsset, cache_control: str
+) -> Response:
+    """Build a response for an asset, negotiating encoding and ETags."""
+    accept_encoding = request.headers.get("accept-encoding", "")
+    content, encoding = asset.content, None
+    if asset.gzip is not None and "gzip" in accept_encoding:
+        content, encoding = asset.gzip, "gzip"
+
+    # Each encoded representation needs its own strong ETag
+    etag = f'"{asset.digest}-{encoding}"' if encoding else f'"{asset.digest}"'
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if asset.gzip is not None:
+        headers["Vary"] = "Accept-Encoding"
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            content=b"",
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=asset.media_type, headers=headers)
+
+
+def _serve_static_file(request: Request, subdir: str, filename: str) -> Response:
+    """Serve a file from a static sub-directory, fingerprinted or not."""
     suffix = Path(filename).suffix.lower()
 
-    # Security: only allow known image extensions and ensure no path traversal
+    # Security: only allow known extensions and ensure no path traversal
     if (
-        suffix not in allowed_media_types
+        suffix not in STATIC_MEDIA_TYPES[subdir]
         or ".." in filename
         or "/" in filename
         or "\\" in filename
     ):
-        return Response(
-            content="Forbidden",
-            status_code=status.HTTP_403_FORBIDDEN,
-        )
+        return Response(content="Forbidden", status_code=status.HTTP_403_FORBIDDEN)
 
-    if not file_path.exists():
-        return Response(
-            content="Not Found",
-            status_code=status.HTTP_404_NOT_FOUND,
-        )
+    cache_control = "public, max-age=3600"
+    asset = static_assets.get(f"{subdir}/{filename}")
+    if asset is None and (match := _FINGERPRINTED_NAME.match(filename)):
+        asset = static_assets.get(f"{subdir}/{match['stem']}{match['suffix']}")
+        # A stale fingerprint (from before a deploy) gets the current file,
+        # but must not be cached forever under the old URL
+        if asset is not None and asset.digest == match["digest"]:
+            cache_control = IMMUTABLE_CACHE_CONTROL
 
-    with open(file_path, "rb") as f:
-        content = f.read()
+    if asset is None:
+        return Response(content="Not Found", status_code=status.HTTP_404_NOT_FOUND)
 
-    return Response(
-        content=content,
-        media_type=allowed_media_types[suffix],
-        headers={"Cache-Control": "public, max-age=3600"},
-    )
+    return _asset_response(request, asset, cache_control)
+
+
+@get("/static/css/{filename:str}")
+async def serve_static_css(request: Request, filename: str) -> Response:
+    """Serve static CSS files."""
+    return _serve_static_file(request, "css", filename)
+
+
+@get("/static/images/{filename:str}")
+async def serve_static_image(request: Request, filename: str) -> Response:
+    """Serve static image files."""
+    return _serve_static_file(request, "images", filename)
 
 
 # Individual route handlers for favicon and icons
-async def _serve_icon_file(filename: str, media_type: str) -> Response:
+async def _serve_icon_file(request: Request, filename: str) -> Response:
     """Helper to serve icon files."""
-    icons_dir = Path(__file__).parent.parent / "static" / "icons"
-    file_path = icons_dir / filename
-
-    with open(file_path, "rb") as f:
-        content = f.read()
+    asset = static_assets.get(f"icons/{filename}")
+    if asset is None:
+        return Response(content="Not Found", status_code=status.HTTP_404_NOT_FOUND)
 
-    return Response(
-        content=content,
-        media_type=media_type,
-        headers={"Cache-Control": "public, max-age=86400"},  # Cache for 1 day
-    )
+    # Icon URLs are fixed by browsers, so cannot be fingerprinted; cache 1 day
+    return _asset_response(request, asset, "public, max-age=86400")
 
 
 @get("/favicon.png", include_in_schema=False)
-async def serve_favicon_png() -> Response:
+async def serve_favicon_png(request: Request) -> Response:
     """Serve favicon.png."""
-    return await _serve_icon_file("favicon.png", "image/png")
+    return await _serve_icon_file(request, "favicon.png")
 
 
 @get("/favicon.svg", include_in_schema=False)
-async def serve_favicon_svg() -> Response:
+async def serve_favicon_svg(request: Request) -> Response:
     """Serve favicon.svg."""
-    return await _serve_icon_file("favicon.svg", "image/svg+xml")
+    return await _serve_icon_file(request, "favicon.svg")
 
 
 @get("/favicon.ico", include_in_schema=False)
@@ -133,30 +269,30 @@ async def serve_favicon_ico() -> Response:
 
 
 @get("/apple-touch-icon-180x180.png", include_in_schema=False)
-async def serve_apple_touch_icon() -> Response:
+async def serve_apple_touch_icon(request: Request) -> Response:
     """Serve apple-touch-icon-180x180.png."""
-    return await _serve_icon_file("apple-touch-icon-180x180.png", "image/png")
+    return await _serve_icon_file(request, "apple-touch-icon-180x180.png")
 
 
 @get("/maskable-icon-512x512.png", include_in_schema=False)
-async def serve_maskable_icon() -> Response:
+async def serve_maskable_icon(request: Request) -> Response:
     """Serve maskable-icon-512x512.png."""
-    return await _serve_icon_file("maskable-icon-512x512.png", "image/png")
+    return await _serve_icon_file(request, "maskable-icon-512x512.png")
 
 
 @get("/pwa-192x192.png", include_in_schema=False)
-async def serve_pwa_192() -> Response:
+async def serve_pwa_192(request: Request) -> Response:
     """Serve pwa-192x192.png."""
-    return await _serve_icon_file("pwa-192x192.png", "image/png")
+    return await _serve_icon_file(request, "pwa-192x192.png")
 
 
 @get("/pwa-512x512.png", include_in_schema=False)
-async def serve_pwa_512() -> Response:
+async def serve_pwa_512(request: Request) -> Response:
     """Serve pwa-512x512.png."""
-    return await _serve_icon_file("pwa-512x512.png", "image/png")
+    return await _serve_icon_file(request, "pwa-512x512.png")
 
 
 @get("/pwa-64x64.png", include_in_schema=False)
-async def serve_pwa_64() -> Response:
+async def serve_pwa_64(request: Request) -> Response:
     """Serve pwa-64x64.png."""
-    return await _serve_icon_file("pwa-64x64.png", "image/png")
+    return await _serve_icon_file(request, "pwa-64x64.png")
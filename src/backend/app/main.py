@@ -28,14 +28,30 @@ from psycopg import AsyncConnection
 from psycopg.rows import tuple_row
 
 from app.__version__ import __version__
+from app.auth.api_key import (
+    start_api_key_last_used_flusher,
+    stop_api_key_last_used_flusher,
+)
+from app.auth.auth_cache import create_request_memo_middleware
 from app.auth.auth_routes import auth_router
 from app.central.central_routes import central_router
 from app.config import AuthProvider, MonitoringTypes, settings
-from app.db.database import close_db_connection_pool, db_conn, get_db_connection_pool
+from app.db.database import (
+    DbPool,
+    close_db_connection_pool,
+    create_read_your_writes_middleware,
+    db_conn,
+    get_db_connection_pool,
+)
 from app.db.models import DbUser
+from app.db.query_stats import create_query_stats_middleware
+from app.db.slow_queries import start_slow_query_log, stop_slow_query_log
 from app.helpers.helper_routes import helper_router
+from app.helpers.process_pool import start_process_pool, stop_process_pool
+from app.helpers.profiler_routes import profiler_router
 from app.htmx.htmx_routes import htmx_router
 from app.htmx.project_create_routes import reconcile_simple_project_basemap_autostarts
+from app.htmx.static_routes import load_static_assets, static_url
 from app.i18n import (
     LOCALE_LABELS,
     SUPPORTED_LOCALES,
@@ -47,6 +63,15 @@ from app.i18n import (
     ngettext_func,
     set_locale_before_request,
 )
+from app.metrics import (
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+)
+from app.metrics import (
+    create_metrics_middleware,
+    render_metrics,
+    start_metrics,
+    stop_metrics,
+)
 from app.monitoring import (
     add_endpoint_profiler,
     get_otel_plugin,
@@ -80,7 +105,7 @@ async def server_init(server: Litestar) -> None:
     """
     log.debug("Starting up Litestar server")
 
-    async with server.state.db_pool.connection() as conn:
+    async with server.state.db_pools[DbPool.MAINTENANCE].connection() as conn:
         log.debug("Reading XLSForms from DB")
         await read_and_insert_xlsforms(conn, xlsforms_path)
         log.debug("Initialising reverse geocoding database")
@@ -97,7 +122,7 @@ async def create_local_admin_user(server: Litestar) -> None:
         name="Admin",
         email_address="admin@field-tm.dev",
     )
-    async with server.state.db_pool.connection() as conn:
+    async with server.state.db_pools[DbPool.MAINTENANCE].connection() as conn:
         log.debug(f"Creating admin user {admin_user.username}")
         await DbUser.create(conn, admin_user, ignore_conflict=True)
 
@@ -288,14 +313,25 @@ def configure_root_router() -> Router:
                 detail=_("Could not connect to database"),
             )
 
+    route_handlers = [deployment_details, simple_heartbeat, heartbeat_plus_db]
+
+    if settings.METRICS_ENABLED:
+
+        @get(
+            settings.METRICS_PATH,
+            media_type=METRICS_CONTENT_TYPE,
+            include_in_schema=False,
+        )
+        async def metrics() -> str:
+            """Prometheus metrics for this worker (or all, if shared)."""
+            return render_metrics()
+
+        route_handlers.append(metrics)
+
     return Router(
         path="/",
         tags=["root"],
-        route_handlers=[
-            deployment_details,
-            simple_heartbeat,
-            heartbeat_plus_db,
-        ],
+        route_handlers=route_handlers,
     )
 
 
@@ -311,6 +347,7 @@ def _configure_template_engine(engine: JinjaTemplateEngine) -> None:
     engine.engine.globals["current_dir"] = get_current_dir
     engine.engine.globals["supported_locales"] = SUPPORTED_LOCALES
     engine.engine.globals["locale_labels"] = LOCALE_LABELS
+    engine.engine.globals["static_url"] = static_url
 
     hanko_public_url = settings.HANKO_PUBLIC_URL or settings.HANKO_API_URL or ""
     engine.engine.globals["hanko_public_url"] = hanko_public_url
@@ -364,22 +401,44 @@ def create_app() -> Litestar:
         auth_router,
         qfield_router,
         helper_router,
+        profiler_router,
         central_router,
         htmx_router,
     ]
     if auth_lib_router is not None:
         route_handlers.insert(0, auth_lib_router)
 
+    middleware = [
+        create_query_stats_middleware,
+        create_locale_cookie_middleware,
+        create_request_memo_middleware,
+    ]
+    if settings.METRICS_ENABLED:
+        middleware.insert(0, create_metrics_middleware)
+    if settings.FTM_DB_REPLICA_URL:
+        middleware.append(create_read_your_writes_middleware)
+
     app = Litestar(
         route_handlers=route_handlers,
         plugins=plugins,
         on_startup=[
             get_db_connection_pool,
+            start_slow_query_log,
+            start_metrics,
+            load_static_assets,
+            start_process_pool,
             server_init,
             reconcile_simple_project_basemap_autostarts,
             create_local_admin_user,
+            start_api_key_last_used_flusher,
+        ],
+        on_shutdown=[
+            stop_api_key_last_used_flusher,
+            stop_slow_query_log,
+            stop_process_pool,
+            stop_metrics,
+            close_db_connection_pool,
         ],
-        on_shutdown=[close_db_connection_pool],
         cors_config=_build_cors_config(),
         openapi_config=OpenAPIConfig(title="Field-TM", version=__version__),
         logging_config=_get_logging_config(),
@@ -394,7 +453,7 @@ def create_app() -> Litestar:
             engine_callback=_configure_template_engine,
         ),
         before_request=set_locale_before_request,
-        middleware=[create_locale_cookie_middleware],
+        middleware=middleware,
         debug=settings.DEBUG,
     )
 
@@ -0,0 +1,570 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Always-on Prometheus metrics, in the text exposition format.
+
+Covers request latency by route template, in-flight requests, DB pool
+stats, outbound call latency by integration and background jobs.
+
+Each uvicorn worker keeps its own in-memory registry. With more than one
+worker, set METRICS_MULTIPROC_DIR to a directory shared by the workers
+(emptied before they start): each worker then writes periodic snapshots
+there, and a scrape of any worker sums them. Counters and histograms of
+exited workers are kept, so totals never go backwards, while their gauges
+are dropped.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from litestar import Litestar
+from litestar import status_codes as status
+from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import aiohttp
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+OUTBOUND_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+Snapshot = dict[str, list[list[Any]]]
+
+
+class _Metric:
+    """Base for a metric family, keyed by a tuple of label values."""
+
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        lock: threading.Lock,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: dict[tuple[str, ...], Any] = {}
+        self._lock = lock
+
+    def merge_value(self, current: Any, other: Any) -> Any:
+        """Combine the values of one series from two workers."""
+        return current + other
+
+    def render_series(self, labels: tuple[str, ...], value: Any) -> Iterator[str]:
+        """Yield the exposition lines for one series."""
+        yield f"{self.name}{_format_labels(self.labelnames, labels)} {value}"
+
+
+class Counter(_Metric):
+    """A monotonically increasing total."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increment the series for the given label values."""
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set_total(self, value: float, *labels: str) -> None:
+        """Set a total that is already tracked elsewhere, e.g. pool stats."""
+        with self._lock:
+            self.values[labels] = value
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increment the series for the given label values."""
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrement the series for the given label values."""
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the series for the given label values."""
+        with self._lock:
+            self.values[labels] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets.
+
+    Each series is stored as per-bucket counts (the last being +Inf),
+    followed by the sum of observations.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        lock: threading.Lock,
+        buckets: Sequence[float],
+    ):
+        """Create a histogram with the given bucket upper bounds."""
+        super().__init__(name, documentation, labelnames, lock)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation for the given label values."""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def merge_value(self, current: list, other: list) -> list:
+        """Add bucket counts and sums."""
+        return [a + b for a, b in zip(current, other, strict=True)]
+
+    def render_series(self, labels: tuple[str, ...], value: list) -> Iterator[str]:
+        """Yield cumulative bucket, sum and count lines."""
+        labelnames = (*self.labelnames, "le")
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), value[:-1], strict=True):
+            cumulative += count
+            le = _format_labels(labelnames, (*labels, str(bound)))
+            yield f"{self.name}_bucket{le} {cumulative}"
+        label_str = _format_labels(self.labelnames, labels)
+        yield f"{self.name}_sum{label_str} {value[-1]}"
+        yield f"{self.name}_count{label_str} {cumulative}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(labelnames: Sequence[str], labels: Sequence[str]) -> str:
+    if not labelnames:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(labelnames, labels, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+class MetricsRegistry:
+    """A set of metric families, rendered together."""
+
+    def __init__(self):
+        """Create an empty registry, with one lock shared by its metrics."""
+        self._lock = threading.Lock()
+        self.metrics: dict[str, _Metric] = {}
+        self.collectors: list[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric) -> Any:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Register a counter (the name should end in _total)."""
+        return self._register(Counter(name, documentation, labelnames, self._lock))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames, self._lock))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_BUCKETS,
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._register(
+            Histogram(name, documentation, labelnames, self._lock, buckets)
+        )
+
+    def collect(self) -> None:
+        """Refresh values read on demand, e.g. DB pool stats."""
+        for collector in list(self.collectors):
+            try:
+                collector()
+            except Exception as e:
+                log.warning(f"Metrics collector failed: {e}")
+
+    def snapshot(self) -> Snapshot:
+        """Return a JSON-serialisable copy of all series."""
+        with self._lock:
+            return {
+                name: [
+                    [list(labels), list(value) if isinstance(value, list) else value]
+                    for labels, value in metric.values.items()
+                ]
+                for name, metric in self.metrics.items()
+            }
+
+    def render(self, snapshots: Sequence[tuple[Snapshot, bool]]) -> str:
+        """Render snapshots from one or more workers, summing their series.
+
+        Args:
+            snapshots (list): (snapshot, is_live) pairs. Gauges are only taken
+                from live workers.
+
+        Returns:
+            str: The metrics in the Prometheus text format.
+        """
+        lines: list[str] = []
+        for name, metric in self.metrics.items():
+            merged: dict[tuple[str, ...], Any] = {}
+            for snapshot, is_live in snapshots:
+                if metric.kind == "gauge" and not is_live:
+                    continue
+                for labels, value in snapshot.get(name, []):
+                    key = tuple(labels)
+                    if key in merged:
+                        merged[key] = metric.merge_value(merged[key], value)
+                    else:
+                        merged[key] = value
+
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels in sorted(merged):
+                lines.extend(metric.render_series(labels, merged[labels]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+http_request_duration = REGISTRY.histogram(
+    "ftm_http_request_duration_seconds",
+    "HTTP request latency, by route template and response status.",
+    ("method", "route", "status"),
+)
+http_requests_in_progress = REGISTRY.gauge(
+    "ftm_http_requests_in_progress",
+    "HTTP requests currently being handled.",
+)
+outbound_request_duration = REGISTRY.histogram(
+    "ftm_outbound_request_duration_seconds",
+    "Latency of calls to external services, by integration.",
+    ("integration", "outcome"),
+    buckets=OUTBOUND_BUCKETS,
+)
+background_jobs_in_progress = REGISTRY.gauge(
+    "ftm_background_jobs_in_progress",
+    "Background jobs currently running, by kind.",
+    ("kind",),
+)
+background_jobs_total = REGISTRY.counter(
+    "ftm_background_jobs_total",
+    "Background jobs finished, by kind and outcome.",
+    ("kind", "outcome"),
+)
+db_pool_connections = REGISTRY.gauge(
+    "ftm_db_pool_connections",
+    "DB pool connections, by pool and state (size, available, min, max).",
+    ("pool", "state"),
+)
+db_pool_utilization = REGISTRY.gauge(
+    "ftm_db_pool_utilization_ratio",
+    "Share of the maximum DB pool connections in use, by pool.",
+    ("pool",),
+)
+db_pool_requests_waiting = REGISTRY.gauge(
+    "ftm_db_pool_requests_waiting",
+    "Requests currently queued for a DB pool connection, by pool.",
+    ("pool",),
+)
+db_pool_requests = REGISTRY.counter(
+    "ftm_db_pool_requests_total",
+    "DB pool connection requests, including queued ones, by pool.",
+    ("pool",),
+)
+db_pool_requests_queued = REGISTRY.counter(
+    "ftm_db_pool_requests_queued_total",
+    "DB pool connection requests that had to wait for a connection, by pool.",
+    ("pool",),
+)
+db_pool_requests_errors = REGISTRY.counter(
+    "ftm_db_pool_requests_errors_total",
+    "DB pool connection requests that failed, e.g. timed out, by pool.",
+    ("pool",),
+)
+db_pool_requests_wait = REGISTRY.counter(
+    "ftm_db_pool_requests_wait_seconds_total",
+    "Total time spent waiting for a DB pool connection, by pool.",
+    ("pool",),
+)
+
+
+def _outcome(status_code: int) -> str:
+    """Classify an upstream response: only 5xx counts as an error."""
+    return "error" if status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR else "ok"
+
+
+@contextmanager
+def observe_outbound(integration: str) -> Iterator[None]:
+    """Time a call to an external service, e.g. around an HTTP request.
+
+    An exception raised by the block is recorded as an error outcome.
+    """
+    start = perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        outbound_request_duration.observe(perf_counter() - start, integration, outcome)
+
+
+def instrument_requests_session(session: Any, integration: str) -> None:
+    """Record each response of a requests Session (pyodk, QFieldCloud SDK).
+
+    Uses the time to receive the response headers. Transport errors are not
+    recorded, as requests has no hook for them.
+    """
+
+    def response_hook(response: Any, *args: Any, **kwargs: Any) -> None:
+        outbound_request_duration.observe(
+            response.elapsed.total_seconds(),
+            integration,
+            _outcome(response.status_code),
+        )
+
+    session.hooks["response"].append(response_hook)
+
+
+def aiohttp_trace_config(integration: str) -> "aiohttp.TraceConfig":
+    """Return a TraceConfig recording each request of an aiohttp session."""
+    import aiohttp
+
+    async def on_request_start(session, context, params) -> None:  # noqa: ARG001
+        context.start = perf_counter()
+
+    async def on_request_end(session, context, params) -> None:  # noqa: ARG001
+        outbound_request_duration.observe(
+            perf_counter() - context.start,
+            integration,
+            _outcome(params.response.status),
+        )
+
+    async def on_request_exception(session, context, params) -> None:  # noqa: ARG001
+        outbound_request_duration.observe(
+            perf_counter() - context.start, integration, "error"
+        )
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+@dataclass(slots=True)
+class BackgroundJob:
+    """Handle for a tracked job, to flag failures that are handled in place."""
+
+    failed: bool = False
+
+
+@contextmanager
+def track_background_job(kind: str) -> Iterator[BackgroundJob]:
+    """Count a background job while it runs, and its outcome once done.
+
+    The outcome is an error if the block raises, or sets ``job.failed``.
+    """
+    background_jobs_in_progress.inc(kind)
+    job = BackgroundJob()
+    try:
+        yield job
+    except BaseException:
+        job.failed = True
+        raise
+    finally:
+        background_jobs_in_progress.dec(kind)
+        background_jobs_total.inc(kind, "error" if job.failed else "ok")
+
+
+def create_metrics_middleware(app: ASGIApp) -> ASGIApp:
+    """ASGI middleware recording request latency by route template.
+
+    Runs after routing, so requests for unknown paths are not recorded
+    (avoiding unbounded label values).
+    """
+
+    async def middleware(scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        start = perf_counter()
+        try:
+            await app(scope, receive, send_wrapper)
+        except Exception as e:
+            # Converted to a response by the exception handlers further out
+            status_code = getattr(e, "status_code", 500)
+            raise
+        finally:
+            http_requests_in_progress.dec()
+            http_request_duration.observe(
+                perf_counter() - start,
+                scope["method"],
+                scope.get("path_template", "unmatched"),
+                str(status_code),
+            )
+
+    return middleware
+
+
+def _collect_db_pool_stats(name: str, db_pool: Any) -> None:
+    """Copy psycopg pool stats into the registry (cumulative since start)."""
+    stats = db_pool.get_stats()
+    for state in ("size", "available", "min", "max"):
+        db_pool_connections.set(stats.get(f"pool_{state}", 0), name, state)
+    in_use = stats.get("pool_size", 0) - stats.get("pool_available", 0)
+    db_pool_utilization.set(in_use / max(stats.get("pool_max", 0), 1), name)
+    db_pool_requests_waiting.set(stats.get("requests_waiting", 0), name)
+    db_pool_requests.set_total(stats.get("requests_num", 0), name)
+    db_pool_requests_queued.set_total(stats.get("requests_queued", 0), name)
+    db_pool_requests_errors.set_total(stats.get("requests_errors", 0), name)
+    db_pool_requests_wait.set_total(stats.get("requests_wait_ms", 0) / 1000, name)
+
+
+def _snapshot_path(pid: int) -> Path:
+    return Path(str(settings.METRICS_MULTIPROC_DIR)) / f"{pid}.json"
+
+
+def _pid_is_live(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _write_snapshot() -> None:
+    """Atomically write this worker's snapshot to the shared directory."""
+    REGISTRY.collect()
+    path = _snapshot_path(os.getpid())
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(REGISTRY.snapshot()))
+    tmp_path.replace(path)
+
+
+def _read_worker_snapshots() -> list[tuple[Snapshot, bool]]:
+    """Read the snapshots of the other workers."""
+    snapshots = []
+    own_pid = os.getpid()
+    for path in Path(str(settings.METRICS_MULTIPROC_DIR)).glob("*.json"):
+        try:
+            pid = int(path.stem)
+            if pid == own_pid:
+                continue
+            snapshots.append((json.loads(path.read_text()), _pid_is_live(pid)))
+        except (ValueError, OSError) as e:
+            log.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+    return snapshots
+
+
+def render_metrics() -> str:
+    """Render the metrics of this worker, plus other workers if shared."""
+    REGISTRY.collect()
+    snapshots = [(REGISTRY.snapshot(), True)]
+    if settings.METRICS_MULTIPROC_DIR:
+        snapshots.extend(_read_worker_snapshots())
+    return REGISTRY.render(snapshots)
+
+
+async def _write_snapshots_periodically() -> None:
+    """Background loop sharing this worker's metrics with the others."""
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            _write_snapshot()
+        except OSError as e:
+            log.warning(f"Failed to write metrics snapshot: {e}")
+
+
+async def start_metrics(server: Litestar) -> None:
+    """Register pool stats and start sharing snapshots (Litestar startup hook).
+
+    Must run after the DB pools are created.
+    """
+    db_pools: dict[str, Any] = getattr(server.state, "db_pools", None) or {}
+    for name, db_pool in db_pools.items():
+        REGISTRY.collectors.append(partial(_collect_db_pool_stats, str(name), db_pool))
+
+    if settings.METRICS_MULTIPROC_DIR:
+        Path(settings.METRICS_MULTIPROC_DIR).mkdir(parents=True, exist_ok=True)
+        server.state.metrics_flush_task = asyncio.create_task(
+            _write_snapshots_periodically()
+        )
+
+
+async def stop_metrics(server: Litestar) -> None:
+    """Stop sharing snapshots, writing a final one (Litestar shutdown hook).
+
+    Must run before the DB pool is closed.
+    """
+    task = getattr(server.state, "metrics_flush_task", None)
+    if task is not None:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        server.state.metrics_flush_task = None
+        with suppress(OSError):
+            _write_snapshot()
+    REGISTRY.collectors.clear()
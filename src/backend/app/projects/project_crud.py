@@ -18,16 +18,21 @@
 """Logic for Field-TM project routes."""
 
 import ast
+import hashlib
 import json
 import logging
+import os
 import zlib
+from asyncio import get_running_loop
 from base64 import b64encode
+from concurrent.futures import ProcessPoolExecutor
+from importlib.metadata import version
 from io import BytesIO
 from pathlib import Path
+from time import perf_counter
 from traceback import format_exc
 from typing import Optional
 
-import segno
 from litestar import status_codes as status
 from litestar.exceptions import HTTPException
 from osm_data_client import (
@@ -36,7 +41,6 @@ from osm_data_client import (
     RawDataOutputOptions,
     RawDataResult,
 )
-from osm_fieldwork.conversion_to_xlsform import convert_to_xlsform
 from psycopg import AsyncConnection, sql
 from psycopg.rows import class_row
 
@@ -50,16 +54,21 @@ from app.db.models import (
 from app.db.postgis_utils import (
     split_geojson_by_task_areas,
 )
+from app.helpers.geojson_serializer import dumps_str
 from app.helpers.geometry_utils import (
     get_featcol_dominant_geom_type,
     javarosa_to_geojson_geom,
 )
 from app.helpers.helper_schemas import PaginatedResponse, PaginationInfo
+from app.helpers.lazy_imports import conversion_to_xlsform, segno
 from app.i18n import _
+from app.metrics import observe_outbound
 from app.projects import project_deps
 
 log = logging.getLogger(__name__)
 
+_OSM_FIELDWORK_VERSION = version("osm-fieldwork")
+
 
 async def generate_data_extract(
     project_id: int,
@@ -99,7 +108,8 @@ async def generate_data_extract(
     config = RawDataClientConfig(
         access_token=settings.RAW_DATA_API_AUTH_TOKEN.get_secret_value()
         if settings.RAW_DATA_API_AUTH_TOKEN
-        else None
+        else None,
+        base_api_url=settings.RAW_DATA_API_URL.rstrip("/"),
     )
     extra_params = {
         "fileName": (
@@ -116,11 +126,12 @@ async def generate_data_extract(
     }
 
     try:
-        result = await RawDataClient(config).get_osm_data(
-            aoi,
-            output_options=RawDataOutputOptions(download_file=False),
-            **extra_params,
-        )
+        with observe_outbound("raw-data-api"):
+            result = await RawDataClient(config).get_osm_data(
+                aoi,
+                output_options=RawDataOutputOptions(download_file=False),
+                **extra_params,
+            )
 
         return result
     except Exception as e:
@@ -153,19 +164,68 @@ async def generate_data_extract(
 # ---------------------------
 
 
+def _xlsform_source_hash(yaml_bytes: bytes) -> str:
+    """Hash a YAML template together with the converter version.
+
+    Including the osm-fieldwork version means templates are rebuilt when
+    the conversion logic changes, even if the YAML itself did not.
+    """
+    digest = hashlib.sha256(yaml_bytes)
+    digest.update(f"osm-fieldwork=={_OSM_FIELDWORK_VERSION}".encode())
+    return digest.hexdigest()
+
+
+async def _convert_xlsforms(file_paths: dict[str, Path]) -> dict[str, bytes]:
+    """Convert YAML templates to XLSX, in parallel processes if more than one.
+
+    Returns a dict of form_type: xlsx bytes, omitting failed conversions.
+    """
+    if not file_paths:
+        return {}
+
+    loop = get_running_loop()
+    max_workers = min(len(file_paths), os.cpu_count() or 1)
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    try:
+        futures = {
+            form_type: loop.run_in_executor(
+                executor, conversion_to_xlsform.convert_to_xlsform, str(file_path)
+            )
+            for form_type, file_path in file_paths.items()
+        }
+        converted = {}
+        for form_type, future in futures.items():
+            try:
+                converted[form_type] = await future
+            except Exception:
+                log.exception(
+                    f"Error occurred during in-memory conversion for "
+                    f"{file_paths[form_type]}"
+                )
+        return converted
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
 async def read_and_insert_xlsforms(db: AsyncConnection, directory: str) -> None:
-    """Read the list of XLSForms from the disk and sync them with the database."""
-    async with db.cursor() as cur:
-        existing_db_forms = set()
+    """Read the list of XLSForms from the disk and sync them with the database.
+
+    Templates whose YAML source is unchanged since the last sync are skipped.
+    """
+    started_at = perf_counter()
 
-        # Collect all existing XLSForm titles from the database
+    async with db.cursor() as cur:
+        # Collect all existing XLSForm titles and source hashes from the database
         select_existing_query = """
-            SELECT title FROM template_xlsforms;
+            SELECT title, source_hash FROM template_xlsforms;
         """
         await cur.execute(select_existing_query)
-        existing_db_forms = {row[0] for row in await cur.fetchall()}
+        existing_db_forms = dict(await cur.fetchall())
 
-        # Insert or update new XLSForms from disk
+        # Find new or changed XLSForms on disk
+        changed_paths: dict[str, Path] = {}
+        source_hashes: dict[str, str] = {}
         for yaml_type in XLSFormType:
             file_name = yaml_type.name
             form_type = yaml_type.value
@@ -175,26 +235,34 @@ async def read_and_insert_xlsforms(db: AsyncConnection, directory: str) -> None:
                 log.warning(f"{file_path} does not exist!")
                 continue
 
-            if file_path.stat().st_size == 0:
+            yaml_bytes = file_path.read_bytes()
+            if not yaml_bytes:
                 log.warning(f"{file_path} is empty!")
                 continue
 
-            try:
-                data = convert_to_xlsform(str(file_path))
+            source_hashes[form_type] = _xlsform_source_hash(yaml_bytes)
+            if existing_db_forms.get(form_type) != source_hashes[form_type]:
+                changed_paths[form_type] = file_path
 
-            except Exception:
-                log.exception(
-                    f"Error occurred during in-memory conversion for {file_path}"
-                )
+        skipped_count = len(source_hashes) - len(changed_paths)
+        converted = await _convert_xlsforms(changed_paths)
 
+        for form_type, data in converted.items():
             try:
                 insert_query = """
-                    INSERT INTO template_xlsforms (title, xls)
-                    VALUES (%(title)s, %(xls)s)
+                    INSERT INTO template_xlsforms (title, xls, source_hash)
+                    VALUES (%(title)s, %(xls)s, %(source_hash)s)
                     ON CONFLICT (title) DO UPDATE
-                    SET xls = EXCLUDED.xls
+                    SET xls = EXCLUDED.xls, source_hash = EXCLUDED.source_hash
                 """
-                await cur.execute(insert_query, {"title": form_type, "xls": data})
+                await cur.execute(
+                    insert_query,
+                    {
+                        "title": form_type,
+                        "xls": data,
+                        "source_hash": source_hashes[form_type],
+                    },
+                )
                 log.info(f"XLSForm for '{form_type}' inserted/updated in the database")
 
             except Exception as e:
@@ -207,7 +275,7 @@ async def read_and_insert_xlsforms(db: AsyncConnection, directory: str) -> None:
         # Determine the forms that need to be deleted (those in the DB but
         # not in the current XLSFormType)
         required_forms = {yaml_type.value for yaml_type in XLSFormType}
-        forms_to_delete = existing_db_forms - required_forms
+        forms_to_delete = set(existing_db_forms) - required_forms
 
         if forms_to_delete:
             delete_query = """
@@ -216,6 +284,11 @@ async def read_and_insert_xlsforms(db: AsyncConnection, directory: str) -> None:
             await cur.execute(delete_query, {"titles": list(forms_to_delete)})
             log.info(f"Deleted XLSForms from the database: {forms_to_delete}")
 
+    log.info(
+        f"XLSForm template sync took {perf_counter() - started_at:.2f}s "
+        f"({len(converted)} converted, {skipped_count} unchanged)"
+    )
+
 
 async def claim_simple_project_basemap_generation(
     db: AsyncConnection,
@@ -583,20 +656,14 @@ async def generate_project_files(
 
 def _empty_feature_collection_json() -> str:
     """Return an empty GeoJSON feature collection as JSON text."""
-    return json.dumps({"type": "FeatureCollection", "features": []})
+    return dumps_str({"type": "FeatureCollection", "features": []})
 
 
-def _serialize_stored_task_areas(task_areas_geojson) -> str | None:
-    """Serialize task areas stored directly on the project row."""
-    if task_areas_geojson is None:
-        return None
-    if task_areas_geojson == {}:
+def _stored_task_areas_json(task_areas_geojson: bytes) -> str:
+    """Task areas stored directly on the project row, as JSON text."""
+    if task_areas_geojson == b"{}":
         return _empty_feature_collection_json()
-    if isinstance(task_areas_geojson, dict):
-        return json.dumps(task_areas_geojson)
-    if isinstance(task_areas_geojson, str):
-        return task_areas_geojson
-    return None
+    return task_areas_geojson.decode()
 
 
 def _project_odk_credentials_from_settings() -> central_schemas.ODKCentral:
@@ -653,7 +720,7 @@ async def _task_geometry_from_odk(project: DbProject) -> str | None:
 
     if not features:
         return None
-    return json.dumps({"type": "FeatureCollection", "features": features})
+    return dumps_str({"type": "FeatureCollection", "features": features})
 
 
 async def _task_geometry_from_qfield(
@@ -664,7 +731,7 @@ async def _task_geometry_from_qfield(
     feature_collection = await _task_boundaries_from_qfield(db, project_id)
     if not feature_collection:
         return None
-    return json.dumps(feature_collection)
+    return dumps_str(feature_collection)
 
 
 async def get_task_geometry(db: AsyncConnection, project_id: int):
@@ -681,12 +748,20 @@ async def get_task_geometry(db: AsyncConnection, project_id: int):
     Returns:
         str: A geojson of the task boundaries
     """
-    # Get project to check if it has task areas stored in database
-    project = await project_deps.get_project_by_id(db, project_id)
-    stored_task_areas = _serialize_stored_task_areas(project.task_areas_geojson)
+    # Stored task areas are returned as-is, without a JSON round trip
+    try:
+        stored_task_areas = await DbProject.raw_geojson(
+            db, project_id, "task_areas_geojson"
+        )
+    except KeyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        ) from e
     if stored_task_areas is not None:
-        return stored_task_areas
+        return _stored_task_areas_json(stored_task_areas)
 
+    project = await project_deps.get_project_by_id(db, project_id, minimal=True)
     odk_task_geometry = await _task_geometry_from_odk(project)
     if odk_task_geometry is not None:
         return odk_task_geometry
@@ -818,6 +893,45 @@ async def get_paginated_projects(  # noqa: PLR0913
     )
 
 
+# Above this many projects in the viewport, return clusters instead
+MAX_UNCLUSTERED_PROJECTS = 500
+# Grid cells per (256px) map tile when clustering, i.e. ~64px cells
+CLUSTER_CELLS_PER_TILE = 4
+
+
+async def get_projects_within(
+    db: AsyncConnection,
+    bbox: tuple[float, float, float, float],
+    zoom: int,
+) -> dict:
+    """Project centroids within a bbox, clustered by zoom if too many.
+
+    Projects are returned as [id, lon, lat, status] and clusters as
+    [lon, lat, count], to keep the response compact.
+    """
+    projects = await DbProject.centroids_within(
+        db, bbox, limit=MAX_UNCLUSTERED_PROJECTS + 1
+    )
+    if len(projects) <= MAX_UNCLUSTERED_PROJECTS:
+        return {
+            "clustered": False,
+            "projects": [list(project) for project in projects],
+            "clusters": [],
+        }
+
+    # Snap to a grid fixed by zoom, so clusters are stable when panning
+    cell_size = 360 / (2**zoom * CLUSTER_CELLS_PER_TILE)
+    projects, clusters = [], []
+    for count, lon, lat, project_id, project_status in await DbProject.clusters_within(
+        db, bbox, cell_size
+    ):
+        if count == 1:
+            projects.append([project_id, lon, lat, project_status])
+        else:
+            clusters.append([lon, lat, count])
+    return {"clustered": True, "projects": projects, "clusters": clusters}
+
+
 # FIXME work out how to use osm token from hotosm_auth pkg
 # async def send_project_manager_message(
 #     request: Request,
@@ -961,7 +1075,7 @@ async def get_project_qrcode(
         HTTPException: If project or required data is missing.
     """
     # Get fresh project data
-    project = await project_deps.get_project_by_id(db, project_id)
+    project = await project_deps.get_project_by_id(db, project_id, minimal=True)
 
     if not project.project_name:
         raise HTTPException(
@@ -26,12 +26,23 @@ from app.db.models import DbProject
 
 
 async def get_project_by_id(
-    db: AsyncConnection, project_id: int, minimal: bool = False
+    db: AsyncConnection,
+    project_id: int,
+    minimal: bool = False,
+    include: tuple[str, ...] = (),
 ):
-    """Get a single project by it's ID."""
+    """Get a single project by it's ID.
+
+    If minimal, heavy columns are skipped unless in `include`
+    (see DbProject.one).
+    """
     try:
         return await DbProject.one(
-            db, project_id, minimal=minimal, warn_on_missing_token=False
+            db,
+            project_id,
+            minimal=minimal,
+            warn_on_missing_token=False,
+            include=include,
         )
     except KeyError as e:
         raise HTTPException(
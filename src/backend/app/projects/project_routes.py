@@ -1,25 +1,35 @@
 """External REST API routes for project creation."""
 
 import base64
+from dataclasses import asdict
 from io import BytesIO
 
-from litestar import Request, Router, delete, get, post
+from litestar import Request, Response, Router, delete, get, post
 from litestar import status_codes as status
 from litestar.di import Provide
 from litestar.exceptions import HTTPException
+from litestar.params import Parameter
 from psycopg import AsyncConnection
 
 from app.auth.api_key import api_key_required
 from app.central.central_schemas import ODKCentral
 from app.config import settings
-from app.db.database import db_conn
+from app.db.database import background_db_conn, db_conn, db_conn_ro
 from app.db.enums import FieldMappingApp
-from app.db.models import DbProject, DbTemplateXLSForm
+from app.db.models import (
+    DbDataExtractChange,
+    DbProject,
+    DbTemplateXLSForm,
+)
+from app.helpers.geojson_serializer import GEOJSON_MEDIA_TYPE
 from app.i18n import _
+from app.projects.project_crud import get_projects_within
 from app.projects.project_schemas import (
     CreateProjectRequest,
     CreateProjectResponse,
     ProjectUpdate,
+    RefreshDataExtractRequest,
+    RefreshDataExtractResponse,
 )
 from app.projects.project_services import (
     ConflictError,
@@ -33,12 +43,17 @@ from app.projects.project_services import (
     download_osm_data,
     finalize_odk_project,
     finalize_qfield_project,
+    osm_extract_options,
     process_xlsform,
+    refresh_data_extract,
     save_data_extract,
     save_task_areas,
     split_aoi,
 )
 
+MAX_LONGITUDE = 180
+MAX_LATITUDE = 90
+
 
 def _map_service_error(exc: ServiceError) -> HTTPException:
     """Convert service-layer exceptions to HTTP errors for API responses."""
@@ -73,6 +88,27 @@ def _enum_to_value(value):
     return value.value if hasattr(value, "value") else value
 
 
+def _parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """Parse a 'xmin,ymin,xmax,ymax' bbox in EPSG:4326."""
+    try:
+        xmin, ymin, xmax, ymax = (float(value) for value in bbox.split(","))
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_("bbox must be xmin,ymin,xmax,ymax"),
+        ) from exc
+
+    if not (
+        -MAX_LONGITUDE <= xmin < xmax <= MAX_LONGITUDE
+        and -MAX_LATITUDE <= ymin < ymax <= MAX_LATITUDE
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=_("bbox must be within -180,-90,180,90, with min < max"),
+        )
+    return xmin, ymin, xmax, ymax
+
+
 def _build_ftm_url(project_id: int) -> str:
     """Build the FieldTM project page URL."""
     domain = settings.FTM_DOMAIN
@@ -108,6 +144,24 @@ async def _resolve_xlsform_bytes(
     return BytesIO(xls_content)
 
 
+async def _save_geometry_options(
+    db: AsyncConnection,
+    project_id: int,
+    data: CreateProjectRequest,
+) -> None:
+    """Persist the requested geometry precision, used when saving geometries."""
+    if data.geometry_precision is None and data.simplify_tolerance_meters is None:
+        return
+    await DbProject.update(
+        db,
+        project_id,
+        ProjectUpdate(
+            geometry_precision=data.geometry_precision,
+            simplify_tolerance_meters=data.simplify_tolerance_meters,
+        ),
+    )
+
+
 async def _save_requested_data_extract(
     db: AsyncConnection,
     project_id: int,
@@ -115,19 +169,28 @@ async def _save_requested_data_extract(
 ) -> None:
     """Persist either provided GeoJSON, downloaded OSM data, or an empty collection."""
     if data.geojson is not None:
-        await save_data_extract(db=db, project_id=project_id, geojson_data=data.geojson)
+        await save_data_extract(
+            db=db, project_id=project_id, geojson_data=data.geojson, extract_options={}
+        )
         await db.commit()
         return
 
     if data.osm_category is not None:
-        geojson = await download_osm_data(
-            db=db,
-            project_id=project_id,
+        extract_options = osm_extract_options(
             osm_category=data.osm_category.name,
             geom_type=data.geom_type.value,
             centroid=data.centroid,
+            tiled=data.tiled_extract,
+        )
+        geojson = await download_osm_data(
+            db=db, project_id=project_id, **extract_options
+        )
+        await save_data_extract(
+            db=db,
+            project_id=project_id,
+            geojson_data=geojson,
+            extract_options=extract_options,
         )
-        await save_data_extract(db=db, project_id=project_id, geojson_data=geojson)
         await db.commit()
         return
 
@@ -225,7 +288,7 @@ async def _finalize_project(
 @post(
     "/projects",
     dependencies={
-        "db": Provide(db_conn),
+        "db": Provide(background_db_conn),
     },
     status_code=status.HTTP_201_CREATED,
 )
@@ -248,8 +311,9 @@ async def api_create_project(
             hashtags=data.hashtags or [],
             user_sub=auth_user.sub,
         )
-        await db.commit()
         project_id = project.id
+        await _save_geometry_options(db, project_id, data)
+        await db.commit()
 
         xlsform_bytes = await _resolve_xlsform_bytes(db, data)
         await process_xlsform(
@@ -320,7 +384,7 @@ async def api_delete_project(
     await db.commit()
 
 
-@get("/projects", dependencies={"db": Provide(db_conn)})
+@get("/projects", dependencies={"db": Provide(db_conn_ro)})
 async def api_list_projects(db: AsyncConnection) -> list[dict]:
     """Public endpoint to list projects."""
     projects = await DbProject.all(db, skip=0, limit=100)
@@ -336,11 +400,26 @@ async def api_list_projects(db: AsyncConnection) -> list[dict]:
     ]
 
 
-@get("/projects/{project_id:int}", dependencies={"db": Provide(db_conn)})
+@get("/projects/within", dependencies={"db": Provide(db_conn_ro)})
+async def api_get_projects_within(
+    db: AsyncConnection,
+    bbox: str,
+    zoom: int = Parameter(ge=0, le=22),
+) -> dict:
+    """Public endpoint for project locations within a map viewport.
+
+    Returns project centroids as [id, lon, lat, status]. If there are too
+    many, nearby projects are grouped into clusters of [lon, lat, count],
+    sized by zoom.
+    """
+    return await get_projects_within(db, _parse_bbox(bbox), zoom)
+
+
+@get("/projects/{project_id:int}", dependencies={"db": Provide(db_conn_ro)})
 async def api_get_project(project_id: int, db: AsyncConnection) -> dict:
     """Public endpoint to get a single project."""
     try:
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(db, project_id, minimal=True)
     except KeyError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -359,6 +438,143 @@ async def api_get_project(project_id: int, db: AsyncConnection) -> dict:
     }
 
 
+@get("/projects/{project_id:int}/xlsform", dependencies={"db": Provide(db_conn)})
+async def api_get_project_xlsform(
+    request: Request, project_id: int, db: AsyncConnection
+) -> Response:
+    """Download the project XLSForm.
+
+    The ETag is the form digest, so clients can revalidate cheaply.
+    """
+    await api_key_required(request, db)
+    try:
+        project = await DbProject.one(db, project_id, minimal=True)
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_("Project (%(project_id)s) not found.")
+            % {"project_id": project_id},
+        ) from exc
+    if not project.xlsform_digest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_("Project (%(project_id)s) has no XLSForm.")
+            % {"project_id": project_id},
+        )
+
+    etag = f'"{project.xlsform_digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(
+            content=b"",
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers,
+        )
+
+    await project.load(db, "form")
+    headers["Content-Disposition"] = (
+        f"attachment; filename=project_{project_id}_form.xlsx"
+    )
+    return Response(
+        content=project.xlsform_content,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        headers=headers,
+    )
+
+
+async def _stored_geojson_response(
+    db: AsyncConnection, project_id: int, column: str
+) -> Response:
+    """Respond with a stored GeoJSON column, passing the JSON text through."""
+    try:
+        geojson = await DbProject.raw_geojson(db, project_id, column)
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_("Project (%(project_id)s) not found.")
+            % {"project_id": project_id},
+        ) from exc
+    if geojson is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=_("Project (%(project_id)s) has no data for this layer.")
+            % {"project_id": project_id},
+        )
+    return Response(content=geojson, media_type=GEOJSON_MEDIA_TYPE)
+
+
+@get(
+    "/projects/{project_id:int}/data-extract",
+    dependencies={"db": Provide(db_conn_ro)},
+)
+async def api_get_project_data_extract(
+    project_id: int, db: AsyncConnection
+) -> Response:
+    """Public endpoint to get the project data extract as GeoJSON."""
+    return await _stored_geojson_response(db, project_id, "data_extract_geojson")
+
+
+@get(
+    "/projects/{project_id:int}/task-areas",
+    dependencies={"db": Provide(db_conn_ro)},
+)
+async def api_get_project_task_areas(project_id: int, db: AsyncConnection) -> Response:
+    """Public endpoint to get the project task areas as GeoJSON.
+
+    An empty object means the project is not split into tasks.
+    """
+    return await _stored_geojson_response(db, project_id, "task_areas_geojson")
+
+
+@post(
+    "/projects/{project_id:int}/data-extract/refresh",
+    dependencies={"db": Provide(background_db_conn)},
+    status_code=status.HTTP_200_OK,
+)
+async def api_refresh_project_data_extract(
+    request: Request,
+    project_id: int,
+    db: AsyncConnection,
+    data: RefreshDataExtractRequest,
+) -> RefreshDataExtractResponse:
+    """Download the OSM data extract again, applying only the changes.
+
+    Features are matched by osm_id, and only new, changed and deleted ones
+    are pushed to the ODK `features` dataset, so mappers sync just those.
+    A refresh deleting too many features is refused (409) unless forced.
+    """
+    await api_key_required(request, db)
+    try:
+        result = await refresh_data_extract(db, project_id, force=data.force)
+    except ServiceError as exc:
+        raise _map_service_error(exc) from exc
+    return RefreshDataExtractResponse(**asdict(result))
+
+
+@get(
+    "/projects/{project_id:int}/data-extract/changes",
+    dependencies={"db": Provide(db_conn_ro)},
+)
+async def api_get_project_data_extract_changes(
+    project_id: int,
+    db: AsyncConnection,
+    limit: int = Parameter(default=1000, ge=1, le=10000),
+) -> list[dict]:
+    """Public endpoint for the OSM features changed by refreshes, newest first."""
+    changes = await DbDataExtractChange.all_for_project(db, project_id, limit)
+    return [
+        {
+            "osm_id": change.osm_id,
+            "change": change.change,
+            "old_version": change.old_version,
+            "new_version": change.new_version,
+            "refreshed_at": change.refreshed_at,
+        }
+        for change in changes
+    ]
+
+
 api_router = Router(
     path="/api/v1",
     tags=["api"],
@@ -366,6 +582,12 @@ api_router = Router(
         api_create_project,
         api_delete_project,
         api_list_projects,
+        api_get_projects_within,
         api_get_project,
+        api_get_project_xlsform,
+        api_get_project_data_extract,
+        api_get_project_task_areas,
+        api_refresh_project_data_extract,
+        api_get_project_data_extract_changes,
     ],
 )
@@ -52,6 +52,9 @@ from app.db.enums import (
 from app.db.models import DbProject, slugify
 from app.qfield.qfield_schemas import QFieldCloud
 
+# Decimal places beyond this are below float precision for coordinates
+MAX_GEOMETRY_PRECISION = 15
+
 
 class SplitFormData(BaseModel):
     """Form data for split square task split."""
@@ -61,6 +64,16 @@ class SplitFormData(BaseModel):
     extract_geojson: UploadFile | None = None
 
 
+def _normalize_osm_category(value):
+    """Accept internal preset keys as well as enum display values."""
+    if isinstance(value, str):
+        try:
+            return XLSFormType[value.strip().lower()]
+        except KeyError:
+            return value
+    return value
+
+
 class CreateProjectRequest(ODKCentral, QFieldCloud):
     """Single payload to create a complete project end-to-end."""
 
@@ -82,6 +95,8 @@ class CreateProjectRequest(ODKCentral, QFieldCloud):
     osm_category: XLSFormType | None = None
     geom_type: DbGeomType = DbGeomType.POLYGON
     centroid: bool = False
+    # Fetch the extract in tiles, for AOIs above the raw-data-api area limit
+    tiled_extract: bool = False
 
     algorithm: SplittingAlgorithm | None = None
     no_of_buildings: int = 10
@@ -92,18 +107,20 @@ class CreateProjectRequest(ODKCentral, QFieldCloud):
     include_railways: bool = True
     include_aeroways: bool = True
 
+    # Decimal places and simplification tolerance for saved geometries,
+    # defaulting to the GEOMETRY_* settings
+    geometry_precision: int | None = Field(
+        default=None, ge=0, le=MAX_GEOMETRY_PRECISION
+    )
+    simplify_tolerance_meters: float | None = Field(default=None, ge=0)
+
     cleanup: bool = False
 
     @field_validator("osm_category", mode="before")
     @classmethod
     def normalize_osm_category(cls, value):
         """Accept internal preset keys as well as enum display values."""
-        if isinstance(value, str):
-            try:
-                return XLSFormType[value.strip().lower()]
-            except KeyError:
-                return value
-        return value
+        return _normalize_osm_category(value)
 
     @model_validator(mode="after")
     def validate_xlsform_source(self):
@@ -128,6 +145,27 @@ class CreateProjectResponse(BaseModel):
     manager_password: str | None = None
 
 
+class RefreshDataExtractRequest(BaseModel):
+    """Options for a data extract refresh.
+
+    The OSM options stored when the extract was downloaded are reused.
+    """
+
+    # Apply even if more than DATA_EXTRACT_REFRESH_MAX_DELETED_RATIO of the
+    # OSM features would be deleted
+    force: bool = False
+
+
+class RefreshDataExtractResponse(BaseModel):
+    """Number of OSM features new, changed and deleted by a refresh."""
+
+    new: int
+    changed: int
+    deleted: int
+    unchanged: int
+    pushed: bool
+
+
 # ============================================================================
 # DTOs for endpoint responses
 # ============================================================================
@@ -141,6 +179,7 @@ class ProjectOut(DataclassDTO[DbProject]):
         exclude={
             "xlsform_content",  # Don't serialize binary XLSForm content
             "external_project_password_encrypted",  # Don't expose encrypted passwords
+            "search_vector",  # Internal search index
         },
     )
 
@@ -387,6 +426,8 @@ class ProjectUpdate(ProjectInBase, ODKCentral):
     data_extract_geojson: Optional[dict] = None
     # GeoJSON task areas/boundaries stored directly in database
     task_areas_geojson: Optional[dict] = None
+    # OSM options of the data extract ({} for uploaded data)
+    data_extract_options: Optional[dict] = None
 
     # Offline basemap workflow state
     basemap_stac_item_id: Optional[str] = None
@@ -397,3 +438,9 @@ class ProjectUpdate(ProjectInBase, ODKCentral):
     basemap_attach_status: Optional[str] = None
     basemap_attach_error: Optional[str] = None
     basemap_attach_updated_at: Optional[AwareDatetime] = None
+
+    # Geometry rounding and simplification when saving the extract and tasks
+    geometry_precision: Optional[int] = Field(
+        default=None, ge=0, le=MAX_GEOMETRY_PRECISION
+    )
+    simplify_tolerance_meters: Optional[float] = Field(default=None, ge=0)
@@ -24,8 +24,8 @@ and REST API routes. They accept typed arguments and raise domain exceptions
 
 import json
 import logging
+from asyncio import Semaphore, as_completed, create_task, gather, get_running_loop
 from asyncio import TimeoutError as AsyncTimeoutError
-from asyncio import get_running_loop
 from dataclasses import dataclass
 from functools import partial
 from io import BytesIO
@@ -41,22 +41,36 @@ from litestar.exceptions import HTTPException
 from osm_fieldwork.json_data_models import data_models_path
 from pg_nearest_city import AsyncNearestCity
 from psycopg import AsyncConnection
-from qfieldcloud_sdk.interfaces import QfcRequestException
 
 from app.central import central_crud, central_deps
 from app.central.central_schemas import ODKCentral
 from app.config import settings
-from app.db.enums import FieldMappingApp, ProjectStatus, XLSFormType
+from app.db.enums import (
+    ExtractChangeType,
+    FieldMappingApp,
+    ProjectStatus,
+    XLSFormType,
+)
 from app.db.languages_and_countries import countries
-from app.db.models import DbProject
+from app.db.models import DbDataExtractChange, DbProject
+from app.db.postgis_utils import reduce_featcol_precision
+from app.helpers.geojson_serializer import dumps
 from app.helpers.geometry_utils import (
     AREA_LIMIT_KM2,
+    FeatcolDiff,
     check_crs,
+    diff_featcol_by_osm_id,
     featcol_keep_single_geom_type,
+    filter_featcol_by_geom,
     geojson_area_km2,
+    osm_feature_id,
+    osm_feature_version,
     polygon_to_centroid,
+    split_geom_into_tiles,
 )
+from app.helpers.lazy_imports import qfc_interfaces
 from app.i18n import _
+from app.metrics import aiohttp_trace_config
 from app.projects import project_crud, project_deps, project_schemas
 from app.qfield.qfield_crud import create_qfield_project
 from app.qfield.qfield_deps import qfield_client
@@ -160,6 +174,30 @@ class QFieldFinalizeResult:
     manager_password: Optional[str]
 
 
+@dataclass(slots=True)
+class RefreshExtractResult:
+    """OSM feature changes found by a data extract refresh."""
+
+    new: int
+    changed: int
+    deleted: int
+    unchanged: int
+    # Whether the changes were pushed to the downstream app
+    pushed: bool
+
+
+def osm_extract_options(
+    osm_category: str, geom_type: str, centroid: bool, tiled: bool
+) -> dict:
+    """The download_osm_data options to store as a project data_extract_options."""
+    return {
+        "osm_category": osm_category,
+        "geom_type": geom_type,
+        "centroid": centroid,
+        "tiled": tiled,
+    }
+
+
 @dataclass(slots=True)
 class SplitAoiOptions:
     """Options that control AOI splitting."""
@@ -288,7 +326,7 @@ async def _delete_qfield_downstream_project(project: DbProject) -> str:
                 partial(client.delete_project, project.external_project_id),
             )
             return f"Deleted QFieldCloud project {project.external_project_id}."
-        except QfcRequestException as exc:
+        except qfc_interfaces.QfcRequestException as exc:
             status_code = exc.response.status_code
             if status_code == HTTP_STATUS_NOT_FOUND:
                 return (
@@ -316,7 +354,7 @@ async def delete_project_with_downstream(
     Field-TM project is preserved and a ``DownstreamDeleteError`` is raised.
     """
     try:
-        project = await DbProject.one(db, project_id)
+        project = await DbProject.one(db, project_id, minimal=True)
     except KeyError as exc:
         raise NotFoundError(f"Project ({project_id}) not found.") from exc
 
@@ -573,17 +611,8 @@ async def process_xlsform(
     form_name = f"FTM_Project_{project.id}"
 
     # Validate and process the form
-    await central_crud.validate_and_update_user_xlsform(
-        xlsform=xlsform_bytes,
-        form_name=form_name,
-        need_verification_fields=need_verification_fields,
-        include_photo_upload=include_photo_upload,
-        mandatory_photo_upload=mandatory_photo_upload,
-        default_language=default_language,
-        use_odk_collect=use_odk_collect,
-    )
-
-    xform_id, project_xlsform = await central_crud.append_fields_to_user_xlsform(
+    xform_id, project_xlsform, _ = await central_crud.transform_user_xlsform(
+        db,
         xlsform=xlsform_bytes,
         form_name=form_name,
         need_verification_fields=need_verification_fields,
@@ -643,7 +672,9 @@ def _configure_extract_sources(
 async def _download_extract_geojson(download_url: str) -> dict:
     """Download and parse the GeoJSON payload from the raw-data extract URL."""
     async with (
-        aiohttp.ClientSession() as session,
+        aiohttp.ClientSession(
+            trace_configs=[aiohttp_trace_config("raw-data-api")]
+        ) as session,
         session.get(download_url) as response,
     ):
         if not response.ok:
@@ -676,12 +707,151 @@ def _validate_downloaded_geojson(geojson_data: dict) -> dict:
     return geojson_data
 
 
+def _merge_tile_features(
+    features: list[dict],
+    tile_features: list[dict],
+    seen_ids: set,
+) -> int:
+    """Append features from one extract tile, skipping duplicate OSM ids.
+
+    Features straddling a tile edge are returned by every tile they intersect,
+    so only the first copy is kept. Features without an osm_id are always kept.
+
+    Returns:
+        The number of features added.
+    """
+    added = 0
+    for feature in tile_features:
+        osm_id = (feature.get("properties") or {}).get("osm_id")
+        if osm_id is not None:
+            if osm_id in seen_ids:
+                continue
+            seen_ids.add(osm_id)
+        features.append(feature)
+        added += 1
+    return added
+
+
+async def _fetch_extract_geojson(
+    project_id: int,
+    aoi_featcol: dict,
+    geom_type: str,
+    config_data: dict,
+    centroid: bool,
+    use_st_within: bool = True,
+) -> dict:
+    """Generate a raw-data-api extract for an AOI and download the GeoJSON.
+
+    With use_st_within False, features intersecting the AOI are included,
+    not only those fully within it.
+    """
+    try:
+        result = await project_crud.generate_data_extract(
+            project_id,
+            aoi_featcol,
+            geom_type,
+            config_data,
+            centroid,
+            use_st_within,
+        )
+    except HTTPException as exc:
+        if (
+            exc.status_code == status.HTTP_400_BAD_REQUEST
+            and "Failed to generate data extract from the raw data API."
+            in str(exc.detail)
+        ):
+            raise ServiceError(
+                "OSM data extraction timed out or failed upstream. "
+                "Please reduce the AOI size or choose Collect New Data Only."
+            ) from exc
+        raise
+    except AsyncTimeoutError as exc:
+        raise ServiceError(
+            "OSM data extraction timed out. "
+            "Please reduce the AOI size or choose Collect New Data Only."
+        ) from exc
+
+    # Download GeoJSON from URL
+    download_url = result.data.get("download_url")
+    if not download_url:
+        raise ServiceError("Failed to get download URL from data extract.")
+
+    return await _download_extract_geojson(download_url)
+
+
+async def _fetch_tiled_extract_geojson(
+    db: AsyncConnection,
+    project_id: int,
+    outline: dict,
+    geom_type: str,
+    config_data: dict,
+    centroid: bool,
+) -> dict:
+    """Fetch an extract tile by tile, for AOIs above the raw-data-api limit.
+
+    Tiles are requested concurrently (bounded by RAW_DATA_API_TILE_CONCURRENCY)
+    and merged in memory as each completes. Tiles are fetched by intersection,
+    so features crossing a tile edge are returned by each tile they touch:
+    these are de-duplicated by osm_id, then the merged extract is filtered
+    against the whole AOI, as for an untiled extract.
+    """
+    tiles = await split_geom_into_tiles(db, outline, settings.RAW_DATA_API_MAX_AREA_KM2)
+    if not tiles:
+        raise ValidationError("Could not split the project area into extract tiles.")
+    log.info(
+        f"Fetching data extract for project {project_id} in {len(tiles)} tiles "
+        f"(max {settings.RAW_DATA_API_MAX_AREA_KM2} km² each)"
+    )
+
+    semaphore = Semaphore(max(1, settings.RAW_DATA_API_TILE_CONCURRENCY))
+
+    async def fetch_tile(tile_geom: dict) -> dict:
+        async with semaphore:
+            return await _fetch_extract_geojson(
+                project_id,
+                _as_aoi_feature_collection(tile_geom),
+                geom_type,
+                config_data,
+                centroid,
+                use_st_within=False,
+            )
+
+    tasks = [create_task(fetch_tile(tile_geom)) for tile_geom in tiles]
+    features: list[dict] = []
+    seen_ids: set = set()
+    try:
+        for tile_number, next_tile in enumerate(as_completed(tasks), start=1):
+            tile_geojson = await next_tile
+            tile_features = tile_geojson.get("features") or []
+            if not isinstance(tile_features, list):
+                raise ServiceError("Downloaded GeoJSON has invalid feature structure.")
+            added = _merge_tile_features(features, tile_features, seen_ids)
+            log.debug(
+                f"Merged extract tile {tile_number}/{len(tiles)} for project "
+                f"{project_id}: {added} of {len(tile_features)} features added"
+            )
+    finally:
+        # Cancel outstanding tiles if any tile failed, retrieving their errors
+        for task in tasks:
+            task.cancel()
+        await gather(*tasks, return_exceptions=True)
+
+    # Lines are extracted by intersection, see generate_data_extract
+    return await filter_featcol_by_geom(
+        db,
+        {"type": "FeatureCollection", "features": features},
+        outline,
+        within=geom_type != "line",
+    )
+
+
 async def download_osm_data(
     db: AsyncConnection,
     project_id: int,
     osm_category: str = "buildings",
     geom_type: str = "POLYGON",
     centroid: bool = False,
+    tiled: bool = False,
 ) -> dict:
     """Download OSM data extract for a project and return the GeoJSON.
 
@@ -691,6 +861,8 @@ async def download_osm_data(
         osm_category: OSM category (e.g. buildings, highways).
         geom_type: Geometry type (POLYGON, POINT, POLYLINE).
         centroid: Whether to generate centroids.
+        tiled: Split the AOI into tiles under the raw-data-api area limit,
+            fetching them concurrently. Required for large AOIs.
 
     Returns:
         A validated GeoJSON FeatureCollection dict.
@@ -705,12 +877,6 @@ async def download_osm_data(
     if not outline:
         raise NotFoundError("Project outline not found.")
 
-    # Convert outline to FeatureCollection format
-    aoi_featcol = {
-        "type": "FeatureCollection",
-        "features": [{"type": "Feature", "geometry": outline, "properties": {}}],
-    }
-
     with open(_extract_config_path(osm_category), encoding="utf-8") as f:
         config_data = json.load(f)
     config_data, geom_type_lower = _configure_extract_sources(
@@ -720,38 +886,23 @@ async def download_osm_data(
     )
 
     # Generate data extract
-    try:
-        result = await project_crud.generate_data_extract(
+    if tiled:
+        geojson_data = await _fetch_tiled_extract_geojson(
+            db,
             project.id,
-            aoi_featcol,
+            outline,
+            geom_type_lower,
+            config_data,
+            centroid,
+        )
+    else:
+        geojson_data = await _fetch_extract_geojson(
+            project.id,
+            _as_aoi_feature_collection(outline),
             geom_type_lower,
             config_data,
             centroid,
-            True,
         )
-    except HTTPException as exc:
-        if (
-            exc.status_code == status.HTTP_400_BAD_REQUEST
-            and "Failed to generate data extract from the raw data API."
-            in str(exc.detail)
-        ):
-            raise ServiceError(
-                "OSM data extraction timed out or failed upstream. "
-                "Please reduce the AOI size or choose Collect New Data Only."
-            ) from exc
-        raise
-    except AsyncTimeoutError as exc:
-        raise ServiceError(
-            "OSM data extraction timed out. "
-            "Please reduce the AOI size or choose Collect New Data Only."
-        ) from exc
-
-    # Download GeoJSON from URL
-    download_url = result.data.get("download_url")
-    if not download_url:
-        raise ServiceError("Failed to get download URL from data extract.")
-
-    geojson_data = await _download_extract_geojson(download_url)
     geojson_data = _validate_downloaded_geojson(geojson_data)
 
     # Validate and clean GeoJSON
@@ -779,17 +930,61 @@ async def download_osm_data(
     return featcol_single_geom_type
 
 
+async def _reduce_saved_geometries(
+    db: AsyncConnection,
+    project_id: int,
+    featcol: dict,
+    coverage: bool,
+) -> dict:
+    """Round and simplify geometries with the project settings, before saving.
+
+    Done once here, so ODK entities, QField layers and map previews all get
+    the smaller payload. Task areas are a coverage, kept gap-free.
+    """
+    try:
+        project = await DbProject.one(db, project_id, minimal=True)
+    except KeyError as exc:
+        raise NotFoundError(f"Project ({project_id}) not found.") from exc
+
+    precision = project.geometry_precision
+    if precision is None:
+        precision = settings.GEOMETRY_PRECISION
+    tolerance = project.simplify_tolerance_meters
+    if tolerance is None:
+        tolerance = settings.GEOMETRY_SIMPLIFY_TOLERANCE_METERS
+    if precision is None and not tolerance:
+        return featcol
+
+    reduced = await reduce_featcol_precision(
+        db, featcol, precision, tolerance, coverage=coverage
+    )
+    # Encoding both is costly for large extracts, so only done to debug
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            f"Reduced {'task areas' if coverage else 'data extract'} of project "
+            f"{project_id} from {len(dumps(featcol))} to {len(dumps(reduced))} "
+            f"bytes (precision {precision}, tolerance {tolerance}m)"
+        )
+    return reduced
+
+
 async def save_data_extract(
     db: AsyncConnection,
     project_id: int,
     geojson_data: dict,
+    extract_options: Optional[dict] = None,
 ) -> int:
     """Save a GeoJSON data extract to the database.
 
+    Geometries are first rounded and simplified with the project settings.
+
     Args:
         db: Database connection.
         project_id: The project ID.
         geojson_data: The GeoJSON FeatureCollection dict to save.
+        extract_options: The OSM options the extract was downloaded with
+            (see data_extract_options), reused to refresh it. {} for
+            uploaded data, None to keep the stored options.
 
     Returns:
         Number of features saved.
@@ -806,6 +1001,9 @@ async def save_data_extract(
 
     # Validate CRS
     await check_crs(geojson_data)
+    geojson_data = await _reduce_saved_geometries(
+        db, project_id, geojson_data, coverage=False
+    )
 
     # Save to database
     await DbProject.update(
@@ -813,6 +1011,7 @@ async def save_data_extract(
         project_id,
         project_schemas.ProjectUpdate(
             data_extract_geojson=geojson_data,
+            data_extract_options=extract_options,
             # Reset split status when a new extract is accepted.
             task_areas_geojson=None,
         ),
@@ -826,6 +1025,170 @@ async def save_data_extract(
     return feature_count
 
 
+def _extract_change_rows(
+    project_id: int, diff: FeatcolDiff
+) -> list[DbDataExtractChange]:
+    """The changes to record for a refresh, for features with an osm_id."""
+    changes = [
+        DbDataExtractChange(
+            project_id=project_id,
+            osm_id=osm_feature_id(feature),
+            change=ExtractChangeType.NEW,
+            new_version=osm_feature_version(feature),
+        )
+        for feature in diff.new
+    ]
+    changes.extend(
+        DbDataExtractChange(
+            project_id=project_id,
+            osm_id=osm_feature_id(new_feature),
+            change=ExtractChangeType.CHANGED,
+            old_version=osm_feature_version(old_feature),
+            new_version=osm_feature_version(new_feature),
+        )
+        for old_feature, new_feature in diff.changed
+    )
+    changes.extend(
+        DbDataExtractChange(
+            project_id=project_id,
+            osm_id=osm_feature_id(feature),
+            change=ExtractChangeType.DELETED,
+            old_version=osm_feature_version(feature),
+        )
+        for feature in diff.deleted
+    )
+    return [change for change in changes if change.osm_id is not None]
+
+
+async def _push_extract_changes_to_odk(project: DbProject, diff: FeatcolDiff) -> None:
+    """Create, update and delete only the changed `features` entities.
+
+    Entities are matched by osm_id. New entities get the default style,
+    while changed ones keep theirs, e.g. as set by mappers.
+    """
+    upserts = [*diff.new, *(new_feature for _, new_feature in diff.changed)]
+    entities_list = await central_crud.task_geojson_dict_to_entity_values(
+        {"type": "FeatureCollection", "features": upserts},
+        additional_features=True,
+    )
+    _apply_default_entity_style(entities_list[: len(diff.new)])
+
+    counts = await central_crud.push_entity_changes(
+        project.get_odk_credentials(),
+        project.external_project_id,
+        "osm_id",
+        entities_list,
+        [osm_feature_id(feature) for feature in diff.deleted],
+    )
+    log.info(
+        f"Pushed data extract changes to ODK project "
+        f"{project.external_project_id}: {counts}"
+    )
+
+
+async def refresh_data_extract(
+    db: AsyncConnection,
+    project_id: int,
+    force: bool = False,
+) -> RefreshExtractResult:
+    """Download the OSM data extract again, applying only what changed.
+
+    The extract is downloaded with the options stored when it was first
+    downloaded, and compared with the stored one by osm_id. Only new,
+    changed and deleted features are pushed to the ODK `features` dataset
+    of a finalized project, then the new extract and the list of changes
+    are saved. Task areas are kept.
+
+    QField projects are not pushed to, as their features layer is generated
+    by the QGIS wrapper without the OSM ids.
+
+    Args:
+        db: Database connection.
+        project_id: The project ID.
+        force: Apply the refresh even if it deletes more than
+            DATA_EXTRACT_REFRESH_MAX_DELETED_RATIO of the OSM features.
+
+    Returns:
+        The number of features new, changed, deleted and unchanged.
+
+    Raises:
+        NotFoundError: If the project does not exist.
+        ValidationError: If the stored extract was not downloaded from OSM.
+        ConflictError: If too many features would be deleted, without force.
+        ServiceError: If data extraction fails.
+    """
+    try:
+        project = await DbProject.one(
+            db, project_id, minimal=True, include=("extract",)
+        )
+    except KeyError as exc:
+        raise NotFoundError(f"Project ({project_id}) not found.") from exc
+
+    old_features = (project.data_extract_geojson or {}).get("features") or []
+    old_osm_count = sum(
+        1 for feature in old_features if osm_feature_id(feature) is not None
+    )
+    if not project.data_extract_options or not old_osm_count:
+        raise ValidationError(
+            "The data extract was not downloaded from OSM, so cannot be "
+            "refreshed. Download OSM data for the project first."
+        )
+
+    new_featcol = await download_osm_data(
+        db, project_id, **project.data_extract_options
+    )
+    new_featcol = await _reduce_saved_geometries(
+        db, project_id, new_featcol, coverage=False
+    )
+
+    diff = diff_featcol_by_osm_id(project.data_extract_geojson, new_featcol)
+    result = RefreshExtractResult(
+        new=len(diff.new),
+        changed=len(diff.changed),
+        deleted=len(diff.deleted),
+        unchanged=diff.unchanged,
+        pushed=False,
+    )
+    log.info(
+        f"Refreshed data extract of project {project_id}: {result.new} new, "
+        f"{result.changed} changed, {result.deleted} deleted, "
+        f"{result.unchanged} unchanged features"
+    )
+    if not (diff.new or diff.changed or diff.deleted):
+        return result
+
+    max_deleted = settings.DATA_EXTRACT_REFRESH_MAX_DELETED_RATIO * old_osm_count
+    if not force and len(diff.deleted) > max_deleted:
+        raise ConflictError(
+            f"The refresh would delete {len(diff.deleted)} of {old_osm_count} "
+            "OSM features, so was not applied. Check the extract options, "
+            "or refresh again with force to apply it."
+        )
+
+    # Push before saving, so a failed push is retried by the next refresh
+    if project.field_mapping_app == FieldMappingApp.ODK and project.external_project_id:
+        await _push_extract_changes_to_odk(project, diff)
+        result.pushed = True
+
+    # Uploaded features without an osm_id are not in OSM, so are kept
+    uploaded_features = [
+        feature for feature in old_features if osm_feature_id(feature) is None
+    ]
+    await DbProject.update(
+        db,
+        project_id,
+        project_schemas.ProjectUpdate(
+            data_extract_geojson={
+                **new_featcol,
+                "features": [*new_featcol["features"], *uploaded_features],
+            }
+        ),
+    )
+    await DbDataExtractChange.create_many(db, _extract_change_rows(project_id, diff))
+    await db.commit()
+    return result
+
+
 async def _save_empty_task_areas(db: AsyncConnection, project_id: int) -> dict:
     """Persist the no-split sentinel value and return it."""
     await DbProject.update(
@@ -1033,6 +1396,9 @@ async def save_task_areas(
 ) -> int:
     """Save task split results to the database.
 
+    Geometries are first rounded and simplified with the project settings,
+    keeping adjacent task areas gap-free.
+
     Args:
         db: Database connection.
         project_id: The project ID.
@@ -1050,6 +1416,9 @@ async def save_task_areas(
     # Validate CRS if not empty
     if tasks_geojson and tasks_geojson.get("features"):
         await check_crs(tasks_geojson)
+        tasks_geojson = await _reduce_saved_geometries(
+            db, project_id, tasks_geojson, coverage=True
+        )
 
     await DbProject.update(
         db,
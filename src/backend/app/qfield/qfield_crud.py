@@ -31,30 +31,29 @@ from io import BytesIO
 from pathlib import Path
 from random import getrandbits
 from secrets import token_urlsafe
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
 from aiohttp import ClientSession, ClientTimeout
 from litestar import status_codes as status
 from litestar.exceptions import HTTPException
 from osm_fieldwork.enums import DbGeomType
-from osm_fieldwork.update_xlsform import modify_form_for_qfield
 from psycopg import AsyncConnection
-from qfieldcloud_sdk.interfaces import QfcRequestException
-from qfieldcloud_sdk.sdk import (
-    FileTransferType,
-    OrganizationMemberRole,
-    ProjectCollaboratorRole,
-)
 
 from app.config import decrypt_value, encrypt_value, settings
 from app.db.models import DbProject
+from app.helpers.geojson_serializer import dumps_str
+from app.helpers.lazy_imports import qfc_interfaces, qfc_sdk, update_xlsform
 from app.i18n import _
+from app.metrics import aiohttp_trace_config
 from app.projects.project_schemas import ProjectUpdate
 from app.qfield.qfield_deps import qfield_client
 from app.qfield.qfield_schemas import QFieldCloud
 from app.qfield.qfield_utils import resolve_backend_qfc_url
 
+if TYPE_CHECKING:
+    from qfieldcloud_sdk.sdk import ProjectCollaboratorRole
+
 log = logging.getLogger(__name__)
 
 # Timeout for QGIS wrapper HTTP calls (project generation can be slow)
@@ -138,6 +137,19 @@ def _extract_geometry(geojson_obj: dict) -> Optional[dict]:
     return None
 
 
+async def modify_form_for_qfield(
+    custom_form: BytesIO,
+    geom_layer_type: DbGeomType = DbGeomType.POINT,
+    default_language: Optional[str] = None,
+) -> tuple[Optional[str], BytesIO]:
+    """Adapt an XLSForm for QField, importing the form tooling on first use."""
+    return await update_xlsform.modify_form_for_qfield(
+        custom_form,
+        geom_layer_type=geom_layer_type,
+        default_language=default_language,
+    )
+
+
 def _dominant_geom_type(data_extract: Optional[dict]) -> DbGeomType:
     """Determine the dominant geometry type from a FeatureCollection."""
     if not data_extract or not isinstance(data_extract, dict):
@@ -581,7 +593,7 @@ async def attach_basemap_to_qfield_project(
                     partial(
                         client.upload_files,
                         project_id=project.external_project_id,
-                        upload_type=FileTransferType.PROJECT,
+                        upload_type=qfc_sdk.FileTransferType.PROJECT,
                         project_path=upload_dir,
                         filter_glob="*",
                         throw_on_error=True,
@@ -631,8 +643,8 @@ async def _insert_qgis_job(
             {
                 "job_id": job_id,
                 "xlsform": xlsform,
-                "features": json.dumps(features),
-                "tasks": json.dumps(tasks),
+                "features": dumps_str(features),
+                "tasks": dumps_str(tasks),
                 "operation": operation,
                 "project_id": project_id,
                 "basemap_url": basemap_url,
@@ -702,7 +714,10 @@ async def _call_qgis_wrapper(
     log.info("Calling QGIS wrapper at %s for project '%s'", qgis_url, title)
 
     async with (
-        ClientSession(timeout=QGIS_REQUEST_TIMEOUT) as session,
+        ClientSession(
+            timeout=QGIS_REQUEST_TIMEOUT,
+            trace_configs=[aiohttp_trace_config("qgis")],
+        ) as session,
         session.post(f"{qgis_url}{endpoint}", json=payload) as response,
     ):
         body = await response.text()
@@ -777,7 +792,7 @@ async def _create_qfc_user(username: str, password: str, client) -> bool:
         )
         log.info("QFC user '%s' created or already exists", username)
         return True
-    except QfcRequestException as exc:
+    except qfc_interfaces.QfcRequestException as exc:
         status_code = exc.response.status_code
         if status_code in (
             status.HTTP_404_NOT_FOUND,
@@ -849,7 +864,7 @@ async def _upload_to_qfieldcloud(
                 partial(
                     client.upload_files,
                     project_id=api_project_id,
-                    upload_type=FileTransferType.PROJECT,
+                    upload_type=qfc_sdk.FileTransferType.PROJECT,
                     project_path=final_project_dir,
                     filter_glob="*",
                     throw_on_error=True,
@@ -885,7 +900,7 @@ async def _upload_to_qfieldcloud(
             api_project_id=api_project_id,
             api_project_owner=api_project_owner,
             username=f"ftm_manager_{project.id}",
-            role=ProjectCollaboratorRole.MANAGER,
+            role=qfc_sdk.ProjectCollaboratorRole.MANAGER,
             role_label="manager",
         )
         mapper_username, mapper_password = await _provision_project_user(
@@ -894,7 +909,7 @@ async def _upload_to_qfieldcloud(
             api_project_id=api_project_id,
             api_project_owner=api_project_owner,
             username=f"ftm_mapper_{project.id}",
-            role=ProjectCollaboratorRole.EDITOR,
+            role=qfc_sdk.ProjectCollaboratorRole.EDITOR,
             role_label="mapper",
         )
         if not manager_username:
@@ -941,7 +956,7 @@ async def _provision_project_user(
     api_project_id: str,
     api_project_owner: str,
     username: str,
-    role: ProjectCollaboratorRole,
+    role: "ProjectCollaboratorRole",
     role_label: str,
 ) -> tuple[Optional[str], Optional[str]]:
     """Create a QFieldCloud user and add them to the project.
@@ -1033,7 +1048,7 @@ async def _ensure_org_membership(
             client.add_organization_member,
             organization,
             username,
-            OrganizationMemberRole.MEMBER,
+            qfc_sdk.OrganizationMemberRole.MEMBER,
             False,
         ),
     )
@@ -1129,7 +1144,7 @@ async def add_qfc_project_collaborator(
     client,
     qfc_project_id: str,
     username: str,
-    role: ProjectCollaboratorRole,
+    role: "ProjectCollaboratorRole",
 ) -> None:
     """Add a user as a collaborator to a QFieldCloud project.
 
@@ -1178,7 +1193,7 @@ async def add_qfc_project_collaborator(
             None,
             partial(client.add_project_collaborator, qfc_project_id, username, role),
         )
-    except QfcRequestException as exc:
+    except qfc_interfaces.QfcRequestException as exc:
         status_code = exc.response.status_code
         if status_code == status.HTTP_404_NOT_FOUND:
             raise HTTPException(
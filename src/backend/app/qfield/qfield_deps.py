@@ -24,9 +24,9 @@ from contextlib import asynccontextmanager
 from functools import partial
 from typing import Optional
 
-from qfieldcloud_sdk.sdk import Client
-
 from app.config import settings
+from app.helpers.lazy_imports import qfc_sdk
+from app.metrics import instrument_requests_session
 from app.qfield.qfield_schemas import QFieldCloud
 from app.qfield.qfield_utils import normalise_qfc_url, resolve_backend_qfc_url
 
@@ -83,8 +83,9 @@ async def qfield_client(creds: Optional[QFieldCloud] = None):
     loop = get_running_loop()
     login_client = await loop.run_in_executor(
         None,
-        partial(Client, url=qfc_url),
+        partial(qfc_sdk.Client, url=qfc_url),
     )
+    instrument_requests_session(login_client.session, "qfc")
 
     try:
         # Authenticate to obtain a session token
@@ -99,8 +100,9 @@ async def qfield_client(creds: Optional[QFieldCloud] = None):
         # Build a fresh client with the token (avoids credential leakage)
         authed_client = await loop.run_in_executor(
             None,
-            partial(Client, url=qfc_url, token=login_client.token),
+            partial(qfc_sdk.Client, url=qfc_url, token=login_client.token),
         )
+        instrument_requests_session(authed_client.session, "qfc")
         # Attach the username so callers can resolve project ownership
         authed_client.username = qfc_user
         yield authed_client
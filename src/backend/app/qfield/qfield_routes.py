@@ -21,11 +21,11 @@ from litestar import Request, Router, post
 from litestar import status_codes as status
 from litestar.di import Provide
 from psycopg import AsyncConnection
-from qfieldcloud_sdk.sdk import ProjectCollaboratorRole
 
 from app.auth.api_key import api_key_required
 from app.auth.auth_deps import public_endpoint
 from app.db.database import db_conn
+from app.helpers.lazy_imports import qfc_sdk
 from app.qfield import qfield_schemas
 from app.qfield.qfield_crud import add_qfc_project_collaborator, qfc_credentials_test
 from app.qfield.qfield_deps import qfield_client
@@ -67,7 +67,7 @@ async def qfc_add_collaborator(
     Handles org-owned projects automatically.
     """
     await api_key_required(request, db)
-    role = ProjectCollaboratorRole(data.role)
+    role = qfc_sdk.ProjectCollaboratorRole(data.role)
     async with qfield_client() as client:
         await add_qfc_project_collaborator(client, qfc_project_id, data.username, role)
 
@@ -33,6 +33,7 @@ from area_splitter.db import (
     create_connection,
     create_tables,
     drop_tables,
+    geojson_dumps,
     insert_geom,
 )
 
@@ -487,9 +488,9 @@ class AreaSplitter:
                     "type": "Polygon",
                     "coordinates": [[[x, y], [x2, y], [x2, y2], [x, y2], [x, y]]],
                 }
-                boxes.append(json.dumps(box_geom))
+                boxes.append(geojson_dumps(box_geom))
 
-        extract_geom_strs = [json.dumps(g) for g in extract_geoms]
+        extract_geom_strs = [geojson_dumps(g) for g in extract_geoms]
         has_extract = bool(extract_geom_strs)
 
         cur.execute(
@@ -519,7 +520,7 @@ class AreaSplitter:
               )
             )
             """,
-            (json.dumps(self.aoi), boxes, has_extract, extract_geom_strs),
+            (geojson_dumps(self.aoi), boxes, has_extract, extract_geom_strs),
         )
 
         area_threshold = 0.35 * (meters**2)
@@ -622,7 +623,7 @@ class AreaSplitter:
         for feature in osm_extract["features"]:
             geometry = feature.get("geometry", {})
             geom_type = geometry.get("type", "")
-            geom_json = json.dumps(geometry)
+            geom_json = geojson_dumps(geometry)
             properties = feature.get("properties", {})
             tags = properties.get("tags", {}) if "tags" in properties else properties
             tags = _json_str_to_dict(tags).get("tags", _json_str_to_dict(tags))
@@ -811,7 +812,7 @@ class AreaSplitter:
         log.debug("Polygonising the FeatureCollection features via PostGIS")
         conn = create_connection(db)
         geom_dicts = self._feature_split_geometries(features)
-        geom_json_strs = [json.dumps(g) for g in geom_dicts]
+        geom_json_strs = [geojson_dumps(g) for g in geom_dicts]
 
         with conn.cursor() as cur:
             cur.execute(
@@ -837,7 +838,7 @@ class AreaSplitter:
                   ))
                 ) FROM dumped
                 """,
-                (json.dumps(self.aoi), geom_json_strs),
+                (geojson_dumps(self.aoi), geom_json_strs),
             )
             result = cur.fetchone()[0]
 
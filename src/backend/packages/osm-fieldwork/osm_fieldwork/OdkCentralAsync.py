@@ -50,6 +50,7 @@ class OdkCentral:
         url: Optional[str] = None,
         user: Optional[str] = None,
         passwd: Optional[str] = None,
+        trace_configs: Optional[list[aiohttp.TraceConfig]] = None,
     ):
         """A Class for accessing an ODK Central server via it's REST API.
 
@@ -57,7 +58,7 @@ class OdkCentral:
             url (str): The URL of the ODK Central
             user (str): The user's account name on ODK Central
             passwd (str):  The user's account password on ODK Central
-            session (str): Pass in an existing session for reuse.
+            trace_configs (list): aiohttp TraceConfigs for the client session.
 
         Returns:
             (OdkCentral): An instance of this class
@@ -80,6 +81,7 @@ class OdkCentral:
         # Base URL for the REST API
         self.version = "v1"
         self.base = f"{self.url}/{self.version}/"
+        self.trace_configs = trace_configs
 
     def __enter__(self):
         """Sync context manager not allowed."""
@@ -94,6 +96,7 @@ class OdkCentral:
         # Header enables persistent connection, creates a cookie for this session
         self.session = aiohttp.ClientSession(
             raise_for_status=True,
+            trace_configs=self.trace_configs,
         )
         await self.authenticate()
         return self
@@ -154,16 +157,18 @@ class OdkProject(OdkCentral):
         url: Optional[str] = None,
         user: Optional[str] = None,
         passwd: Optional[str] = None,
+        trace_configs: Optional[list[aiohttp.TraceConfig]] = None,
     ):
         """Args:
             url (str): The URL of the ODK Central
             user (str): The user's account name on ODK Central
             passwd (str):  The user's account password on ODK Central.
+            trace_configs (list): aiohttp TraceConfigs for the client session.
 
         Returns:
             (OdkProject): An instance of this object
         """
-        super().__init__(url, user, passwd)
+        super().__init__(url, user, passwd, trace_configs)
 
     async def listForms(self, projectId: int, metadata: bool = False):
         """Fetch a list of forms in a project on an ODK Central server.
@@ -203,16 +208,18 @@ class OdkForm(OdkCentral):
         url: Optional[str] = None,
         user: Optional[str] = None,
         passwd: Optional[str] = None,
+        trace_configs: Optional[list[aiohttp.TraceConfig]] = None,
     ) -> None:
         """Args:
             url (str): The URL of the ODK Central
             user (str): The user's account name on ODK Central
             passwd (str):  The user's account password on ODK Central.
+            trace_configs (list): aiohttp TraceConfigs for the client session.
 
         Returns:
             (OdkForm): An instance of this object.
         """
-        super().__init__(url, user, passwd)
+        super().__init__(url, user, passwd, trace_configs)
 
     async def listFormAttachments(self, projectId: int, xform: str):
         """Fetch a list of attachments listed for upload on a given form.
@@ -452,16 +459,18 @@ class OdkDataset(OdkCentral):
         url: Optional[str] = None,
         user: Optional[str] = None,
         passwd: Optional[str] = None,
+        trace_configs: Optional[list[aiohttp.TraceConfig]] = None,
     ) -> None:
         """Args:
             url (str): The URL of the ODK Central
             user (str): The user's account name on ODK Central
             passwd (str):  The user's account password on ODK Central.
+            trace_configs (list): aiohttp TraceConfigs for the client session.
 
         Returns:
             (OdkDataset): An instance of this object.
         """
-        super().__init__(url, user, passwd)
+        super().__init__(url, user, passwd, trace_configs)
 
     async def listDatasets(
         self,
@@ -26,6 +26,7 @@ import logging
 import re
 import sys
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Optional
@@ -252,13 +253,17 @@ def standardize_xlsform_sheets(xlsform: dict, default_language: str):
     return xlsform, list(label_cols)
 
 
-def normalize_with_meta(row, meta_df):
+def normalize_with_meta(df: pd.DataFrame, meta_df: pd.DataFrame) -> pd.DataFrame:
     """Replace metadata in user_question_df with metadata from meta_df of mandatory fields if exists."""
-    matching_meta = meta_df[meta_df["type"] == row[TYPE_COLUMN]]
-    if not matching_meta.empty:
-        for col in matching_meta.columns:
-            row[col] = matching_meta.iloc[0][col]
-    return row
+    is_meta = df[TYPE_COLUMN].isin(meta_df[TYPE_COLUMN])
+    if not is_meta.any():
+        return df
+
+    df = df.copy()
+    meta_by_type = meta_df.drop_duplicates(TYPE_COLUMN).set_index(TYPE_COLUMN)
+    for col in meta_by_type.columns:
+        df.loc[is_meta, col] = df.loc[is_meta, TYPE_COLUMN].map(meta_by_type[col])
+    return df
 
 
 def merge_dataframes(
@@ -295,10 +300,7 @@ def merge_dataframes(
     
     # Normalize user questions if meta_df provided
     if meta_df is not None:
-        user_question_df = user_question_df.apply(
-            lambda row: normalize_with_meta(row, meta_df), 
-            axis=1
-        )
+        user_question_df = normalize_with_meta(user_question_df, meta_df)
     
     # NOTE filter out 'end group' from duplicate check as they have empty NAME_COLUMN
     is_end_group = user_question_df["type"].isin(["end group", "end_group"])
@@ -403,50 +405,21 @@ async def _process_all_form_tabs(
     label_cols: list[str] = [],
     default_language: str | None = None,
 ) -> tuple[str, pd.DataFrame]:
-    if "label" in label_cols:
-        add_label = False
-        digitisation_df = pd.DataFrame([
-            add_label_translations(field, label_cols)
-            for field in digitisation_fields
-        ])
-        digitisation_choices_df = pd.DataFrame([
-            add_label_translations(choice)
-            for choice in digitisation_choices
-        ])
-        choices_df = pd.DataFrame([
-            add_label_translations(choice, label_cols)
-            for choice in get_choice_fields(use_odk_collect)
-        ])
-        photo_collection_df = pd.DataFrame([
-            add_label_translations(get_photo_collection_field(mandatory_photo_upload), label_cols),
-            add_label_translations(get_photo_repeat_field()),
-            add_label_translations(get_photo_repeat_end())
-        ])
-    else:
-        add_label = True
-        digitisation_df = pd.DataFrame([
-            add_label_translations(field)
-            for field in digitisation_fields
-        ])
-        digitisation_choices_df = pd.DataFrame([
-            add_label_translations(choice)
-            for choice in digitisation_choices
-        ])
-        choices_df = pd.DataFrame([
-            add_label_translations(choice)
-            for choice in get_choice_fields(use_odk_collect)
-        ])
-        photo_collection_df = pd.DataFrame([
-            add_label_translations(get_photo_collection_field(mandatory_photo_upload), label_cols),
-            add_label_translations(get_photo_repeat_field()),
-            add_label_translations(get_photo_repeat_end())
-        ])
+    add_label = "label" not in label_cols
 
     # Configure form settings
     xform_id = _configure_form_settings(custom_sheets, form_name, default_language)
 
     # Select appropriate form components based on target platform
-    form_components = _get_form_components(use_odk_collect, new_geom_type, need_verification_fields, choices_df, digitisation_df, digitisation_choices_df, photo_collection_df if include_photo_upload else None, label_cols)
+    form_components = get_form_components(
+        use_odk_collect,
+        new_geom_type,
+        need_verification_fields,
+        mandatory_photo_upload,
+        label_cols,
+    )
+    if not include_photo_upload:
+        form_components["photo_collection_df"] = None
 
     # Process survey sheet
     custom_sheets["survey"] = _process_survey_sheet(
@@ -648,17 +621,28 @@ async def modify_form_for_qfield(
     return (form_language, await write_xlsform(custom_sheets))
 
 
-def _get_form_components(
+@lru_cache(maxsize=64)
+def _build_form_components(
         use_odk_collect: bool,
         new_geom_type: DbGeomType,
         need_verification_fields: bool,
-        choices_df: pd.DataFrame,
-        digitisation_df: pd.DataFrame,
-        digitisation_choices_df: pd.DataFrame,
-        photo_collection_df: pd.DataFrame,
-        label_cols: list[str],
-    ) -> dict:
-    """Select appropriate form components based on target platform."""
+        mandatory_photo_upload: bool,
+        label_cols: tuple[str, ...],
+    ) -> dict[str, pd.DataFrame]:
+    """Build the Field-TM component DataFrames for one set of form options.
+
+    These only depend on the options and the label columns of the uploaded
+    form, so are built once and cached, rather than per form processed.
+    Do not modify the returned frames, use get_form_components instead.
+    """
+    # Plain 'label' columns get the English label only, else add translations
+    component_label_cols = list(label_cols) if "label" in label_cols else []
+
+    # NOTE the field dicts are copied, as add_label_translations modifies them
+    digitisation_df = pd.DataFrame([
+        add_label_translations(dict(field), component_label_cols)
+        for field in digitisation_fields
+    ])
     if use_odk_collect:
         # Here we modify digitisation_df to include the `new_feature` field
         # NOTE we set digitisation_correct to 'yes' if the user is drawing a new geometry
@@ -667,15 +651,47 @@ def _get_form_components(
         digitisation_df.loc[digitisation_correct_col, "read_only"] = "${new_feature} != ''"
 
     return {
-        "survey_df": create_survey_df(use_odk_collect, new_geom_type, need_verification_fields, label_cols),
-        "choices_df": choices_df,
+        "survey_df": create_survey_df(use_odk_collect, new_geom_type, need_verification_fields, list(label_cols)),
+        "choices_df": pd.DataFrame([
+            add_label_translations(dict(choice), component_label_cols)
+            for choice in get_choice_fields(use_odk_collect)
+        ]),
         "digitisation_df": digitisation_df,
-        "photo_collection_df": photo_collection_df,
-        "digitisation_choices_df": digitisation_choices_df,
-        "entities_df": create_entity_df(use_odk_collect)
+        "photo_collection_df": pd.DataFrame([
+            add_label_translations(get_photo_collection_field(mandatory_photo_upload), list(label_cols)),
+            add_label_translations(get_photo_repeat_field()),
+            add_label_translations(get_photo_repeat_end()),
+        ]),
+        "digitisation_choices_df": pd.DataFrame([
+            add_label_translations(dict(choice))
+            for choice in digitisation_choices
+        ]),
+        "entities_df": create_entity_df(use_odk_collect),
     }
 
 
+def get_form_components(
+        use_odk_collect: bool,
+        new_geom_type: DbGeomType,
+        need_verification_fields: bool,
+        mandatory_photo_upload: bool,
+        label_cols: list[str],
+    ) -> dict[str, pd.DataFrame]:
+    """Select appropriate form components based on target platform.
+
+    Returns copies of the cached component frames, safe to modify.
+    """
+    components = _build_form_components(
+        use_odk_collect,
+        new_geom_type,
+        need_verification_fields,
+        mandatory_photo_upload,
+        # Sorted so the cache key (and output column order) is deterministic
+        tuple(sorted(label_cols)),
+    )
+    return {name: df.copy() for name, df in components.items()}
+
+
 def _process_survey_sheet(
         existing_survey: pd.DataFrame, 
         survey_df: pd.DataFrame, 
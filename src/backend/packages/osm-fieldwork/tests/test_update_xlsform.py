@@ -25,11 +25,17 @@ from openpyxl import Workbook, load_workbook, worksheet
 import pandas as pd
 from pyxform.xls2xform import convert as xform_convert
 
+from osm_fieldwork.enums import DbGeomType
+from osm_fieldwork.form_components.digitisation_fields import digitisation_fields
+from osm_fieldwork.form_components.mandatory_fields import meta_df
 from osm_fieldwork.update_xlsform import (
+    _build_form_components,
     _configure_form_settings,
     _resolve_qfield_form_language,
     append_field_mapping_fields,
+    get_form_components,
     modify_form_for_qfield,
+    normalize_with_meta,
 )
 from osm_fieldwork.xlsforms import buildings, healthcare
 from osm_fieldwork.form_components.translations import INCLUDED_LANGUAGES
@@ -287,6 +293,38 @@ def test_configure_form_settings_keeps_default_language_as_scalar_string():
     assert default_language_value == "english(en)"
 
 
+def test_form_components_are_cached_and_returned_as_copies():
+    """Component frames are built once per options, and callers get copies."""
+    _build_form_components.cache_clear()
+    label_cols = ["label::french(fr)", "label::english(en)"]
+
+    first = get_form_components(True, DbGeomType.POINT, True, False, label_cols)
+    first["survey_df"].loc[:, "name"] = "modified"
+    # Label column order should not matter for the cache key
+    second = get_form_components(True, DbGeomType.POINT, True, False, label_cols[::-1])
+
+    assert _build_form_components.cache_info().hits == 1
+    assert "modified" not in second["survey_df"]["name"].tolist()
+    assert "warmup" in second["survey_df"]["name"].tolist()
+    # Building the frames must not leak labels into the shared field definitions
+    assert all("label::french(fr)" not in field for field in digitisation_fields)
+
+
+def test_normalize_with_meta_replaces_only_metadata_rows():
+    """Rows matching a metadata type take its name, other rows are untouched."""
+    user_df = pd.DataFrame(
+        {
+            "type": ["start", "text", "username"],
+            "name": ["my_start", "building_name", "user"],
+        }
+    )
+
+    normalized = normalize_with_meta(user_df, meta_df)
+
+    assert normalized["name"].tolist() == ["start", "building_name", "username"]
+    assert user_df["name"].tolist() == ["my_start", "building_name", "user"]
+
+
 def check_survey_sheet(workbook: Workbook) -> None:
     """Check the 'survey' sheet values and ensure no duplicates in 'name' column."""
     survey_sheet = get_sheet(workbook, "survey")
@@ -102,6 +102,12 @@ async def db():
         await close_db_connection_pool(litestar_api)
 
 
+@pytest.fixture
+def strict_query_budget(monkeypatch):
+    """Fail requests that exceed the DB query budget or repeat a query."""
+    monkeypatch.setattr(settings, "DB_QUERY_BUDGET_RAISE", True)
+
+
 @pytest_asyncio.fixture(scope="function")
 async def admin_user(db):
     """A test user."""
@@ -20,7 +20,8 @@
 import pytest
 from litestar.exceptions import HTTPException
 
-from app.auth.api_key import api_key_required, hash_api_key
+from app.auth.api_key import api_key_required, hash_api_key, last_used_buffer
+from app.auth.auth_cache import api_key_cache
 from app.db.models import DbApiKey, DbUser
 
 
@@ -104,6 +105,41 @@ async def test_api_key_required_validates_and_updates_last_used(
     assert exc_info.value.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_api_key_usage_is_cached_buffered_and_revocable(
+    client, db, ensure_api_keys_table
+):
+    """Repeat requests hit the cache and buffer last_used_at; revoke evicts."""
+    create_resp = await client.post(
+        "/api/v1/auth/api-keys", json={"name": "test-buffered-key"}
+    )
+    assert create_resp.status_code == 201
+    raw_key = create_resp.json()["api_key"]
+    key_hash = hash_api_key(raw_key)
+
+    # First use is written through, subsequent uses are buffered
+    await api_key_required(request=None, db=db, x_api_key=raw_key)
+    first_used = (await DbApiKey.get_by_hash(db, key_hash)).last_used_at
+    assert api_key_cache.get(key_hash) is not None
+
+    await api_key_required(request=None, db=db, x_api_key=raw_key)
+    assert len(last_used_buffer) >= 1
+    assert (await DbApiKey.get_by_hash(db, key_hash)).last_used_at == first_used
+
+    assert await last_used_buffer.flush(db) >= 1
+    assert (await DbApiKey.get_by_hash(db, key_hash)).last_used_at > first_used
+
+    # Revoking must take effect immediately, despite the cache
+    revoke_resp = await client.delete(
+        f"/api/v1/auth/api-keys/{create_resp.json()['id']}"
+    )
+    assert revoke_resp.status_code == 204
+    assert api_key_cache.get(key_hash) is None
+    with pytest.raises(HTTPException) as exc_info:
+        await api_key_required(request=None, db=db, x_api_key=raw_key)
+    assert exc_info.value.status_code == 401
+
+
 @pytest.mark.asyncio
 async def test_profile_me_returns_and_persists_authenticated_user(client, db):
     """GET /api/v1/auth/profile/me returns and persists the authenticated user."""
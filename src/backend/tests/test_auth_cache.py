@@ -0,0 +1,90 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for cached auth and role lookups."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.auth import auth_cache, roles
+from app.auth.auth_cache import TTLCache
+from app.db.enums import ProjectRole, ProjectStatus
+from app.db.models import DbUser
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    """Entries should be dropped once their TTL has passed."""
+    now = [100.0]
+    monkeypatch.setattr(auth_cache, "monotonic", lambda: now[0])
+
+    cache = TTLCache(ttl_seconds=5)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    now[0] += 6
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_oldest_entry_when_full():
+    """The size bound should evict the oldest entry first."""
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_disabled_with_zero_ttl():
+    """A zero TTL should disable caching entirely."""
+    cache = TTLCache(ttl_seconds=0)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+
+
+async def test_check_access_uses_cache_and_invalidation(monkeypatch):
+    """Cached access must avoid the DB, until invalidated for the project."""
+    monkeypatch.setattr(auth_cache, "access_cache", TTLCache(ttl_seconds=60))
+    monkeypatch.setattr(roles, "access_cache", auth_cache.access_cache)
+
+    user = SimpleNamespace(sub="osm|42", username="mapper", is_admin=False)
+    auth_cache.access_cache.set(
+        ("osm|42", 7),
+        roles.UserAccess(
+            user=DbUser(sub="osm|42", username="mapper", is_admin=False),
+            project_status=ProjectStatus.PUBLISHED,
+            project_role="MAPPER",
+        ),
+    )
+
+    # The Mock db has no usable cursor, so any query would fail
+    db = Mock()
+    db_user = await roles.check_access(user, db, project_id=7, role=ProjectRole.MAPPER)
+    assert db_user is not None
+    assert db_user.sub == "osm|42"
+    db.cursor.assert_not_called()
+
+    assert (
+        await roles.check_access(user, db, project_id=7, role=ProjectRole.PROJECT_ADMIN)
+        is None
+    )
+
+    auth_cache.invalidate_project_access(7)
+    assert auth_cache.access_cache.get(("osm|42", 7)) is None
@@ -1067,10 +1067,7 @@ async def test_run_basemap_attach_background_marks_ready(monkeypatch):
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    async def _connect(_):
-        return _ConnCtx()
-
-    monkeypatch.setattr(basemap_routes.AsyncConnection, "connect", _connect)
+    monkeypatch.setattr(basemap_routes, "pool_connection", lambda _name: _ConnCtx())
     monkeypatch.setattr(basemap_routes, "AUTOSTART_ATTACH_INITIAL_DELAY_SECONDS", 0)
     monkeypatch.setattr(basemap_routes, "AUTOSTART_ATTACH_MAX_RETRY_ATTEMPTS", 1)
     monkeypatch.setattr(
@@ -1108,14 +1105,11 @@ async def test_run_basemap_attach_background_retries_once_for_transient_failure(
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    async def _connect(_):
-        return _ConnCtx()
-
     attach_mock = AsyncMock(
         side_effect=[RuntimeError("Connection reset by peer"), None]
     )
 
-    monkeypatch.setattr(basemap_routes.AsyncConnection, "connect", _connect)
+    monkeypatch.setattr(basemap_routes, "pool_connection", lambda _name: _ConnCtx())
     monkeypatch.setattr(basemap_routes, "AUTOSTART_ATTACH_INITIAL_DELAY_SECONDS", 0)
     monkeypatch.setattr(basemap_routes, "AUTOSTART_ATTACH_MAX_RETRY_ATTEMPTS", 1)
     monkeypatch.setattr(
@@ -1150,10 +1144,7 @@ async def test_run_basemap_attach_background_marks_failed_with_error(monkeypatch
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-    async def _connect(_):
-        return _ConnCtx()
-
-    monkeypatch.setattr(basemap_routes.AsyncConnection, "connect", _connect)
+    monkeypatch.setattr(basemap_routes, "pool_connection", lambda _name: _ConnCtx())
     monkeypatch.setattr(basemap_routes, "AUTOSTART_ATTACH_INITIAL_DELAY_SECONDS", 0)
     monkeypatch.setattr(basemap_routes, "AUTOSTART_ATTACH_MAX_RETRY_ATTEMPTS", 1)
     monkeypatch.setattr(
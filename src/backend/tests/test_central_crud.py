@@ -9,9 +9,9 @@ from unittest.mock import patch
 import pytest
 from litestar.exceptions import HTTPException
 
-from app.central import central_crud
+from app.central import central_crud, central_deps
 from app.config import encrypt_value
-from app.db.models import DbProject
+from app.db.models import DbProject, DbXLSFormTransform
 
 TEST_DATA_DIR = Path(__file__).parent / "test_data"
 
@@ -140,6 +140,46 @@ async def test_create_entity_list_updates_existing_entity(odk_project):
     )
 
 
+async def test_push_entity_changes_matches_by_property(odk_project):
+    """push_entity_changes should only touch the given entities, by osm_id."""
+
+    def osm_entity(osm_id: str, version: str, **data) -> dict:
+        return {
+            "label": f"Feature {osm_id}",
+            "data": {"geometry": "g", "osm_id": osm_id, "version": version, **data},
+        }
+
+    await central_crud.create_entity_list(
+        odk_creds=None,
+        odk_id=odk_project,
+        properties=["geometry", "osm_id", "version", "status"],
+        dataset_name="features",
+        entities_list=[
+            osm_entity("1", "1", status="mapped"),
+            osm_entity("2", "1", status="unmapped"),
+        ],
+    )
+
+    counts = await central_crud.push_entity_changes(
+        None,
+        odk_project,
+        "osm_id",
+        [osm_entity("1", "2"), osm_entity("3", "1")],
+        ["2"],
+    )
+
+    assert counts == {"created": 1, "updated": 1, "deleted": 1}
+    async with central_deps.pyodk_client(None) as client:
+        table = client.entities.get_table(
+            entity_list_name="features", project_id=odk_project
+        )
+    rows = {row["osm_id"]: row for row in table["value"]}
+    assert set(rows) == {"1", "3"}
+    assert rows["1"]["version"] == "2"
+    # Properties not in the update are kept
+    assert rows["1"]["status"] == "mapped"
+
+
 # ---------------------------------------------------------------------------
 # Static / DB-only tests - no ODK connection needed
 # ---------------------------------------------------------------------------
@@ -495,3 +535,87 @@ async def test_create_project_manager_user_assignment_conflict_idempotent():
     assert username == "field-tm-manager-42@example.org"
     assert len(password) == 20
     assert fake_client.session.post_calls[1][0] == "projects/42/assignments/7/333"
+
+
+async def test_transform_user_xlsform_is_memoized(db, monkeypatch):
+    """A repeat transform of the same form and options should be a db lookup."""
+    xlsform_bytes = (TEST_DATA_DIR / "buildings.xls").read_bytes()
+    form_name = "FTM_Project_memoized"
+
+    xform_id, xlsform_io, xml_io = await central_crud.transform_user_xlsform(
+        db, BytesIO(xlsform_bytes), form_name=form_name
+    )
+
+    async def _fail_if_called(*_args, **_kwargs):
+        raise AssertionError("Cached transform should not be recomputed")
+
+    monkeypatch.setattr(central_crud, "append_fields_to_user_xlsform", _fail_if_called)
+    monkeypatch.setattr(central_crud, "read_and_test_xform", _fail_if_called)
+
+    cached = await central_crud.transform_user_xlsform(
+        db, BytesIO(xlsform_bytes), form_name=form_name
+    )
+    assert cached[0] == xform_id
+    assert cached[1].getvalue() == xlsform_io.getvalue()
+    assert cached[2].getvalue() == xml_io.getvalue()
+
+    # Different options are a different cache entry
+    with pytest.raises(AssertionError):
+        await central_crud.transform_user_xlsform(
+            db, BytesIO(xlsform_bytes), form_name=form_name, use_odk_collect=True
+        )
+    await db.rollback()
+
+
+async def test_xlsform_transform_cache_evicts_least_recently_used(db):
+    """Eviction should drop the least recently used entries beyond the bound."""
+    async with db.cursor() as cur:
+        await cur.execute("DELETE FROM xlsform_transform_cache;")
+    for index in range(3):
+        await DbXLSFormTransform.create(
+            db, f"test-evict-{index}", f"form-{index}", b"x" * 100, b"y" * 100
+        )
+    # NOW() is fixed within a transaction, so age the entries explicitly
+    async with db.cursor() as cur:
+        await cur.execute(
+            """
+            UPDATE xlsform_transform_cache
+            SET last_used_at = NOW() - (
+                (3 - right(cache_key, 1)::integer) * INTERVAL '1 minute'
+            );
+            """
+        )
+
+    # Each entry is 200 bytes, so only the two most recent fit in 400
+    assert await DbXLSFormTransform.evict(db, max_bytes=400) == 1
+    assert await DbXLSFormTransform.one(db, "test-evict-0") is None
+    assert await DbXLSFormTransform.one(db, "test-evict-2") is not None
+    await db.rollback()
+
+
+async def test_xlsform_transform_cache_hits_touch_last_used_at_rarely(db):
+    """Cache hits only update last_used_at once it is older than the interval."""
+    await DbXLSFormTransform.create(db, "test-touch", "form", b"x", b"y")
+    async with db.cursor() as cur:
+        await cur.execute(
+            """
+            UPDATE xlsform_transform_cache
+            SET last_used_at = NOW() - INTERVAL '1 minute'
+            WHERE cache_key = 'test-touch';
+            """
+        )
+    recent = (await DbXLSFormTransform.one(db, "test-touch")).last_used_at
+    # Recently used, so not written again
+    assert (await DbXLSFormTransform.one(db, "test-touch")).last_used_at == recent
+
+    async with db.cursor() as cur:
+        await cur.execute(
+            """
+            UPDATE xlsform_transform_cache
+            SET last_used_at = NOW() - INTERVAL '1 day'
+            WHERE cache_key = 'test-touch';
+            """
+        )
+    stale = (await DbXLSFormTransform.one(db, "test-touch")).last_used_at
+    assert (await DbXLSFormTransform.one(db, "test-touch")).last_used_at > stale
+    await db.rollback()
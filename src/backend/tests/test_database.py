@@ -0,0 +1,161 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for the named DB connection pools."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from time import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.config import settings
+from app.db import database
+from app.db.database import (
+    READ_YOUR_WRITES_COOKIE,
+    DbPool,
+    create_read_your_writes_middleware,
+    db_conn_ro,
+    pool_connection,
+)
+from app.main import api as litestar_api
+
+
+async def test_pools_are_sized_from_settings(db):
+    """Each named pool is opened with its own size."""
+    pools = litestar_api.state.db_pools
+    expected = set(DbPool)
+    if not settings.FTM_DB_REPLICA_URL:
+        expected.remove(DbPool.REPLICA)
+    assert set(pools) == expected
+    assert litestar_api.state.db_pool is pools[DbPool.INTERACTIVE]
+    assert pools[DbPool.BACKGROUND].max_size == settings.DB_POOL_BACKGROUND_MAX_SIZE
+
+    async with pool_connection(DbPool.BACKGROUND) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("SELECT 1;")
+            assert await cur.fetchone() == (1,)
+
+
+async def test_pool_connection_requires_open_pool():
+    """Background code fails clearly if the pools are not open."""
+    with pytest.raises(RuntimeError, match="not open"):
+        async with pool_connection(DbPool.MAINTENANCE):
+            pass
+
+
+class FakePool:
+    """Pool yielding its own name as the connection."""
+
+    def __init__(self, name):
+        """Name the pool."""
+        self.name = name
+
+    @asynccontextmanager
+    async def connection(self):
+        """Yield the pool name."""
+        yield self.name
+
+
+@pytest.mark.parametrize(
+    ("cookies", "lag_ok", "expected"),
+    [
+        ({}, True, "replica"),
+        ({}, False, "primary"),
+        ({READ_YOUR_WRITES_COOKIE: str(time() + 10)}, True, "primary"),
+        ({READ_YOUR_WRITES_COOKIE: str(time() - 10)}, True, "replica"),
+        ({READ_YOUR_WRITES_COOKIE: "invalid"}, True, "replica"),
+    ],
+)
+async def test_db_conn_ro_falls_back_to_primary(monkeypatch, cookies, lag_ok, expected):
+    """Reads use the replica unless it lags, or the client wrote recently."""
+    monkeypatch.setattr(database.replica_lag, "acceptable", Mock(return_value=lag_ok))
+    primary = FakePool("primary")
+    state = SimpleNamespace(
+        db_pool=primary,
+        db_pools={DbPool.INTERACTIVE: primary, DbPool.REPLICA: FakePool("replica")},
+    )
+
+    async for conn in db_conn_ro(Mock(cookies=cookies), state):
+        assert conn == expected
+
+
+async def test_db_conn_ro_without_replica_uses_primary():
+    """Without a replica configured, reads use the interactive pool."""
+    primary = FakePool("primary")
+    state = SimpleNamespace(db_pool=primary, db_pools={DbPool.INTERACTIVE: primary})
+
+    async for conn in db_conn_ro(Mock(cookies={}), state):
+        assert conn == "primary"
+
+
+async def test_replica_lag_check_does_not_block_requests(monkeypatch):
+    """Requests use the primary while the first lag check is still running."""
+    checked = asyncio.Event()
+
+    async def measure(primary, replica):
+        await checked.wait()
+        return 0.5
+
+    lag = database.ReplicaLag()
+    monkeypatch.setattr(lag, "_measure", measure)
+
+    assert not lag.acceptable(FakePool("primary"), FakePool("replica"))
+    probe = lag._probe
+    # A check is already running, so none is started
+    assert not lag.acceptable(FakePool("primary"), FakePool("replica"))
+    assert lag._probe is probe
+
+    checked.set()
+    await probe
+    assert lag.acceptable(FakePool("primary"), FakePool("replica"))
+
+
+@pytest.mark.parametrize(
+    ("method", "status_code", "sets_cookie"),
+    [
+        ("POST", 200, True),
+        ("DELETE", 204, True),
+        ("GET", 200, False),
+        ("POST", 500, False),
+    ],
+)
+async def test_read_your_writes_middleware(method, status_code, sets_cookie):
+    """Successful write requests mark the client to read from the primary."""
+
+    async def app(scope, receive, send):
+        await send(
+            {"type": "http.response.start", "status": status_code, "headers": []}
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = create_read_your_writes_middleware(app)
+    await middleware({"type": "http", "method": method}, AsyncMock(), send)
+
+    cookies = [
+        value.decode() for name, value in sent[0]["headers"] if name == b"set-cookie"
+    ]
+    assert bool(cookies) == sets_cookie
+    if sets_cookie:
+        assert cookies[0].startswith(f"{READ_YOUR_WRITES_COOKIE}=")
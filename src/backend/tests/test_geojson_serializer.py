@@ -0,0 +1,105 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for the GeoJSON serializer."""
+
+import json
+
+from app.helpers.geojson_serializer import (
+    dumps,
+    dumps_str,
+    round_coordinates,
+)
+from app.htmx.map_helpers import render_leaflet_map
+
+FEATCOL = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [85.312345678901, 27.712345678901],
+                        [85.322345678901, 27.712345678901],
+                        [85.322345678901, 27.702345678901],
+                        [85.312345678901, 27.712345678901],
+                    ]
+                ],
+            },
+            "properties": {"osm_id": 1, "name": "Ṭhamel"},
+        },
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "GeometryCollection",
+                "geometries": [
+                    {"type": "Point", "coordinates": [85.3, 27.7]},
+                    {"type": "LineString", "coordinates": [[85.31, 27.71], [1, 2]]},
+                ],
+            },
+            "properties": {},
+        },
+        {"type": "Feature", "geometry": None, "properties": {"task_id": 3}},
+    ],
+}
+
+
+def test_dumps_matches_standard_library():
+    """The output is compact JSON with the same content as json.dumps."""
+    encoded = dumps(FEATCOL)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == FEATCOL
+    assert dumps_str(FEATCOL) == json.dumps(
+        FEATCOL, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def test_round_coordinates_does_not_modify_input():
+    """Coordinates are rounded in a copy, for all geometry types."""
+    rounded = round_coordinates(FEATCOL, 6)
+
+    polygon = rounded["features"][0]["geometry"]["coordinates"][0]
+    assert polygon[0] == [85.312346, 27.712346]
+    collection = rounded["features"][1]["geometry"]["geometries"]
+    assert collection[1]["coordinates"] == [[85.31, 27.71], [1, 2]]
+    assert rounded["features"][2]["geometry"] is None
+    assert rounded["features"][0]["properties"] == {"osm_id": 1, "name": "Ṭhamel"}
+
+    original = FEATCOL["features"][0]["geometry"]["coordinates"][0]
+    assert original[0] == [85.312345678901, 27.712345678901]
+    assert json.loads(dumps(FEATCOL, precision=6)) == rounded
+
+
+def test_render_leaflet_map_embeds_geojson():
+    """Map layers embed the GeoJSON once, with script tags escaped."""
+    featcol = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [85.31234567, 27.7]},
+                "properties": {"name": "</script><script>alert(1)</script>"},
+            }
+        ],
+    }
+    html = render_leaflet_map("leaflet-map-test", [{"data": featcol}])
+
+    assert '"coordinates":[85.31234567,27.7]' in html
+    assert "</script><script>alert" not in html
+    assert "<\\/script><script>alert(1)<\\/script>" in html
@@ -12,6 +12,7 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 from litestar import status_codes as status
 
 from app.config import AuthProvider, settings
+from app.db.database import DbPool
 from app.db.enums import FieldMappingApp, ProjectStatus
 from app.db.models import DbProject
 from app.htmx import setup_step_routes
@@ -35,6 +36,7 @@ from app.htmx.setup_step_routes import (
     download_osm_data_htmx,
     upload_geojson_htmx,
 )
+from app.htmx.static_routes import static_url
 from app.projects.project_services import (
     ConflictError,
     ODKFinalizeResult,
@@ -994,7 +996,9 @@ async def test_reconcile_simple_project_basemap_autostarts_enqueues_eligible_row
         def connection(self):
             return FakeConnectionContext()
 
-    server = SimpleNamespace(state=SimpleNamespace(db_pool=FakePool()))
+    server = SimpleNamespace(
+        state=SimpleNamespace(db_pools={DbPool.MAINTENANCE: FakePool()})
+    )
 
     captured_project_ids: list[int] = []
     claim_calls: list[int] = []
@@ -1104,7 +1108,9 @@ async def test_reconcile_simple_project_basemap_autostarts_filters_and_continues
         def connection(self):
             return FakeConnectionContext()
 
-    server = SimpleNamespace(state=SimpleNamespace(db_pool=FakePool()))
+    server = SimpleNamespace(
+        state=SimpleNamespace(db_pools={DbPool.MAINTENANCE: FakePool()})
+    )
 
     async def fake_claim_simple_project_basemap_generation(*, db, project_id):
         if project_id == 104:
@@ -1182,7 +1188,9 @@ async def test_reconcile_simple_project_basemap_autostarts_skips_unclaimed_rows(
         def connection(self):
             return FakeConnectionContext()
 
-    server = SimpleNamespace(state=SimpleNamespace(db_pool=FakePool()))
+    server = SimpleNamespace(
+        state=SimpleNamespace(db_pools={DbPool.MAINTENANCE: FakePool()})
+    )
 
     monkeypatch.setattr(
         "app.htmx.project_create_routes.claim_simple_project_basemap_generation",
@@ -1246,7 +1254,9 @@ async def test_reconcile_simple_project_basemap_autostarts_claims_resume_rows(
         def connection(self):
             return FakeConnectionContext()
 
-    server = SimpleNamespace(state=SimpleNamespace(db_pool=FakePool()))
+    server = SimpleNamespace(
+        state=SimpleNamespace(db_pools={DbPool.MAINTENANCE: FakePool()})
+    )
 
     claim_generation_mock = AsyncMock(return_value=False)
     claim_resume_mock = AsyncMock(return_value=True)
@@ -1743,10 +1753,10 @@ def test_render_leaflet_map_serializes_popup_options():
         ],
     )
 
-    assert '"showLayerName": false' in html
-    assert '"task_id": "Task ID"' in html
-    assert '"building_count": "Building Count"' in html
-    assert '"propertyOrder": ["task_id", "building_count"]' in html
+    assert '"showLayerName":false' in html
+    assert '"task_id":"Task ID"' in html
+    assert '"building_count":"Building Count"' in html
+    assert '"propertyOrder":["task_id","building_count"]' in html
 
 
 async def test_project_details_shows_odk_media_upload_guidance(client, db, project):
@@ -1877,6 +1887,7 @@ def test_landing_template_renders_locale_selector():
     }
     env.globals["auth_enabled"] = False
     env.globals["current_dir"] = lambda: "ltr"
+    env.globals["static_url"] = static_url
 
     template = env.get_template("landing.html")
     rendered = template.render(create_project_href="/new")
@@ -2087,6 +2098,7 @@ def test_new_project_simple_template_has_submit_loading_indicator():
     }
     env.globals["auth_enabled"] = False
     env.globals["current_dir"] = lambda: "ltr"
+    env.globals["static_url"] = static_url
 
     rendered = env.get_template("new_project_simple.html").render()
 
@@ -2133,6 +2145,7 @@ def test_new_project_simple_template_uses_gettext_for_map_strings():
     }
     env.globals["auth_enabled"] = False
     env.globals["current_dir"] = lambda: "ltr"
+    env.globals["static_url"] = static_url
 
     rendered = env.get_template("new_project_simple.html").render()
 
@@ -2160,6 +2173,33 @@ async def test_static_image_rejects_unsupported_extension(client):
     assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+async def test_static_fingerprinted_css_is_immutable_and_revalidates(client):
+    """Hashed asset URLs get immutable caching, gzip and If-None-Match 304s."""
+    url = static_url("css/app.css")
+    assert url.startswith("/static/css/app.") and url != "/static/css/app.css"
+
+    response = await client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == status.HTTP_200_OK
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers.get("content-encoding") == "gzip"
+    assert response.headers.get("content-type", "").startswith("text/css")
+
+    etag = response.headers["etag"]
+    cached = await client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.headers["etag"] == etag
+
+
+async def test_static_unhashed_and_stale_urls_are_not_immutable(client):
+    """Plain and stale fingerprinted URLs serve the file with short caching."""
+    for url in ("/static/css/app.css", "/static/css/app.000000000000.css"):
+        response = await client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert "immutable" not in response.headers["cache-control"]
+
+
 def test_build_odk_finalize_success_html_includes_manager_credentials():
     """ODK finalize helper should return template context with manager credentials."""
     result = ODKFinalizeResult(
@@ -1,6 +1,11 @@
 """Tests for app bootstrap helpers."""
 
 import os
+import subprocess
+import sys
+from pathlib import Path
+
+from osm_fieldwork.xlsforms import xlsforms_path
 
 from app import main
 from app.auth.auth_routes import auth_router
@@ -8,6 +13,7 @@ from app.central.central_routes import central_router
 from app.config import AuthProvider, OtelSettings, Settings
 from app.helpers.helper_routes import helper_router
 from app.main import _configure_template_engine, build_login_app_url, create_app
+from app.projects import project_crud
 from app.projects.project_routes import api_router
 from app.projects.project_schemas import StubProjectIn
 from app.qfield.qfield_routes import qfield_router
@@ -149,3 +155,38 @@ def test_template_engine_config_handles_disabled_auth_without_hanko_urls(monkeyp
     assert engine.engine.globals["hanko_public_url"] == ""
     assert engine.engine.globals["login_url"] == ""
     assert engine.engine.globals["auth_enabled"] is False
+
+
+async def test_read_and_insert_xlsforms_skips_unchanged_templates(db, monkeypatch):
+    """A second template sync should not reconvert any unchanged YAML."""
+    await project_crud.read_and_insert_xlsforms(db, xlsforms_path)
+
+    converted_batches = []
+    original_convert = project_crud._convert_xlsforms
+
+    async def _spy_convert(file_paths):
+        converted_batches.append(dict(file_paths))
+        return await original_convert(file_paths)
+
+    monkeypatch.setattr(project_crud, "_convert_xlsforms", _spy_convert)
+    await project_crud.read_and_insert_xlsforms(db, xlsforms_path)
+
+    assert converted_batches == [{}]
+
+
+def test_app_import_does_not_load_heavy_dependencies():
+    """Heavy form/QR/SDK libraries should only be imported on first use."""
+    code = (
+        "import sys, app.main\n"
+        "from app.helpers.lazy_imports import HEAVY_MODULES\n"
+        "print(','.join(m for m in HEAVY_MODULES if m in sys.modules))\n"
+    )
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(main.__file__).parent.parent,
+    )
+
+    assert result.stdout.strip() == ""
@@ -0,0 +1,135 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for the Prometheus metrics registry and endpoint."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import metrics
+from app.config import settings
+from app.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Buckets should be cumulative, with matching sum and count."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test.", ("route",), (0.1, 1))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+
+    text = registry.render([(registry.snapshot(), True)])
+
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_seconds_sum{route="/a"} 5.55' in text
+    assert 'test_seconds_count{route="/a"} 3' in text
+    assert "# TYPE test_seconds histogram" in text
+
+
+def test_label_values_are_escaped():
+    """Quotes, backslashes and newlines must not break the exposition format."""
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test.", ("name",))
+    counter.inc('a"b\\c\nd')
+
+    text = registry.render([(registry.snapshot(), True)])
+
+    assert 'test_total{name="a\\"b\\\\c\\nd"} 1' in text
+
+
+def test_render_sums_workers_and_drops_exited_worker_gauges():
+    """Counters from all workers add up; gauges only from live workers."""
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test.")
+    gauge = registry.gauge("test_in_progress", "Test.")
+    counter.inc(amount=2)
+    gauge.set(3)
+    snapshot = registry.snapshot()
+
+    text = registry.render([(snapshot, True), (snapshot, True), (snapshot, False)])
+
+    assert "test_total 6" in text
+    assert "test_in_progress 6" in text
+
+
+def test_track_background_job_records_outcome():
+    """Raised exceptions and flagged failures should both count as errors."""
+    before = dict(metrics.background_jobs_total.values)
+
+    with metrics.track_background_job("test") as job:
+        job.failed = True
+    with pytest.raises(RuntimeError), metrics.track_background_job("test"):
+        raise RuntimeError("boom")
+    with metrics.track_background_job("test"):
+        pass
+
+    values = metrics.background_jobs_total.values
+    assert values[("test", "error")] - before.get(("test", "error"), 0) == 2
+    assert values[("test", "ok")] - before.get(("test", "ok"), 0) == 1
+    assert metrics.background_jobs_in_progress.values[("test",)] == 0
+
+
+def test_requests_session_hook_records_outbound_latency():
+    """Responses seen by a requests Session hook are recorded per integration."""
+    session = SimpleNamespace(hooks={"response": []})
+    metrics.instrument_requests_session(session, "test-integration")
+    response = SimpleNamespace(
+        status_code=502,
+        elapsed=SimpleNamespace(total_seconds=lambda: 0.2),
+    )
+
+    session.hooks["response"][0](response)
+
+    series = metrics.outbound_request_duration.values[("test-integration", "error")]
+    assert series[-1] >= 0.2
+
+
+def test_render_metrics_includes_other_worker_snapshots(monkeypatch, tmp_path):
+    """With a shared directory, a scrape should include other workers."""
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_pid_is_live", lambda pid: False)
+    other = MetricsRegistry()
+    other.counter("ftm_background_jobs_total", "", ("kind", "outcome")).inc(
+        "other-worker", "ok"
+    )
+    (tmp_path / "999999.json").write_text(json.dumps(other.snapshot()))
+
+    text = metrics.render_metrics()
+
+    assert 'ftm_background_jobs_total{kind="other-worker",outcome="ok"} 1' in text
+
+
+async def test_metrics_endpoint_reports_route_templates(client):
+    """Requests are labelled by route template, along with DB pool stats."""
+    response = await client.get("/__lbheartbeat__")
+    assert response.status_code == 200
+
+    response = await client.get(settings.METRICS_PATH)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert (
+        'ftm_http_request_duration_seconds_count{method="GET",'
+        'route="/__lbheartbeat__",status="200"}'
+    ) in response.text
+    assert 'ftm_db_pool_connections{pool="interactive",state="size"}' in response.text
+    assert 'ftm_db_pool_utilization_ratio{pool="background"}' in response.text
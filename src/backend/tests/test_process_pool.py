@@ -0,0 +1,102 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for the XLSForm process pool."""
+
+import asyncio
+import time
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from litestar import status_codes as status
+from litestar.exceptions import HTTPException
+
+from app.central import central_crud
+from app.helpers import process_pool
+
+TEST_DATA_DIR = Path(__file__).parent / "test_data"
+
+
+async def test_run_in_process_falls_back_to_threads(monkeypatch):
+    """With no workers configured, jobs still run off the event loop."""
+    monkeypatch.setattr(process_pool.settings, "XLSFORM_WORKERS", 0)
+
+    assert process_pool.get_process_pool() is None
+    assert await process_pool.run_in_process(max, 1, 3, 2) == 3  # noqa: PLR2004
+
+
+async def test_run_in_process_timeout_discards_pool(monkeypatch):
+    """A job exceeding its timeout kills the pool, and the next job gets a new one."""
+    monkeypatch.setattr(process_pool.settings, "XLSFORM_WORKERS", 1)
+
+    executor = process_pool.get_process_pool()
+    try:
+        with pytest.raises(TimeoutError):
+            await process_pool.run_in_process(time.sleep, 30, timeout=0.5)
+        assert process_pool.get_process_pool() is not executor
+    finally:
+        await process_pool.stop_process_pool(None)
+
+
+async def test_run_in_process_retries_jobs_lost_to_another_timeout(monkeypatch):
+    """Killing the pool for one runaway job should not fail the jobs beside it."""
+    monkeypatch.setattr(process_pool.settings, "XLSFORM_WORKERS", 2)
+
+    try:
+        runaway = asyncio.create_task(
+            process_pool.run_in_process(time.sleep, 30, timeout=1)
+        )
+        bystander = asyncio.create_task(
+            process_pool.run_in_process(time.sleep, 2, timeout=10)
+        )
+        with pytest.raises(TimeoutError):
+            await runaway
+        assert await bystander is None
+    finally:
+        await process_pool.stop_process_pool(None)
+
+
+async def test_broken_pool_is_not_reported_as_invalid_form(monkeypatch):
+    """A pool failure is a temporary service error, not a bad XLSForm."""
+
+    async def broken_pool(*args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(central_crud, "run_in_process", broken_pool)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await central_crud.read_and_test_xform(BytesIO(b"form"))
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+async def test_xlsform_processing_runs_in_process_pool(monkeypatch):
+    """Appending fields and pyxform conversion should round trip via workers."""
+    monkeypatch.setattr(process_pool.settings, "XLSFORM_WORKERS", 1)
+
+    xlsform_bytes = (TEST_DATA_DIR / "buildings.xls").read_bytes()
+    try:
+        xform_id, processed_io = await central_crud.append_fields_to_user_xlsform(
+            BytesIO(xlsform_bytes)
+        )
+        xml_io = await central_crud.read_and_test_xform(processed_io)
+    finally:
+        await process_pool.stop_process_pool(None)
+
+    assert xform_id
+    assert b"<h:html" in xml_io.getvalue()
@@ -18,6 +18,7 @@
 """Tests for project routes."""
 
 import base64
+import hashlib
 import json
 import os
 import zlib
@@ -32,7 +33,14 @@ from litestar.exceptions import HTTPException
 
 from app.central.central_crud import create_odk_project
 from app.central.central_schemas import ODKCentral
-from app.db.enums import FieldMappingApp, ProjectStatus, XLSFormType
+from app.db.enums import (
+    ExtractChangeType,
+    FieldMappingApp,
+    ProjectStatus,
+    XLSFormType,
+)
+from app.db.models import DbDataExtractChange, DbProject
+from app.db.postgis_utils import reduce_featcol_precision
 from app.helpers.geometry_utils import check_crs
 from app.projects import project_crud, project_routes, project_services
 from app.projects.project_schemas import CreateProjectRequest, ProjectUpdate
@@ -141,6 +149,372 @@ async def test_create_odk_project():
     assert result == {"id": 123, "name": "Field-TM Test Project"}
 
 
+async def test_project_one_minimal_defers_heavy_columns(db, project_with_xlsform):
+    """Minimal projects skip heavy columns until included or loaded."""
+    project_id = project_with_xlsform.id
+
+    project = await DbProject.one(db, project_id, minimal=True)
+    assert project.project_name == project_with_xlsform.project_name
+    assert project.outline == project_with_xlsform.outline
+    assert project.manager_username == project_with_xlsform.manager_username
+    assert project.xlsform_content is None
+
+    with_form = await DbProject.one(db, project_id, minimal=True, include=("form",))
+    assert with_form.xlsform_content == project_with_xlsform.xlsform_content
+
+    await project.load(db, "form", "extract")
+    assert project.xlsform_content == project_with_xlsform.xlsform_content
+    assert project.data_extract_geojson == project_with_xlsform.data_extract_geojson
+
+    with pytest.raises(ValueError, match="Unknown project column group"):
+        await project.load(db, "blobs")
+
+
+async def test_project_search_matches_prefixes_and_substrings(db, project):
+    """Search matches word prefixes (search-as-you-type) and any substring."""
+    unique_id = project.project_name.rsplit(" ", 1)[-1]
+
+    for search in ("test proj", unique_id[:6], unique_id[10:16], "HASHTAG1"):
+        projects = await DbProject.all(db, search=search)
+        assert project.id in [result.id for result in projects], search
+
+    assert not await DbProject.all(db, search=f"{unique_id}-missing")
+    # Punctuation only, so no words, but still a valid query
+    await DbProject.all(db, search="-:&")
+
+
+async def test_api_get_projects_within_bbox(db, project, monkeypatch):
+    """Projects in the viewport are returned, clustered if there are too many."""
+    kathmandu = "85.2,27.6,85.4,27.8"
+
+    result = await project_routes.api_get_projects_within.fn(
+        db=db, bbox=kathmandu, zoom=12
+    )
+    assert not result["clustered"]
+    project_ids = [project_id for project_id, _lon, _lat, _status in result["projects"]]
+    assert project.id in project_ids
+
+    result = await project_routes.api_get_projects_within.fn(
+        db=db, bbox="-10,-10,10,10", zoom=12
+    )
+    assert project.id not in [project_id for project_id, *_ in result["projects"]]
+
+    monkeypatch.setattr(project_crud, "MAX_UNCLUSTERED_PROJECTS", 0)
+    result = await project_routes.api_get_projects_within.fn(
+        db=db, bbox=kathmandu, zoom=2
+    )
+    assert result["clustered"]
+    in_clusters = sum(count for _lon, _lat, count in result["clusters"])
+    assert in_clusters + len(result["projects"]) >= 1
+
+
+@pytest.mark.parametrize("bbox", ["1,2,3", "a,b,c,d", "10,0,-10,5", "0,0,200,10"])
+async def test_api_get_projects_within_rejects_invalid_bbox(bbox):
+    """Malformed or out of range bboxes are rejected."""
+    with pytest.raises(HTTPException) as exc:
+        await project_routes.api_get_projects_within.fn(db=Mock(), bbox=bbox, zoom=3)
+    assert exc.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_project_xlsform_digest_follows_the_form(db, project_with_xlsform):
+    """The XLSForm digest (its ETag) is updated with the form."""
+    form = project_with_xlsform.xlsform_content
+    assert project_with_xlsform.xlsform_digest == hashlib.sha256(form).hexdigest()
+
+    updated = await DbProject.update(
+        db, project_with_xlsform.id, ProjectUpdate(xlsform_content=b"new form")
+    )
+    assert updated.xlsform_digest == hashlib.sha256(b"new form").hexdigest()
+
+
+async def test_api_get_project_xlsform_revalidates_with_etag(
+    db, project_with_xlsform, monkeypatch
+):
+    """The form download returns 304 when the ETag still matches."""
+    monkeypatch.setattr(
+        project_routes,
+        "api_key_required",
+        AsyncMock(return_value=Mock()),
+    )
+    request = Mock(headers={})
+
+    response = await project_routes.api_get_project_xlsform.fn(
+        request=request, project_id=project_with_xlsform.id, db=db
+    )
+    assert response.content == project_with_xlsform.xlsform_content
+    etag = response.headers["ETag"]
+    assert etag == f'"{project_with_xlsform.xlsform_digest}"'
+
+    request.headers = {"if-none-match": etag}
+    response = await project_routes.api_get_project_xlsform.fn(
+        request=request, project_id=project_with_xlsform.id, db=db
+    )
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+
+
+async def test_stored_geojson_is_passed_through_as_json(db, project):
+    """Stored task areas and extracts are returned without a JSON round trip."""
+    task_areas = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": project.outline,
+                "properties": {"task_id": 1},
+            }
+        ],
+    }
+    await DbProject.update(db, project.id, ProjectUpdate(task_areas_geojson=task_areas))
+
+    raw = await DbProject.raw_geojson(db, project.id, "task_areas_geojson")
+    assert isinstance(raw, bytes)
+    assert json.loads(raw) == task_areas
+    assert json.loads(await project_crud.get_task_geometry(db, project.id)) == (
+        task_areas
+    )
+
+    response = await project_routes.api_get_project_task_areas.fn(
+        project_id=project.id, db=db
+    )
+    assert response.media_type == "application/geo+json"
+    assert response.content == raw
+
+    with pytest.raises(HTTPException) as exc_info:
+        await project_routes.api_get_project_data_extract.fn(
+            project_id=project.id, db=db
+        )
+    assert exc_info.value.status_code == status.HTTP_404_NOT_FOUND
+
+    with pytest.raises(ValueError, match="Not a stored GeoJSON column"):
+        await DbProject.raw_geojson(db, project.id, "xlsform_content")
+
+
+async def test_get_task_geometry_without_splitting(db, project):
+    """An empty task areas object is returned as an empty FeatureCollection."""
+    await DbProject.update(db, project.id, ProjectUpdate(task_areas_geojson={}))
+
+    assert json.loads(await project_crud.get_task_geometry(db, project.id)) == {
+        "type": "FeatureCollection",
+        "features": [],
+    }
+
+
+def _task_area(outer_x: float, shared_edge: list[list[float]], task_id: int) -> dict:
+    """A task polygon between outer_x and a jagged edge shared with another."""
+    ring = [[outer_x, 27.70], *shared_edge, [outer_x, 27.71], [outer_x, 27.70]]
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+        "properties": {"task_id": task_id},
+    }
+
+
+async def test_save_task_areas_reduces_precision_without_gaps(db, project):
+    """Task areas are rounded and simplified, keeping shared edges shared."""
+    # Zig-zagging by 3cm, with more decimals than kept
+    shared_edge = [
+        [85.301 + (0.0000003 if i % 2 else 0) + 0.000000000123, 27.70 + i * 0.001]
+        for i in range(11)
+    ]
+    west = _task_area(85.300, shared_edge, 1)
+    east = _task_area(85.302, shared_edge, 2)
+    tasks = {"type": "FeatureCollection", "features": [west, east]}
+    await DbProject.update(
+        db,
+        project.id,
+        ProjectUpdate(geometry_precision=6, simplify_tolerance_meters=1),
+    )
+
+    assert await project_services.save_task_areas(db, project.id, tasks) == 2
+
+    stored = (await DbProject.one(db, project.id)).task_areas_geojson
+    assert [f["properties"] for f in stored["features"]] == [
+        {"task_id": 1},
+        {"task_id": 2},
+    ]
+    coordinates = [
+        value
+        for feature in stored["features"]
+        for position in feature["geometry"]["coordinates"][0]
+        for value in position
+    ]
+    assert all(round(value, 6) == value for value in coordinates)
+    # The jagged edge (under 1m) is simplified away
+    assert len(stored["features"][0]["geometry"]["coordinates"][0]) < len(
+        west["geometry"]["coordinates"][0]
+    )
+
+    async with db.cursor() as cur:
+        await cur.execute(
+            """
+            WITH tasks AS (
+                SELECT ST_GeomFromGeoJSON(feature -> 'geometry') AS geom
+                FROM jsonb_array_elements(%(tasks)s::jsonb -> 'features') AS feature
+            )
+            SELECT
+                SUM(ST_Area(geom)),
+                ST_Area(ST_Union(geom)),
+                ST_Area(ST_Envelope(ST_Collect(geom)))
+            FROM tasks;
+        """,
+            {"tasks": json.dumps(stored)},
+        )
+        area_sum, union_area, envelope_area = await cur.fetchone()
+    # No overlaps, and no gaps between the tasks
+    assert area_sum == pytest.approx(union_area)
+    assert union_area == pytest.approx(envelope_area)
+
+
+async def test_rounded_task_areas_keep_t_junctions_gap_free(db):
+    """Rounding a coverage does not open slivers at T-junctions."""
+
+    def task(task_id, ring):
+        return {
+            "type": "Feature",
+            "geometry": {"type": "Polygon", "coordinates": [ring]},
+            "properties": {"task_id": task_id},
+        }
+
+    # The west tasks meet on the slanted edge of the east task, which has no
+    # vertex there, and the meeting point is not on the 0.1 degree grid
+    tasks = {
+        "type": "FeatureCollection",
+        "features": [
+            task(1, [[0, 0], [1, 0], [1.11, 0.55], [0, 0.55], [0, 0]]),
+            task(2, [[0, 0.55], [1.11, 0.55], [1.2, 1], [0, 1], [0, 0.55]]),
+            task(3, [[1, 0], [2, 0], [2, 1], [1.2, 1], [1, 0]]),
+        ],
+    }
+
+    reduced = await reduce_featcol_precision(db, tasks, precision=1, coverage=True)
+
+    async with db.cursor() as cur:
+        await cur.execute(
+            """
+            WITH tasks AS (
+                SELECT ST_GeomFromGeoJSON(feature -> 'geometry') AS geom
+                FROM jsonb_array_elements(%(tasks)s::jsonb -> 'features') AS feature
+            )
+            SELECT SUM(ST_Area(geom)), ST_Area(ST_Union(geom))
+            FROM tasks;
+        """,
+            {"tasks": json.dumps(reduced)},
+        )
+        area_sum, union_area = await cur.fetchone()
+    assert area_sum == pytest.approx(union_area)
+    assert union_area == pytest.approx(2)
+
+
+def _osm_feature(osm_id: int, version: int, lon: float) -> dict:
+    """A building from an OSM extract."""
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lon, 27.712]},
+        "properties": {"osm_id": osm_id, "version": version, "building": "yes"},
+    }
+
+
+async def test_refresh_data_extract_pushes_only_changes(db, project, monkeypatch):
+    """Only new, changed and deleted OSM features are pushed and recorded."""
+    uploaded = {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [85.3035, 27.712]},
+        "properties": {"name": "uploaded"},
+    }
+    stored = {
+        "type": "FeatureCollection",
+        "features": [
+            _osm_feature(1, 1, 85.301),
+            _osm_feature(2, 1, 85.302),
+            _osm_feature(3, 1, 85.303),
+            uploaded,
+        ],
+    }
+    options = {
+        "osm_category": "highways",
+        "geom_type": "POLYLINE",
+        "centroid": False,
+        "tiled": True,
+    }
+    await DbProject.update(
+        db,
+        project.id,
+        ProjectUpdate(data_extract_geojson=stored, data_extract_options=options),
+    )
+    refreshed = {
+        "type": "FeatureCollection",
+        "features": [
+            _osm_feature(1, 1, 85.301),
+            _osm_feature(2, 2, 85.3025),
+            _osm_feature(4, 1, 85.304),
+        ],
+    }
+    download = AsyncMock(return_value=refreshed)
+    monkeypatch.setattr(project_services, "download_osm_data", download)
+    push = AsyncMock(return_value={"created": 1, "updated": 1, "deleted": 1})
+    monkeypatch.setattr(project_services.central_crud, "push_entity_changes", push)
+
+    # Deleting 1 of the 3 OSM features is over the default 20% limit
+    with pytest.raises(project_services.ConflictError):
+        await project_services.refresh_data_extract(db, project.id)
+    push.assert_not_awaited()
+
+    result = await project_services.refresh_data_extract(db, project.id, force=True)
+
+    # The stored options are reused
+    assert download.await_args.kwargs == options
+    assert (result.new, result.changed, result.deleted, result.unchanged) == (
+        1,
+        1,
+        1,
+        1,
+    )
+    assert result.pushed
+    _, _, key, entities_list, deleted = push.await_args.args
+    assert key == "osm_id"
+    assert [entity["data"]["osm_id"] for entity in entities_list] == ["4", "2"]
+    assert deleted == ["3"]
+
+    saved = (await DbProject.one(db, project.id)).data_extract_geojson
+    assert [f["properties"].get("osm_id") for f in saved["features"]] == [
+        1,
+        2,
+        4,
+        None,
+    ]
+    changes = await DbDataExtractChange.all_for_project(db, project.id)
+    assert {
+        (change.osm_id, change.change, change.old_version, change.new_version)
+        for change in changes
+    } == {
+        ("4", ExtractChangeType.NEW, None, 1),
+        ("2", ExtractChangeType.CHANGED, 1, 2),
+        ("3", ExtractChangeType.DELETED, 1, None),
+    }
+
+    # Nothing changed since, so nothing is pushed
+    result = await project_services.refresh_data_extract(db, project.id)
+    assert (result.unchanged, result.pushed) == (3, False)
+    push.assert_awaited_once()
+
+
+async def test_refresh_data_extract_requires_osm_options(db, project, monkeypatch):
+    """An uploaded extract has no OSM options, so is not refreshed."""
+    stored = {"type": "FeatureCollection", "features": [_osm_feature(1, 1, 85.301)]}
+    await DbProject.update(
+        db,
+        project.id,
+        ProjectUpdate(data_extract_geojson=stored, data_extract_options={}),
+    )
+    download = AsyncMock()
+    monkeypatch.setattr(project_services, "download_osm_data", download)
+
+    with pytest.raises(project_services.ValidationError):
+        await project_services.refresh_data_extract(db, project.id)
+    download.assert_not_awaited()
+
+
 def test_project_update_accepts_qfield_uuid_external_project_id():
     """QFieldCloud UUID project IDs should validate for project updates."""
     qfield_project_id = "becce310-e99e-4a7e-b1db-9e3f00e2c5ba"
@@ -479,6 +853,112 @@ async def test_download_osm_data_maps_extract_generation_failure(monkeypatch):
         )
 
 
+def _rectangle(xmin: float, xmax: float) -> dict:
+    """A polygon between two longitudes, from latitude 27.70 to 27.71."""
+    return {
+        "type": "Polygon",
+        "coordinates": [
+            [
+                [xmin, 27.71],
+                [xmin, 27.70],
+                [xmax, 27.70],
+                [xmax, 27.71],
+                [xmin, 27.71],
+            ]
+        ],
+    }
+
+
+def _longitude_range(geometry: dict) -> tuple[float, float]:
+    longitudes = [position[0] for position in geometry["coordinates"][0]]
+    return min(longitudes), max(longitudes)
+
+
+async def test_download_osm_data_tiled_keeps_features_crossing_tiles(db, monkeypatch):
+    """Tiled extracts keep features crossing tile edges once, within the AOI."""
+    outline = _rectangle(85.30, 85.32)
+    tiles = [_rectangle(85.30, 85.31), _rectangle(85.31, 85.32)]
+    osm_features = [
+        {
+            "type": "Feature",
+            "geometry": _rectangle(xmin, xmax),
+            "properties": {"osm_id": osm_id},
+        }
+        for osm_id, xmin, xmax in [
+            (1, 85.301, 85.302),
+            # Crosses the edge between the tiles
+            (2, 85.309, 85.311),
+            (3, 85.318, 85.319),
+            # Crosses the edge of the AOI
+            (4, 85.319, 85.321),
+        ]
+    ]
+    requested_st_within = []
+
+    async def fake_get_project_by_id(_db, _project_id):
+        return Mock(id=1, outline=outline)
+
+    async def fake_split_geom_into_tiles(_db, _outline, _max_area_km2):
+        return tiles
+
+    async def fake_generate_data_extract(
+        _project_id, aoi, _geom_type, _config, _centroid, use_st_within
+    ):
+        """Select features like raw-data-api, by within or intersects."""
+        requested_st_within.append(use_st_within)
+        tile_xmin, tile_xmax = _longitude_range(aoi["features"][0]["geometry"])
+        selected = []
+        for feature in osm_features:
+            xmin, xmax = _longitude_range(feature["geometry"])
+            if use_st_within:
+                matches = tile_xmin <= xmin and xmax <= tile_xmax
+            else:
+                matches = xmin <= tile_xmax and tile_xmin <= xmax
+            if matches:
+                selected.append(feature)
+        return Mock(data={"download_url": selected})
+
+    async def fake_download_extract_geojson(selected):
+        return {"type": "FeatureCollection", "features": selected}
+
+    async def fake_check_crs(_featcol):
+        return None
+
+    monkeypatch.setattr(
+        project_services.project_deps,
+        "get_project_by_id",
+        fake_get_project_by_id,
+    )
+    monkeypatch.setattr(
+        project_services, "split_geom_into_tiles", fake_split_geom_into_tiles
+    )
+    monkeypatch.setattr(
+        project_services.project_crud,
+        "generate_data_extract",
+        fake_generate_data_extract,
+    )
+    monkeypatch.setattr(
+        project_services, "_download_extract_geojson", fake_download_extract_geojson
+    )
+    monkeypatch.setattr(
+        project_services, "parse_aoi", lambda _db_url, featcol, merge=True: featcol
+    )
+    monkeypatch.setattr(project_services, "check_crs", fake_check_crs)
+
+    result = await project_services.download_osm_data(
+        db=db,
+        project_id=1,
+        osm_category="buildings",
+        geom_type="POLYGON",
+        centroid=False,
+        tiled=True,
+    )
+
+    assert requested_st_within == [False, False]
+    osm_ids = sorted(f["properties"]["osm_id"] for f in result["features"])
+    assert osm_ids == [1, 2, 3]
+
+
 @pytest.mark.parametrize(
     "algorithm",
     ["AVG_BUILDING_VORONOI", "AVG_BUILDING_SKELETON"],
@@ -880,7 +1360,7 @@ async def test_get_project_qrcode_prefers_project_external_url(monkeypatch):
     )
     project.get_odk_credentials = Mock(return_value=None)
 
-    async def fake_get_project_by_id(_db, _project_id):
+    async def fake_get_project_by_id(_db, _project_id, **_kwargs):
         return project
 
     class DummyResponse:
@@ -0,0 +1,111 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for per-request DB query counting."""
+
+import logging
+
+import pytest
+
+from app.config import settings
+from app.db import query_stats
+from app.db.query_stats import (
+    QueryBudgetError,
+    QueryStats,
+    check_query_stats,
+    create_query_stats_middleware,
+    params_fingerprint,
+    track_queries,
+)
+
+
+async def test_track_queries_counts_queries_rows_and_repeats(db):
+    """Queries on pool connections are counted, and exact repeats flagged."""
+    with track_queries() as stats:
+        await db.execute("SELECT generate_series(1, %s)", (3,))
+        await db.execute("SELECT generate_series(1, %s)", (3,))
+        async with db.cursor() as cur:
+            await cur.execute("SELECT generate_series(1, %s)", (2,))
+
+    assert stats.queries == 3
+    assert stats.rows == 8
+    assert stats.seconds > 0
+    assert stats.repeated() == [("SELECT generate_series(1, %s)", 2)]
+
+
+async def test_queries_outside_tracking_are_not_counted(db):
+    """Only queries run inside a tracked block are recorded."""
+    with track_queries() as stats:
+        pass
+    await db.execute("SELECT 1")
+
+    assert stats.queries == 0
+
+
+def test_check_query_stats_warns_over_budget(monkeypatch, caplog):
+    """Exceeding the budget logs a warning by default."""
+    monkeypatch.setattr(settings, "DB_QUERY_BUDGET", 1)
+    stats = QueryStats()
+    stats.record("SELECT 1", None, 0.001, 1)
+    stats.record("SELECT 2", None, 0.001, 1)
+
+    with caplog.at_level(logging.WARNING):
+        check_query_stats(stats, "GET /projects")
+
+    assert "GET /projects: 2 queries (budget 1)" in caplog.text
+
+
+def test_check_query_stats_raises_in_strict_mode(strict_query_budget):
+    """Repeated identical queries fail in strict (test) mode."""
+    stats = QueryStats()
+    stats.record("SELECT * FROM projects WHERE id = %s", (1,), 0.001, 1)
+    stats.record("SELECT * FROM projects WHERE id = %s", (1,), 0.001, 1)
+    stats.record("SELECT * FROM projects WHERE id = %s", (2,), 0.001, 1)
+
+    with pytest.raises(QueryBudgetError, match="identical query run 2 times"):
+        check_query_stats(stats, "GET /projects/{project_id}")
+
+
+def test_params_fingerprint_compares_large_values_by_length():
+    """Large parameters are not copied, only their type and length kept."""
+    geojson = "x" * 100_000
+    assert params_fingerprint({"id": 1, "geojson": geojson}) == (
+        ("id", 1),
+        ("geojson", ("str", 100_000)),
+    )
+    assert params_fingerprint((1, "a")) != params_fingerprint((2, "a"))
+    assert params_fingerprint(None) is None
+
+
+async def test_query_tracking_skipped_without_budget(monkeypatch):
+    """No QueryStats are set up for requests when the budget is disabled."""
+    monkeypatch.setattr(settings, "DB_QUERY_BUDGET", 0)
+    tracked = []
+
+    async def app(scope, receive, send):
+        tracked.append(query_stats._query_stats.get())
+
+    middleware = create_query_stats_middleware(app)
+    await middleware({"type": "http", "method": "GET", "path": "/"}, None, None)
+
+    assert tracked == [None]
+
+
+async def test_heartbeat_within_query_budget(client, strict_query_budget):
+    """A request within the budget, without repeats, is unaffected."""
+    response = await client.get("/__heartbeat__")
+    assert response.status_code == 200
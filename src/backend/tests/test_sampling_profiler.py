@@ -0,0 +1,107 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for the sampling profiler and its admin routes."""
+
+import json
+import threading
+import time
+
+from app.helpers.sampling_profiler import SamplingProfiler, profiler
+
+SAMPLE_SECONDS = 0.3
+
+
+def _busy(seconds: float) -> None:
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+def _handle_request(scope: dict) -> None:
+    """Stand-in for an ASGI app, with the scope as a frame local."""
+    _busy(SAMPLE_SECONDS)
+
+
+async def test_samples_are_labelled_by_route_and_thread():
+    """Event loop samples get the route template, other threads their name."""
+    sampler = SamplingProfiler()
+    worker = threading.Thread(target=_busy, args=(SAMPLE_SECONDS,), name="test-worker")
+    await sampler.start(duration=10, interval=0.005)
+    worker.start()
+    _handle_request(
+        {"type": "http", "method": "GET", "path_template": "/projects/{id}"}
+    )
+    worker.join()
+    await sampler.stop()
+
+    labels = sampler.status()["labels"]
+    assert labels["GET /projects/{id}"] > 0
+    assert labels["thread:test-worker"] > 0
+    assert not sampler.running
+
+    collapsed = sampler.to_collapsed("GET /projects/{id}").splitlines()
+    assert collapsed
+    assert all(line.startswith("GET /projects/{id};") for line in collapsed)
+    assert any("_handle_request" in line for line in collapsed)
+
+
+async def test_speedscope_export_has_one_profile_per_label():
+    """Each label becomes a sampled profile, weighted in seconds."""
+    sampler = SamplingProfiler()
+    await sampler.start(duration=10, interval=0.005)
+    _handle_request({"type": "http", "method": "POST", "path_template": "/a"})
+    await sampler.stop()
+
+    profile = json.loads(sampler.to_speedscope())
+    frames = profile["shared"]["frames"]
+    by_name = {p["name"]: p for p in profile["profiles"]}
+
+    assert "POST /a" in by_name
+    post_profile = by_name["POST /a"]
+    assert post_profile["type"] == "sampled"
+    assert len(post_profile["samples"]) == len(post_profile["weights"])
+    assert 0 < post_profile["endValue"] <= SAMPLE_SECONDS * 2
+    assert all(index < len(frames) for s in post_profile["samples"] for index in s)
+
+
+async def test_profiler_routes(client):
+    """Admins can start, stop and export a profile."""
+    response = await client.post(
+        "/api/v1/admin/profiler/start", params={"duration": 5, "interval_ms": 5}
+    )
+    assert response.status_code == 200
+    assert response.json()["running"] is True
+
+    response = await client.get("/api/v1/admin/profiler")
+    assert response.status_code == 200
+
+    response = await client.post("/api/v1/admin/profiler/stop")
+    assert response.status_code == 200
+    assert response.json()["running"] is False
+    assert not profiler.running
+
+    response = await client.get(
+        "/api/v1/admin/profiler/export", params={"format": "collapsed"}
+    )
+    assert response.status_code == 200
+    assert "attachment" in response.headers["content-disposition"]
+
+    response = await client.post(
+        "/api/v1/admin/profiler/start", params={"duration": 100000}
+    )
+    assert response.status_code == 400
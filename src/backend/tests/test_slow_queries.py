@@ -0,0 +1,101 @@
+# Copyright (c) Humanitarian OpenStreetMap Team
+#
+# This file is part of Field-TM.
+#
+#     Field-TM is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     Field-TM is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with Field-TM.  If not, see <https:#www.gnu.org/licenses/>.
+#
+"""Tests for the slow query log."""
+
+import pytest
+
+from app.config import settings
+from app.db import slow_queries
+from app.db.query_stats import track_queries
+from app.db.slow_queries import (
+    explain,
+    flush_slow_queries,
+    normalize_sql,
+    params_shape,
+)
+
+
+@pytest.fixture
+def slow_query_log(monkeypatch):
+    """Log every query, always capturing the plan."""
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 1)
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_EXPLAIN_RATE", 1)
+    slow_queries.pending.clear()
+    yield slow_queries.pending
+    slow_queries.pending.clear()
+
+
+def test_normalize_sql_replaces_literals():
+    """Literal values are hidden, so similar statements group together."""
+    query = """
+        SELECT * FROM projects
+        WHERE name ILIKE '%it''s%' AND id > 42 AND ST_SRID(outline) = 4326
+        LIMIT %(limit)s
+    """
+
+    assert normalize_sql(query) == (
+        "SELECT * FROM projects WHERE name ILIKE ? AND id > ? "
+        "AND ST_SRID(outline) = ? LIMIT %(limit)s"
+    )
+
+
+def test_params_shape_hides_values():
+    """Only parameter types and lengths are recorded."""
+    assert params_shape({"name": "secret", "ids": [1, 2, 3], "x": None}) == {
+        "name": "str",
+        "ids": "list[3]",
+        "x": "NoneType",
+    }
+    assert params_shape((1, b"abc")) == ["int", "bytes[3]"]
+    assert params_shape(None) is None
+
+
+async def test_slow_query_is_recorded_with_plan(db, slow_query_log):
+    """Slow statements are buffered with their plan, then written to the DB."""
+    with track_queries("GET /test-slow-query"):
+        await db.execute("SELECT pg_sleep(%(seconds)s), 'secret'", {"seconds": 0.01})
+
+    entry = slow_query_log[-1]
+    assert entry.query == "SELECT pg_sleep(%(seconds)s), ?"
+    assert entry.params_shape == {"seconds": "float"}
+    assert entry.request == "GET /test-slow-query"
+    assert entry.duration_ms >= 10
+    assert entry.plan[0]["Plan"]["Node Type"] == "Result"
+
+    assert await flush_slow_queries(db) >= 1
+    async with db.cursor() as cur:
+        await cur.execute(
+            "SELECT plan IS NOT NULL FROM slow_queries WHERE request = %s",
+            ("GET /test-slow-query",),
+        )
+        assert await cur.fetchone() == (True,)
+    await db.execute("DELETE FROM slow_queries")
+    await db.commit()
+
+
+async def test_failed_explain_does_not_abort_transaction(db):
+    """A statement that cannot be explained is skipped without side effects."""
+    await db.execute("SELECT 1")
+
+    assert await explain(db, "SELECT * FROM no_such_table", None) is None
+    assert await explain(db, "SHOW search_path", None) is None
+
+    async with db.cursor() as cur:
+        await cur.execute("SELECT 1")
+        assert await cur.fetchone() == (1,)
+    await db.rollback()
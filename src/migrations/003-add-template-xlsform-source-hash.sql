@@ -0,0 +1,4 @@
+-- Hash of the YAML source (and converter version) each template was built
+-- from, so unchanged templates are not regenerated on every startup.
+ALTER TABLE IF EXISTS template_xlsforms
+ADD COLUMN IF NOT EXISTS source_hash character varying;
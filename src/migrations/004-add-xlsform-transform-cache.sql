@@ -0,0 +1,17 @@
+-- Content-addressed cache of processed XLSForms. Rows are keyed by a digest
+-- of the uploaded XLSForm plus the processing options, and evicted least
+-- recently used first once the table exceeds a configured size.
+
+CREATE TABLE IF NOT EXISTS xlsform_transform_cache (
+    cache_key character varying PRIMARY KEY,
+    xform_id character varying NOT NULL,
+    xlsform BYTEA NOT NULL,
+    xform_xml BYTEA NOT NULL,
+    size_bytes integer NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_used_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+ALTER TABLE xlsform_transform_cache OWNER TO current_user;
+
+CREATE INDEX IF NOT EXISTS idx_xlsform_transform_cache_last_used
+ON xlsform_transform_cache USING btree (last_used_at);
@@ -0,0 +1,18 @@
+-- Statements slower than DB_SLOW_QUERY_MS, written by the backend when the
+-- slow query log is enabled. Only the newest DB_SLOW_QUERY_MAX_ROWS rows
+-- are kept.
+
+CREATE TABLE IF NOT EXISTS slow_queries (
+    id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    duration_ms double precision NOT NULL,
+    -- Normalized SQL, with literals replaced by ?
+    query text NOT NULL,
+    -- Parameter types, not values
+    params_shape JSONB,
+    call_site character varying,
+    request character varying,
+    -- EXPLAIN (FORMAT JSON) output, for a sample of queries
+    plan JSONB
+);
+ALTER TABLE slow_queries OWNER TO current_user;
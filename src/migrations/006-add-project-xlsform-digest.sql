@@ -0,0 +1,8 @@
+-- SHA-256 of the project XLSForm, used as the ETag of its download.
+
+ALTER TABLE IF EXISTS projects
+ADD COLUMN IF NOT EXISTS xlsform_digest character varying;
+
+UPDATE projects
+SET xlsform_digest = encode(sha256(xlsform_content), 'hex')
+WHERE xlsform_content IS NOT NULL AND xlsform_digest IS NULL;
@@ -0,0 +1,65 @@
+-- Indexed project search: a weighted tsvector for ranked word (and prefix)
+-- matches, and a trigram index for substring matches, covering the project
+-- name, slug, hashtags, location and description.
+-- NOTE the indexes are built CONCURRENTLY, so this must not run in a
+-- transaction block. If a build fails, drop the INVALID index and re-run.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+-- array_to_string is only STABLE, so wrap the expressions in IMMUTABLE
+-- functions usable by a generated column and an expression index
+CREATE OR REPLACE FUNCTION project_search_vector(
+    project_name character varying,
+    slug character varying,
+    hashtags character varying [],
+    location_str character varying,
+    description character varying
+) RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT
+        setweight(to_tsvector('simple', coalesce(project_name, '')), 'A')
+        || setweight(
+            to_tsvector('simple', translate(coalesce(slug, ''), '-_', '  ')), 'A'
+        )
+        || setweight(
+            to_tsvector('simple', coalesce(array_to_string(hashtags, ' '), '')), 'B'
+        )
+        || setweight(to_tsvector('simple', coalesce(location_str, '')), 'C')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'D');
+$$;
+ALTER FUNCTION project_search_vector OWNER TO current_user;
+
+CREATE OR REPLACE FUNCTION project_search_text(
+    project_name character varying,
+    slug character varying,
+    hashtags character varying [],
+    location_str character varying,
+    description character varying
+) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT lower(concat_ws(
+        ' ',
+        project_name,
+        slug,
+        translate(slug, '-_', '  '),
+        array_to_string(hashtags, ' '),
+        location_str,
+        description
+    ));
+$$;
+ALTER FUNCTION project_search_text OWNER TO current_user;
+
+ALTER TABLE IF EXISTS projects
+ADD COLUMN IF NOT EXISTS search_vector tsvector
+GENERATED ALWAYS AS (
+    project_search_vector(project_name, slug, hashtags, location_str, description)
+) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_search_vector
+ON projects USING gin (search_vector);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_projects_search_trgm
+ON projects USING gin (
+    project_search_text(project_name, slug, hashtags, location_str, description)
+    gin_trgm_ops
+);
@@ -0,0 +1,6 @@
+-- Per-project rounding and simplification of saved geometries.
+-- NULL uses the GEOMETRY_PRECISION / GEOMETRY_SIMPLIFY_TOLERANCE_METERS
+-- settings.
+ALTER TABLE IF EXISTS projects
+ADD COLUMN IF NOT EXISTS geometry_precision smallint,
+ADD COLUMN IF NOT EXISTS simplify_tolerance_meters real;
@@ -0,0 +1,17 @@
+-- OSM features new, changed or deleted by each refresh of a project data
+-- extract, matched by osm_id. Deleted with the project.
+
+CREATE TABLE IF NOT EXISTS data_extract_changes (
+    id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    project_id integer NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    osm_id character varying NOT NULL,
+    -- NEW, CHANGED or DELETED
+    change character varying NOT NULL,
+    old_version integer,
+    new_version integer
+);
+ALTER TABLE data_extract_changes OWNER TO current_user;
+
+CREATE INDEX IF NOT EXISTS idx_data_extract_changes_project_id
+ON data_extract_changes USING btree (project_id, id);
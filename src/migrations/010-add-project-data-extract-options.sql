@@ -0,0 +1,5 @@
+-- OSM extract options (osm_category, geom_type, centroid, tiled) of the
+-- project data extract, reused to refresh it. NULL or empty for uploaded
+-- data extracts.
+ALTER TABLE IF EXISTS projects
+ADD COLUMN IF NOT EXISTS data_extract_options JSONB;
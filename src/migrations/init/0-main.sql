@@ -38,6 +38,8 @@ CREATE EXTENSION IF NOT EXISTS postgis_tiger_geocoder WITH SCHEMA tiger;
 CREATE EXTENSION IF NOT EXISTS postgis_topology WITH SCHEMA topology;
 -- Required for area-splitter PostGIS StraightSkeleton usage
 CREATE EXTENSION IF NOT EXISTS postgis_sfcgal WITH SCHEMA public;
+-- Required for trigram project search
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
 
 -- Extra
 SET default_tablespace = '';
@@ -16,7 +16,8 @@ ALTER TABLE users OWNER TO current_user;
 CREATE TABLE template_xlsforms (
     id integer NOT NULL,
     title character varying,
-    xls bytea
+    xls bytea,
+    source_hash character varying
 );
 ALTER TABLE template_xlsforms OWNER TO current_user;
 CREATE SEQUENCE template_xlsforms_id_seq
@@ -36,6 +37,50 @@ ALTER COLUMN id SET DEFAULT nextval(
 );
 
 
+-- array_to_string is only STABLE, so wrap the expressions in IMMUTABLE
+-- functions usable by a generated column and an expression index
+CREATE OR REPLACE FUNCTION project_search_vector(
+    project_name character varying,
+    slug character varying,
+    hashtags character varying [],
+    location_str character varying,
+    description character varying
+) RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT
+        setweight(to_tsvector('simple', coalesce(project_name, '')), 'A')
+        || setweight(
+            to_tsvector('simple', translate(coalesce(slug, ''), '-_', '  ')), 'A'
+        )
+        || setweight(
+            to_tsvector('simple', coalesce(array_to_string(hashtags, ' '), '')), 'B'
+        )
+        || setweight(to_tsvector('simple', coalesce(location_str, '')), 'C')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'D');
+$$;
+ALTER FUNCTION project_search_vector OWNER TO current_user;
+
+CREATE OR REPLACE FUNCTION project_search_text(
+    project_name character varying,
+    slug character varying,
+    hashtags character varying [],
+    location_str character varying,
+    description character varying
+) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT lower(concat_ws(
+        ' ',
+        project_name,
+        slug,
+        translate(slug, '-_', '  '),
+        array_to_string(hashtags, ' '),
+        location_str,
+        description
+    ));
+$$;
+ALTER FUNCTION project_search_text OWNER TO current_user;
+
+
 CREATE TABLE projects (
     id integer NOT NULL,
     field_mapping_app fieldmappingapp DEFAULT 'QField',
@@ -52,8 +97,10 @@ CREATE TABLE projects (
     status projectstatus NOT NULL DEFAULT 'DRAFT',
     visibility projectvisibility NOT NULL DEFAULT 'PUBLIC',
     xlsform_content bytea,
+    xlsform_digest character varying,
     data_extract_geojson JSONB,
     task_areas_geojson JSONB,
+    data_extract_options JSONB,
     hashtags character varying [],
     custom_tms_url character varying,
     basemap_stac_item_id character varying,
@@ -64,8 +111,15 @@ CREATE TABLE projects (
     basemap_attach_status character varying DEFAULT 'idle',
     basemap_attach_error text,
     basemap_attach_updated_at timestamp with time zone,
+    geometry_precision smallint,
+    simplify_tolerance_meters real,
     created_at timestamp with time zone NOT NULL DEFAULT now(),
-    updated_at timestamp with time zone DEFAULT now()
+    updated_at timestamp with time zone DEFAULT now(),
+    search_vector tsvector GENERATED ALWAYS AS (
+        project_search_vector(
+            project_name, slug, hashtags, location_str, description
+        )
+    ) STORED
 );
 ALTER TABLE projects OWNER TO current_user;
 CREATE SEQUENCE projects_id_seq
@@ -106,6 +160,43 @@ CREATE TABLE qgis_jobs (
 ALTER TABLE qgis_jobs OWNER TO current_user;
 
 
+CREATE TABLE xlsform_transform_cache (
+    cache_key character varying PRIMARY KEY,
+    xform_id character varying NOT NULL,
+    xlsform BYTEA NOT NULL,
+    xform_xml BYTEA NOT NULL,
+    size_bytes integer NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    last_used_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+ALTER TABLE xlsform_transform_cache OWNER TO current_user;
+
+
+CREATE TABLE slow_queries (
+    id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    recorded_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    duration_ms double precision NOT NULL,
+    query text NOT NULL,
+    params_shape JSONB,
+    call_site character varying,
+    request character varying,
+    plan JSONB
+);
+ALTER TABLE slow_queries OWNER TO current_user;
+
+
+CREATE TABLE data_extract_changes (
+    id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    project_id integer NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    osm_id character varying NOT NULL,
+    change character varying NOT NULL,
+    old_version integer,
+    new_version integer
+);
+ALTER TABLE data_extract_changes OWNER TO current_user;
+
+
 CREATE TABLE api_keys (
     id integer NOT NULL,
     user_sub character varying NOT NULL,
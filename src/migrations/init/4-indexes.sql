@@ -1,5 +1,12 @@
 CREATE INDEX idx_projects_outline ON projects USING gist (outline);
 
+CREATE INDEX idx_projects_search_vector ON projects USING gin (search_vector);
+
+CREATE INDEX idx_projects_search_trgm ON projects USING gin (
+    project_search_text(project_name, slug, hashtags, location_str, description)
+    gin_trgm_ops
+);
+
 CREATE INDEX idx_user_roles ON user_roles USING btree (
     project_id, user_sub
 );
@@ -7,3 +14,9 @@ CREATE INDEX idx_user_roles ON user_roles USING btree (
 CREATE INDEX idx_api_keys_hash ON api_keys USING btree (key_hash);
 
 CREATE INDEX idx_api_keys_user_sub ON api_keys USING btree (user_sub);
+
+CREATE INDEX idx_xlsform_transform_cache_last_used
+ON xlsform_transform_cache USING btree (last_used_at);
+
+CREATE INDEX idx_data_extract_changes_project_id
+ON data_extract_changes USING btree (project_id, id);
@@ -18,3 +18,8 @@ ALTER TABLE ONLY api_keys
 ADD CONSTRAINT api_keys_user_sub_fkey FOREIGN KEY (
     user_sub
 ) REFERENCES users (sub) ON DELETE CASCADE;
+
+ALTER TABLE ONLY data_extract_changes
+ADD CONSTRAINT data_extract_changes_project_id_fkey FOREIGN KEY (
+    project_id
+) REFERENCES projects (id) ON DELETE CASCADE;
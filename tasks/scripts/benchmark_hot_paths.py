@@ -0,0 +1,635 @@
+"""Micro-benchmarks for Field-TM hot paths, with a regression check.
+
+Run the benchmarks inside the backend container (JSON results on stdout):
+    docker compose exec -T backend python3 - run < tasks/scripts/benchmark_hot_paths.py
+
+Compare two result files anywhere (only needs the standard library):
+    python3 tasks/scripts/benchmark_hot_paths.py compare baseline.json latest.json
+
+See `just test bench`, `just test bench-baseline` and `just test bench-compare`.
+
+The benchmarks use synthetic, seeded data (an AOI, a building + road
+extract, a task grid and ODK submissions), so runs are comparable across
+machines and commits. Database-backed benchmarks (task splitting) use
+settings.FTM_DB_URL; like the app, area-splitter creates and drops its
+working tables there, so avoid running against a busy production database.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import platform
+import random
+import sys
+import tracemalloc
+from collections.abc import Callable
+from copy import deepcopy
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from io import BytesIO
+from statistics import mean, median, stdev
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from psycopg import AsyncConnection
+
+SEED = 42
+# Kathmandu, as used by the area-splitter test data
+CENTER_LON, CENTER_LAT = 85.3240, 27.7172
+AOI_SIZE_METERS = 1500
+BUILDING_COUNT = 2000
+ROAD_SPACING_METERS = 250
+TASK_GRID_CELLS_PER_SIDE = 10
+SUBMISSION_COUNT = 1000
+MULTIGEOM_FEATURE_COUNT = 2000
+
+DEFAULT_ROUNDS = 10
+MIN_ROUNDS = 3
+DEFAULT_MAX_SECONDS = 10.0
+DEFAULT_THRESHOLD = 0.10
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data generators
+# ---------------------------------------------------------------------------
+
+
+def meters_to_degrees(meters: float, lat: float = CENTER_LAT) -> tuple[float, float]:
+    """Convert a distance in meters to (lon, lat) degree offsets."""
+    dlat = meters / 111_320
+    dlon = meters / (111_320 * math.cos(math.radians(lat)))
+    return dlon, dlat
+
+
+def bbox_polygon(min_x: float, min_y: float, max_x: float, max_y: float) -> dict:
+    """GeoJSON Polygon for a bounding box."""
+    return {
+        "type": "Polygon",
+        "coordinates": [
+            [
+                [min_x, min_y],
+                [max_x, min_y],
+                [max_x, max_y],
+                [min_x, max_y],
+                [min_x, min_y],
+            ]
+        ],
+    }
+
+
+def make_aoi(size_meters: float = AOI_SIZE_METERS) -> dict:
+    """A square AOI FeatureCollection centred on CENTER_LON, CENTER_LAT."""
+    half_lon, half_lat = meters_to_degrees(size_meters / 2)
+    geometry = bbox_polygon(
+        CENTER_LON - half_lon,
+        CENTER_LAT - half_lat,
+        CENTER_LON + half_lon,
+        CENTER_LAT + half_lat,
+    )
+    return {
+        "type": "FeatureCollection",
+        "features": [{"type": "Feature", "geometry": geometry, "properties": {}}],
+    }
+
+
+def aoi_bbox(aoi: dict) -> tuple[float, float, float, float]:
+    """Bounding box of the first AOI feature."""
+    ring = aoi["features"][0]["geometry"]["coordinates"][0]
+    xs, ys = [x for x, _ in ring], [y for _, y in ring]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def make_buildings(
+    aoi: dict, count: int = BUILDING_COUNT, seed: int = SEED
+) -> list[dict]:
+    """Small rectangular building footprints scattered within the AOI."""
+    rng = random.Random(seed)  # noqa: S311
+    min_x, min_y, max_x, max_y = aoi_bbox(aoi)
+    features = []
+    for index in range(count):
+        width_lon, width_lat = meters_to_degrees(rng.uniform(6, 20))
+        x = rng.uniform(min_x, max_x - width_lon)
+        y = rng.uniform(min_y, max_y - width_lat)
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": bbox_polygon(x, y, x + width_lon, y + width_lat),
+                "properties": {
+                    "osm_id": 1_000_000 + index,
+                    "tags": {"building": rng.choice(["yes", "house", "school"])},
+                },
+            }
+        )
+    return features
+
+
+def make_roads(aoi: dict, spacing_meters: float = ROAD_SPACING_METERS) -> list[dict]:
+    """A regular grid of residential roads crossing the AOI."""
+    min_x, min_y, max_x, max_y = aoi_bbox(aoi)
+    step_lon, step_lat = meters_to_degrees(spacing_meters)
+    lines = []
+    x = min_x + step_lon
+    while x < max_x:
+        lines.append([[x, min_y], [x, max_y]])
+        x += step_lon
+    y = min_y + step_lat
+    while y < max_y:
+        lines.append([[min_x, y], [max_x, y]])
+        y += step_lat
+    return [
+        {
+            "type": "Feature",
+            "geometry": {"type": "LineString", "coordinates": coordinates},
+            "properties": {
+                "osm_id": 2_000_000 + index,
+                "tags": {"highway": "residential"},
+            },
+        }
+        for index, coordinates in enumerate(lines)
+    ]
+
+
+def make_extract(aoi: dict) -> dict:
+    """OSM-like data extract with buildings and roads."""
+    return {
+        "type": "FeatureCollection",
+        "features": make_buildings(aoi) + make_roads(aoi),
+    }
+
+
+def make_task_grid(aoi: dict, cells_per_side: int = TASK_GRID_CELLS_PER_SIDE) -> dict:
+    """Square task areas tiling the AOI."""
+    min_x, min_y, max_x, max_y = aoi_bbox(aoi)
+    step_x = (max_x - min_x) / cells_per_side
+    step_y = (max_y - min_y) / cells_per_side
+    features = []
+    for row in range(cells_per_side):
+        for col in range(cells_per_side):
+            x, y = min_x + col * step_x, min_y + row * step_y
+            features.append(
+                {
+                    "type": "Feature",
+                    "geometry": bbox_polygon(x, y, x + step_x, y + step_y),
+                    "properties": {"task_id": len(features) + 1},
+                }
+            )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def make_multigeom_featcol(
+    buildings: list[dict], count: int = MULTIGEOM_FEATURE_COUNT
+) -> dict:
+    """Features with MultiPolygon geometries, made from pairs of buildings."""
+    features = []
+    for index in range(count):
+        first = buildings[(2 * index) % len(buildings)]
+        second = buildings[(2 * index + 1) % len(buildings)]
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "MultiPolygon",
+                    "coordinates": [
+                        first["geometry"]["coordinates"],
+                        second["geometry"]["coordinates"],
+                    ],
+                },
+                "properties": {"osm_id": index},
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def to_javarosa(geometry: dict) -> str:
+    """Encode a Point or Polygon as JavaRosa (lat lon alt acc;...)."""
+    if geometry["type"] == "Point":
+        points = [geometry["coordinates"]]
+    else:
+        points = geometry["coordinates"][0]
+    return ";".join(f"{lat} {lon} 0.0 0.0" for lon, lat in points)
+
+
+def make_odk_submissions(
+    buildings: list[dict], count: int = SUBMISSION_COUNT, seed: int = SEED
+) -> list[dict]:
+    """ODK Central style submission JSON, one per (cycled) building."""
+    rng = random.Random(seed)  # noqa: S311
+    submissions = []
+    for index in range(count):
+        building = buildings[index % len(buildings)]
+        ring = building["geometry"]["coordinates"][0]
+        entrance = {"type": "Point", "coordinates": ring[0]}
+        submissions.append(
+            {
+                "__id": f"uuid:{index:08d}-0000-4000-8000-000000000000",
+                "meta": {"instanceID": f"uuid:{index:08d}"},
+                "__system": {"submitterName": "benchmark", "reviewState": None},
+                "start": "2025-01-01T10:00:00.000+05:45",
+                "end": "2025-01-01T10:05:00.000+05:45",
+                "xid": str(building["properties"]["osm_id"]),
+                "xlocation": to_javarosa(building["geometry"]),
+                "survey_questions": {
+                    "building_use": rng.choice(["residential", "commercial"]),
+                    "building_levels": rng.randint(1, 6),
+                    "building_material": rng.choice(["brick", "concrete", "wood"]),
+                },
+                "verification": {"digitisation_correct": "yes", "image": None},
+                "entrance": f"entrance-{index}",
+                "entrance_geom": to_javarosa(entrance),
+            }
+        )
+    return submissions
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Benchmark:
+    """A benchmarked call, with optional per-round (untimed) setup.
+
+    If track_memory, the peak memory allocated by one extra (untimed) call
+    is also reported, as tracing allocations slows the call down.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    setup: Optional[Callable[[], tuple]] = None
+    params: dict = field(default_factory=dict)
+    track_memory: bool = False
+
+
+async def build_benchmarks(
+    db_url: Optional[str], db: Optional["AsyncConnection"]
+) -> list[Benchmark]:
+    """Build all benchmarks, importing app code only here.
+
+    Database benchmarks are skipped if no connection is given.
+    """
+    from area_splitter import SplittingAlgorithm
+    from area_splitter.splitter import split_by_sql, split_by_square
+    from osm_fieldwork.conversion_to_xlsform import convert_to_xlsform
+    from osm_fieldwork.update_xlsform import append_field_mapping_fields
+    from osm_fieldwork.xlsforms import buildings as buildings_yaml
+    from psycopg import adapters
+    from psycopg.pq import Format
+
+    from app.central.central_crud import convert_odk_submission_json_to_geojson
+    from app.db.enums import DbGeomType
+    from app.db.models import RawJsonLoader
+    from app.helpers.geojson_serializer import dumps
+    from app.helpers.geometry_utils import (
+        geojson_to_javarosa_geom,
+        javarosa_to_geojson_geom,
+        multigeom_to_singlegeom,
+    )
+    from app.htmx.map_helpers import render_leaflet_map
+
+    aoi = make_aoi()
+    extract = make_extract(aoi)
+    buildings = [
+        feature
+        for feature in extract["features"]
+        if "building" in feature["properties"]["tags"]
+    ]
+    building_featcol = {"type": "FeatureCollection", "features": buildings}
+    task_grid = make_task_grid(aoi)
+    multigeom_featcol = make_multigeom_featcol(buildings)
+    submissions = make_odk_submissions(buildings)
+    javarosa_strings = [to_javarosa(feature["geometry"]) for feature in buildings]
+    buildings_xlsform = convert_to_xlsform(buildings_yaml)
+    # A stored extract, as received by psycopg for a jsonb column
+    extract_jsonb = memoryview(json.dumps(extract).encode())
+    jsonb_oid = adapters.types["jsonb"].oid
+    jsonb_loader = adapters.get_loader(jsonb_oid, Format.TEXT)(jsonb_oid)
+    raw_json_loader = RawJsonLoader(jsonb_oid)
+
+    async def encode_all() -> None:
+        for feature in buildings:
+            await geojson_to_javarosa_geom(feature["geometry"])
+
+    async def decode_all() -> None:
+        for javarosa in javarosa_strings:
+            await javarosa_to_geojson_geom(javarosa)
+
+    async def inject_fields(xlsform: BytesIO) -> None:
+        await append_field_mapping_fields(
+            xlsform,
+            form_name="benchmark",
+            new_geom_type=DbGeomType.POLYGON,
+        )
+
+    def load_and_serialize_geojson() -> bytes:
+        return json.dumps(jsonb_loader.load(extract_jsonb)).encode()
+
+    def pass_through_geojson() -> bytes:
+        return raw_json_loader.load(extract_jsonb)
+
+    def render_map() -> None:
+        render_leaflet_map(
+            "benchmark-map",
+            [
+                {"data": building_featcol, "name": "Data extract"},
+                {"data": task_grid, "name": "Tasks", "color": "#d73f3f"},
+            ],
+        )
+
+    benchmarks = [
+        Benchmark(
+            "geojson_to_javarosa_geom",
+            encode_all,
+            params={"geometries": len(buildings)},
+        ),
+        Benchmark(
+            "javarosa_to_geojson_geom",
+            decode_all,
+            params={"geometries": len(javarosa_strings)},
+        ),
+        Benchmark(
+            "convert_odk_submission_json_to_geojson",
+            convert_odk_submission_json_to_geojson,
+            # The conversion mutates submissions, so copy them for every round
+            setup=lambda: (deepcopy(submissions),),
+            params={"submissions": len(submissions)},
+        ),
+        Benchmark(
+            "multigeom_to_singlegeom",
+            multigeom_to_singlegeom,
+            setup=lambda: (multigeom_featcol,),
+            params={"features": len(multigeom_featcol["features"])},
+        ),
+        Benchmark(
+            "render_leaflet_map",
+            render_map,
+            params={
+                "features": len(buildings) + len(task_grid["features"]),
+            },
+        ),
+        Benchmark(
+            "append_field_mapping_fields",
+            inject_fields,
+            setup=lambda: (BytesIO(buildings_xlsform),),
+            params={"form": "buildings", "geom_type": "POLYGON"},
+        ),
+        Benchmark(
+            "json_dumps_featcol",
+            json.dumps,
+            setup=lambda: (extract,),
+            params={"features": len(extract["features"])},
+            track_memory=True,
+        ),
+        Benchmark(
+            "geojson_serializer_dumps",
+            dumps,
+            setup=lambda: (extract,),
+            params={"features": len(extract["features"])},
+            track_memory=True,
+        ),
+        Benchmark(
+            "geojson_serializer_dumps_rounded",
+            dumps,
+            setup=lambda: (extract, 6),
+            params={"features": len(extract["features"]), "precision": 6},
+            track_memory=True,
+        ),
+        Benchmark(
+            "stored_geojson_load_and_serialize",
+            load_and_serialize_geojson,
+            params={"bytes": len(extract_jsonb)},
+            track_memory=True,
+        ),
+        Benchmark(
+            "stored_geojson_passthrough",
+            pass_through_geojson,
+            params={"bytes": len(extract_jsonb)},
+            track_memory=True,
+        ),
+    ]
+
+    if db is None:
+        print("Skipping database benchmarks", file=sys.stderr)
+        return benchmarks
+
+    from app.db.postgis_utils import split_geojson_by_task_areas
+
+    benchmarks += [
+        Benchmark(
+            "split_geojson_by_task_areas",
+            split_geojson_by_task_areas,
+            setup=lambda: (db, building_featcol, 0, task_grid),
+            params={
+                "features": len(buildings),
+                "tasks": len(task_grid["features"]),
+            },
+        ),
+        Benchmark(
+            "split_by_square",
+            split_by_square,
+            setup=lambda: (deepcopy(aoi), db_url, 100, deepcopy(extract)),
+            params={"meters": 100, "features": len(extract["features"])},
+        ),
+        Benchmark(
+            "split_by_sql",
+            lambda aoi_copy, extract_copy: split_by_sql(
+                aoi_copy,
+                db_url,
+                osm_extract=extract_copy,
+                algorithm=SplittingAlgorithm.AVG_BUILDING_SKELETON,
+                algorithm_params={"num_buildings": 20},
+            ),
+            setup=lambda: (deepcopy(aoi), deepcopy(extract)),
+            params={"num_buildings": 20, "features": len(extract["features"])},
+        ),
+    ]
+    return benchmarks
+
+
+async def call_once(benchmark: Benchmark) -> float:
+    """Run one round of a benchmark, returning the time it took."""
+    args = benchmark.setup() if benchmark.setup else ()
+    start = perf_counter()
+    result = benchmark.func(*args)
+    if inspect.isawaitable(result):
+        await result
+    return perf_counter() - start
+
+
+async def measure(benchmark: Benchmark, rounds: int, max_seconds: float) -> list[float]:
+    """Time a benchmark, after one untimed warmup round.
+
+    Stops early once max_seconds is spent, but always runs MIN_ROUNDS.
+    """
+    await call_once(benchmark)
+    timings: list[float] = []
+    budget_start = perf_counter()
+    while len(timings) < rounds:
+        timings.append(await call_once(benchmark))
+        if len(timings) >= MIN_ROUNDS and perf_counter() - budget_start > max_seconds:
+            break
+    return timings
+
+
+async def measure_peak_memory(benchmark: Benchmark) -> int:
+    """Peak memory (bytes) allocated during one round of a benchmark."""
+    tracemalloc.start()
+    try:
+        await call_once(benchmark)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def summarise(timings: list[float]) -> dict:
+    """Summary statistics (seconds) for a list of timings."""
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": median(timings),
+        "mean": mean(timings),
+        "stdev": stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the benchmarks and write JSON results."""
+    import psycopg
+
+    from app.config import settings
+
+    if args.no_db or not settings.FTM_DB_URL:
+        results = await run_benchmarks(await build_benchmarks(None, None), args)
+    else:
+        async with await psycopg.AsyncConnection.connect(settings.FTM_DB_URL) as db:
+            benchmarks = await build_benchmarks(settings.FTM_DB_URL, db)
+            results = await run_benchmarks(benchmarks, args)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": SEED,
+        "benchmarks": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        with open(args.output, "w", encoding="utf-8") as results_file:
+            results_file.write(output + "\n")
+    return 1 if any("error" in result for result in results.values()) else 0
+
+
+async def run_benchmarks(
+    benchmarks: list[Benchmark], args: argparse.Namespace
+) -> dict[str, dict]:
+    """Measure each benchmark, recording errors rather than stopping."""
+    if args.filter:
+        benchmarks = [b for b in benchmarks if args.filter in b.name]
+
+    results = {}
+    for benchmark in benchmarks:
+        print(f"{benchmark.name} ...", end=" ", file=sys.stderr, flush=True)
+        try:
+            timings = await measure(benchmark, args.rounds, args.max_seconds)
+            peak_memory = (
+                await measure_peak_memory(benchmark) if benchmark.track_memory else None
+            )
+        except Exception as e:
+            print(f"failed: {e}", file=sys.stderr)
+            results[benchmark.name] = {"error": str(e), "params": benchmark.params}
+            continue
+        results[benchmark.name] = {**summarise(timings), "params": benchmark.params}
+        if peak_memory is not None:
+            results[benchmark.name]["peak_memory_bytes"] = peak_memory
+        print(
+            f"median {results[benchmark.name]['median'] * 1000:.1f} ms",
+            file=sys.stderr,
+        )
+    return results
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare two result files, failing if any median regressed."""
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)["benchmarks"]
+    with open(args.current, encoding="utf-8") as current_file:
+        current = json.load(current_file)["benchmarks"]
+
+    regressions = 0
+    print(f"{'benchmark':<40} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name in sorted(baseline.keys() | current.keys()):
+        before, after = baseline.get(name, {}), current.get(name, {})
+        if "median" not in after:
+            status = "ERROR" if "error" in after else "missing"
+            print(f"{name:<40} {'':>10} {'':>10} {'':>8}  {status}")
+            regressions += status == "ERROR"
+            continue
+        if "median" not in before:
+            print(f"{name:<40} {'':>10} {after['median'] * 1000:>8.1f}ms {'':>8}  new")
+            continue
+        if before.get("params") != after.get("params"):
+            print(f"{name:<40} parameters changed, not comparable")
+            continue
+
+        change = after["median"] / before["median"] - 1
+        if change > args.threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        print(
+            f"{name:<40} {before['median'] * 1000:>8.1f}ms "
+            f"{after['median'] * 1000:>8.1f}ms {change:>+8.1%}  {status}"
+        )
+
+    if regressions:
+        print(
+            f"\n{regressions} benchmark(s) regressed by more than {args.threshold:.0%}"
+        )
+        return 1
+    return 0
+
+
+def main() -> int:
+    """Parse arguments and dispatch to a sub-command."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    run_parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=DEFAULT_MAX_SECONDS,
+        help="Time budget per benchmark",
+    )
+    run_parser.add_argument("--filter", help="Only run benchmarks matching this")
+    run_parser.add_argument("--no-db", action="store_true", help="Skip DB benchmarks")
+    run_parser.add_argument("--output", default="-", help="Results file (- = stdout)")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative median slowdown flagged as a regression (0.1 = 10%%)",
+    )
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        return compare(args)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Measure backend cold-start import time and idle RSS per worker.
+
+Run inside the backend container:
+    docker compose exec -T backend python3 - < tasks/scripts/benchmark_startup.py
+
+The script:
+  1. Imports app.main in fresh interpreters with `-X importtime`, several
+     times, and takes the median cumulative import time.
+  2. Records the RSS of each interpreter once the app has been created
+     (i.e. what an idle uvicorn worker holds before serving requests).
+  3. Lists the slowest top-level packages, and any heavy dependency that
+     should be lazily imported (see app/helpers/lazy_imports.py).
+  4. Exits non-zero if a target from docs/dev/Backend.md is exceeded.
+
+Set STARTUP_BENCHMARK_ROUNDS to change the number of runs (default 5).
+"""
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from statistics import median
+
+# Keep in sync with "Startup time & memory" in docs/dev/Backend.md
+TARGET_IMPORT_SECONDS = 2.0
+TARGET_IDLE_RSS_MB = 150
+
+ROUNDS = int(os.getenv("STARTUP_BENCHMARK_ROUNDS", "5"))
+TOP_PACKAGES = 15
+
+CHILD_CODE = """
+import json, sys
+import app.main
+from app.helpers.lazy_imports import HEAVY_MODULES
+
+rss_kb = 0
+with open("/proc/self/status") as status:
+    for line in status:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({
+    "rss_kb": rss_kb,
+    "heavy": sorted(name for name in HEAVY_MODULES if name in sys.modules),
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> tuple[float, dict[str, float]]:
+    """Parse `-X importtime` output.
+
+    Returns the cumulative seconds for app.main, and self seconds summed
+    per top-level package.
+    """
+    total_us = 0
+    per_package: dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        module = name.strip()
+        per_package[module.split(".")[0]] += int(self_us) / 1e6
+        if module == "app.main":
+            total_us = int(cumulative_us)
+    return total_us / 1e6, per_package
+
+
+def run_once() -> tuple[float, dict[str, float], dict]:
+    """Import the app in a fresh interpreter and collect measurements."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", CHILD_CODE],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+        raise SystemExit(f"Importing app.main failed ({result.returncode})")
+    import_seconds, per_package = parse_importtime(result.stderr)
+    return import_seconds, per_package, json.loads(result.stdout.splitlines()[-1])
+
+
+def main() -> int:
+    """Run the benchmark and print a report."""
+    import_times, rss_values = [], []
+    package_times: dict[str, list[float]] = defaultdict(list)
+    heavy: set[str] = set()
+
+    for _ in range(ROUNDS):
+        import_seconds, per_package, child = run_once()
+        import_times.append(import_seconds)
+        rss_values.append(child["rss_kb"] / 1024)
+        heavy.update(child["heavy"])
+        for package, seconds in per_package.items():
+            package_times[package].append(seconds)
+
+    import_seconds = median(import_times)
+    rss_mb = median(rss_values)
+
+    print(f"Slowest top-level packages (median self time over {ROUNDS} runs):")
+    slowest = sorted(
+        ((median(times), package) for package, times in package_times.items()),
+        reverse=True,
+    )[:TOP_PACKAGES]
+    for seconds, package in slowest:
+        print(f"  {package:<32} {seconds * 1000:>8.1f} ms")
+
+    print()
+    print(f"import app.main: {import_seconds:.2f} s (target {TARGET_IMPORT_SECONDS} s)")
+    print(f"idle RSS:        {rss_mb:.0f} MB (target {TARGET_IDLE_RSS_MB} MB)")
+
+    failed = False
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(sorted(heavy))}")
+        failed = True
+    if import_seconds > TARGET_IMPORT_SECONDS or rss_mb > TARGET_IDLE_RSS_MB:
+        print("Startup target exceeded")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Benchmark the XLSForm field injector against the bundled templates.
+
+Run inside the backend container:
+    docker compose exec -T backend python3 - < tasks/scripts/benchmark_xlsform_injector.py
+
+The script:
+  1. Converts each bundled osm-fieldwork YAML template to an XLSForm.
+  2. Times append_field_mapping_fields for each form, first with a cold
+     component cache, then warm (components reused across forms).
+  3. Prints per-form timings and the overall speedup.
+"""
+
+import asyncio
+import sys
+from io import BytesIO
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+from osm_fieldwork import update_xlsform
+from osm_fieldwork.conversion_to_xlsform import convert_to_xlsform
+from osm_fieldwork.enums import DbGeomType
+from osm_fieldwork.xlsforms import xlsforms_path
+
+ROUNDS = 5
+
+
+async def time_injection(xlsform: bytes) -> float:
+    """Return the seconds taken to inject fields into one XLSForm."""
+    start = perf_counter()
+    await update_xlsform.append_field_mapping_fields(
+        BytesIO(xlsform),
+        form_name="benchmark",
+        new_geom_type=DbGeomType.POLYGON,
+        need_verification_fields=True,
+    )
+    return perf_counter() - start
+
+
+async def main() -> int:
+    """Run the benchmark and print results."""
+    yaml_paths = sorted(Path(xlsforms_path).glob("*.yaml"))
+    if not yaml_paths:
+        print(f"No YAML templates found in {xlsforms_path}", file=sys.stderr)
+        return 1
+
+    forms = {path.stem: convert_to_xlsform(str(path)) for path in yaml_paths}
+
+    print(f"{'form':<24} {'cold (ms)':>10} {'warm (ms)':>10}")
+    cold_total = warm_total = 0.0
+    for name, xlsform in forms.items():
+        cold_runs, warm_runs = [], []
+        for _ in range(ROUNDS):
+            update_xlsform._build_form_components.cache_clear()
+            cold_runs.append(await time_injection(xlsform))
+            warm_runs.append(await time_injection(xlsform))
+        cold, warm = median(cold_runs), median(warm_runs)
+        cold_total += cold
+        warm_total += warm
+        print(f"{name:<24} {cold * 1000:>10.1f} {warm * 1000:>10.1f}")
+
+    print(
+        f"\nTotal: cold {cold_total * 1000:.1f} ms, warm {warm_total * 1000:.1f} ms "
+        f"({cold_total / warm_total:.2f}x)"
+    )
+    print(update_xlsform._build_form_components.cache_info())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,1226 @@
+"""Load-test the backend, with local stand-ins for its external services.
+
+Start the stand-ins, and a backend configured to use them:
+    docker compose -f compose.yaml -f contrib/load_testing/compose.yaml up -d
+
+Then run the load generator inside the backend container:
+    docker compose exec -T backend python3 - run --concurrency 20 \
+        < tasks/scripts/load_test.py
+
+The `fakes` command serves the few ODK Central, QFieldCloud, raw-data-api
+and QGIS wrapper endpoints that project creation uses (via OdkCentralAsync,
+pyodk, qfieldcloud-sdk, raw-data-api-py and _call_qgis_wrapper), under
+/odk, /qfc, /raw-data and /qgis, with injectable latency. State is kept in
+memory only.
+
+The `run` command:
+  1. Creates an API key for localadmin and looks up the buildings XLSForm
+     template and existing project IDs (via direct DB access).
+  2. Runs virtual users for the given duration, each repeatedly picking a
+     weighted scenario: HTMX page views, /api/v1 reads, or end-to-end ODK /
+     QField project creation against the stand-ins (with cleanup=true).
+  3. Samples pg_stat_activity to track how many app DB connections are busy.
+  4. Prints p50/p95/p99 latency per route and DB pool saturation, and can
+     write the raw results as JSON with --output.
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import random
+import re
+import sys
+import zipfile
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import count
+from statistics import fmean, quantiles
+from time import perf_counter
+from uuid import uuid4
+
+import aiohttp
+from aiohttp import web
+
+APP_NAME = "ftm-load-test"
+DEFAULT_FAKES_PORT = 8930
+DEFAULT_FAKES_URL = f"http://load-test-fakes:{DEFAULT_FAKES_PORT}"
+FAKE_USER = "loadtest@example.org"
+FAKE_PASSWORD = "Password1234"  # noqa: S105
+PROJECT_MANAGER_ROLE_ID = 5
+# Size of each fake OSM feature, in degrees (roughly 10 m)
+FEATURE_SIZE = 0.0001
+# Kathmandu, Nepal: AOIs are placed at random offsets around this point
+AOI_ORIGIN = (85.30, 27.71)
+AOI_SIZE = 0.005
+SATURATION_SAMPLE_SECONDS = 0.5
+MAX_ERRORS_KEPT = 5
+MIN_PERCENTILE_SAMPLES = 2
+
+
+def now_iso() -> str:
+    """Current time in the ISO format Central and QFieldCloud return."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def geometry_bbox(geometry: dict) -> tuple[float, float, float, float]:
+    """Return (min x, min y, max x, max y) for any GeoJSON geometry."""
+    xs, ys = [], []
+
+    def walk(coords):
+        if coords and isinstance(coords[0], (int, float)):
+            xs.append(coords[0])
+            ys.append(coords[1])
+            return
+        for part in coords:
+            walk(part)
+
+    walk(geometry.get("coordinates", []))
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def make_aoi(rng: random.Random) -> dict:
+    """A small square AOI at a random offset, so projects don't overlap."""
+    x = AOI_ORIGIN[0] + rng.uniform(-0.05, 0.05)
+    y = AOI_ORIGIN[1] + rng.uniform(-0.05, 0.05)
+    return {
+        "type": "Polygon",
+        "coordinates": [
+            [
+                [x, y],
+                [x + AOI_SIZE, y],
+                [x + AOI_SIZE, y + AOI_SIZE],
+                [x, y + AOI_SIZE],
+                [x, y],
+            ]
+        ],
+    }
+
+
+def make_osm_features(
+    bbox: tuple[float, float, float, float], geom_type: str, limit: int
+) -> dict:
+    """Generate a grid of OSM-like features inside a bbox."""
+    min_x, min_y, max_x, max_y = bbox
+    columns = max(1, int((max_x - min_x) / (FEATURE_SIZE * 3)))
+    features = []
+    for index in range(limit):
+        row, column = divmod(index, columns)
+        x = min_x + FEATURE_SIZE + column * FEATURE_SIZE * 3
+        y = min_y + FEATURE_SIZE + row * FEATURE_SIZE * 3
+        if y + FEATURE_SIZE > max_y:
+            break
+        if geom_type == "point":
+            geometry = {"type": "Point", "coordinates": [x, y]}
+        elif geom_type == "line":
+            geometry = {
+                "type": "LineString",
+                "coordinates": [[x, y], [x + FEATURE_SIZE, y + FEATURE_SIZE]],
+            }
+        else:
+            geometry = {
+                "type": "Polygon",
+                "coordinates": [
+                    [
+                        [x, y],
+                        [x + FEATURE_SIZE, y],
+                        [x + FEATURE_SIZE, y + FEATURE_SIZE],
+                        [x, y + FEATURE_SIZE],
+                        [x, y],
+                    ]
+                ],
+            }
+        features.append(
+            {
+                "type": "Feature",
+                "geometry": geometry,
+                "properties": {
+                    "osm_id": 1_000_000 + index,
+                    "tags": {"building": "yes"},
+                    "version": 1,
+                    "changeset": 1,
+                    "timestamp": now_iso(),
+                },
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+# --------------------------------------------------------------------------
+# Stand-in servers
+# --------------------------------------------------------------------------
+
+Handler = Callable[..., Awaitable[web.StreamResponse]]
+
+
+async def read_payload(request: web.Request) -> dict:
+    """Read a JSON or form body, returning an empty dict for anything else."""
+    if request.content_type == "application/json":
+        return await request.json()
+    if request.content_type in (
+        "application/x-www-form-urlencoded",
+        "multipart/form-data",
+    ):
+        form = await request.post()
+        return {key: value for key, value in form.items() if isinstance(value, str)}
+    # Drain the body (e.g. an uploaded XForm) so the connection can be reused
+    await request.read()
+    return {}
+
+
+class FakeService:
+    """A set of routes served under a path prefix, e.g. /odk/v1."""
+
+    name = ""
+    prefix = ""
+
+    def __init__(self):
+        """Register the service routes."""
+        self.routes: list[tuple[str, re.Pattern, Handler]] = []
+        self.ids = count(1)
+
+    def add(self, method: str, path: str, handler: Handler) -> None:
+        """Add a route. `{name}` segments are passed to the handler as kwargs.
+
+        Trailing slashes are optional, as clients disagree on them.
+        """
+        pattern = re.sub(r"{(\w+)}", r"(?P<\1>[^/]+?)", path.strip("/"))
+        self.routes.append((method, re.compile(f"^{pattern}/?$"), handler))
+
+    async def dispatch(self, request: web.Request, path: str) -> web.StreamResponse:
+        """Call the handler matching the method and path (without prefix)."""
+        for method, pattern, handler in self.routes:
+            if method != request.method:
+                continue
+            match = pattern.match(path)
+            if match:
+                return await handler(request, **match.groupdict())
+        await request.read()
+        return web.json_response(
+            {"message": f"{self.name} stand-in has no route {request.method} {path}"},
+            status=404,
+        )
+
+    async def success(self, request: web.Request, **_kwargs) -> web.Response:
+        """Generic {"success": true} response."""
+        await read_payload(request)
+        return web.json_response({"success": True})
+
+
+class FakeOdkCentral(FakeService):
+    """ODK Central API, as used by OdkCentralAsync and pyodk."""
+
+    name = "odk"
+    prefix = "/odk/v1/"
+
+    def __init__(self):
+        """Register the Central routes used during project creation."""
+        super().__init__()
+        self.projects: dict[str, dict] = {}
+        # (project id, dataset name) -> {"properties": [...], "entities": {...}}
+        self.datasets: dict[tuple[str, str], dict] = {}
+
+        self.add("POST", "sessions", self.create_session)
+        self.add("GET", "users/current", self.current_user)
+        self.add("GET", "roles", self.list_roles)
+        self.add("POST", "users", self.create_user)
+        self.add("PATCH", "users/{user_id}", self.current_user)
+        self.add("GET", "projects", self.list_projects)
+        self.add("POST", "projects", self.create_project)
+        self.add("DELETE", "projects/{project_id}", self.delete_project)
+        self.add("GET", "projects/{project_id}/datasets", self.list_datasets)
+        self.add("POST", "projects/{project_id}/datasets", self.create_dataset)
+        self.add(
+            "GET",
+            "projects/{project_id}/datasets/{dataset}/properties",
+            self.list_properties,
+        )
+        self.add(
+            "POST",
+            "projects/{project_id}/datasets/{dataset}/properties",
+            self.create_property,
+        )
+        self.add(
+            "GET",
+            "projects/{project_id}/datasets/{dataset}.svc/Entities",
+            self.entity_table,
+        )
+        self.add(
+            "POST",
+            "projects/{project_id}/datasets/{dataset}/entities",
+            self.create_entities,
+        )
+        self.add(
+            "PATCH",
+            "projects/{project_id}/datasets/{dataset}/entities/{entity_id}",
+            self.update_entity,
+        )
+        self.add("POST", "projects/{project_id}/forms", self.create_form)
+        self.add("POST", "projects/{project_id}/forms/{form_id}/draft", self.success)
+        self.add(
+            "POST",
+            "projects/{project_id}/forms/{form_id}/draft/attachments/{name}",
+            self.success,
+        )
+        self.add(
+            "POST",
+            "projects/{project_id}/forms/{form_id}/draft/publish",
+            self.success,
+        )
+        self.add("POST", "projects/{project_id}/app-users", self.create_app_user)
+        self.add(
+            "POST",
+            "projects/{project_id}/assignments/{role_id}/{actor_id}",
+            self.success,
+        )
+        self.add(
+            "POST",
+            "projects/{project_id}/forms/{form_id}/assignments/{role_id}/{actor_id}",
+            self.success,
+        )
+
+    async def create_session(self, request: web.Request) -> web.Response:
+        """Log in, returning a bearer token."""
+        await read_payload(request)
+        return web.json_response(
+            {"token": uuid4().hex, "expiresAt": now_iso(), "createdAt": now_iso()}
+        )
+
+    async def current_user(self, request: web.Request, **_kwargs) -> web.Response:
+        """The logged in user (also used by pyodk to verify cached tokens)."""
+        await read_payload(request)
+        return web.json_response(
+            {"id": 1, "type": "user", "displayName": "Load Test", "email": FAKE_USER}
+        )
+
+    async def list_roles(self, request: web.Request) -> web.Response:
+        """Central's built-in roles."""
+        return web.json_response(
+            [
+                {"id": 1, "name": "Administrator", "system": "admin"},
+                {"id": 2, "name": "App User", "system": "app-user"},
+                {
+                    "id": PROJECT_MANAGER_ROLE_ID,
+                    "name": "Project Manager",
+                    "system": "manager",
+                },
+            ]
+        )
+
+    async def create_user(self, request: web.Request) -> web.Response:
+        """Create a web user."""
+        payload = await read_payload(request)
+        return web.json_response(
+            {"id": next(self.ids), "email": payload.get("email"), "type": "user"}
+        )
+
+    def _project(self, project_id: int, name: str) -> dict:
+        return {"id": project_id, "name": name, "createdAt": now_iso()}
+
+    async def list_projects(self, request: web.Request) -> web.Response:
+        """List projects created on this stand-in."""
+        return web.json_response(list(self.projects.values()))
+
+    async def create_project(self, request: web.Request) -> web.Response:
+        """Create a project."""
+        payload = await read_payload(request)
+        project = self._project(next(self.ids), payload.get("name", "project"))
+        self.projects[str(project["id"])] = project
+        return web.json_response(project)
+
+    async def delete_project(self, request: web.Request, project_id: str):
+        """Delete a project and its datasets."""
+        self.projects.pop(project_id, None)
+        for key in [key for key in self.datasets if key[0] == project_id]:
+            del self.datasets[key]
+        return web.json_response({"success": True})
+
+    async def list_datasets(self, request: web.Request, project_id: str):
+        """List a project's datasets (entity lists)."""
+        return web.json_response(
+            [
+                {"name": name, "projectId": int(project_id), "createdAt": now_iso()}
+                for pid, name in self.datasets
+                if pid == project_id
+            ]
+        )
+
+    def _dataset(self, project_id: str, dataset: str) -> dict:
+        return self.datasets.setdefault(
+            (project_id, dataset), {"properties": [], "entities": {}}
+        )
+
+    async def create_dataset(self, request: web.Request, project_id: str):
+        """Create a dataset."""
+        payload = await read_payload(request)
+        name = payload.get("name", "features")
+        self._dataset(project_id, name)
+        return web.json_response(
+            {"name": name, "projectId": int(project_id), "createdAt": now_iso()}
+        )
+
+    async def list_properties(
+        self, request: web.Request, project_id: str, dataset: str
+    ) -> web.Response:
+        """List dataset properties."""
+        properties = self._dataset(project_id, dataset)["properties"]
+        return web.json_response([{"name": name} for name in properties])
+
+    async def create_property(
+        self, request: web.Request, project_id: str, dataset: str
+    ) -> web.Response:
+        """Add a dataset property."""
+        payload = await read_payload(request)
+        properties = self._dataset(project_id, dataset)["properties"]
+        if payload.get("name") in properties:
+            return web.json_response({"code": 409.3}, status=409)
+        properties.append(payload.get("name"))
+        return web.json_response({"success": True})
+
+    async def entity_table(
+        self, request: web.Request, project_id: str, dataset: str
+    ) -> web.Response:
+        """OData table of a dataset's entities."""
+        entities = self._dataset(project_id, dataset)["entities"]
+        return web.json_response({"value": list(entities.values())})
+
+    async def create_entities(
+        self, request: web.Request, project_id: str, dataset: str
+    ) -> web.Response:
+        """Create entities, singly or in bulk."""
+        payload = await read_payload(request)
+        entities = self._dataset(project_id, dataset)["entities"]
+        for entity in payload.get("entities", [payload]):
+            entity_id = entity.get("uuid") or str(uuid4())
+            entities[entity_id] = {
+                "__id": entity_id,
+                "label": entity.get("label"),
+                **(entity.get("data") or {}),
+                "__system": {"version": 1, "createdAt": now_iso()},
+            }
+        if "entities" in payload:
+            return web.json_response({"success": True})
+        return web.json_response(self._entity(entities[entity_id]))
+
+    async def update_entity(
+        self, request: web.Request, project_id: str, dataset: str, entity_id: str
+    ) -> web.Response:
+        """Update an entity's label and data."""
+        payload = await read_payload(request)
+        entities = self._dataset(project_id, dataset)["entities"]
+        row = entities.setdefault(entity_id, {"__id": entity_id, "__system": {}})
+        row.update(payload.get("data") or {})
+        if payload.get("label"):
+            row["label"] = payload["label"]
+        row["__system"]["version"] = row["__system"].get("version", 1) + 1
+        return web.json_response(self._entity(row))
+
+    def _entity(self, row: dict) -> dict:
+        version = row["__system"].get("version", 1)
+        return {
+            "uuid": row["__id"],
+            "creatorId": 1,
+            "createdAt": now_iso(),
+            "currentVersion": {
+                "label": row.get("label") or "",
+                "current": True,
+                "createdAt": now_iso(),
+                "creatorId": 1,
+                "userAgent": APP_NAME,
+                "version": version,
+            },
+        }
+
+    async def create_form(self, request: web.Request, project_id: str):
+        """Create a form from an XForm, reading the form id from the XML."""
+        body = await request.text()
+        match = re.search(r"<instance>\s*<[^>]*?\sid=\"([^\"]+)\"", body)
+        form_id = match.group(1) if match else f"form_{next(self.ids)}"
+        return web.json_response(
+            {
+                "projectId": int(project_id),
+                "xmlFormId": form_id,
+                "version": "1",
+                "hash": uuid4().hex,
+                "state": "open",
+                "createdAt": now_iso(),
+                "name": form_id,
+                "enketoId": None,
+                "keyId": None,
+                "updatedAt": None,
+                "publishedAt": None,
+            }
+        )
+
+    async def create_app_user(self, request: web.Request, project_id: str):
+        """Create an app user, returning its token."""
+        payload = await read_payload(request)
+        return web.json_response(
+            {
+                "id": next(self.ids),
+                "type": "field_key",
+                "displayName": payload.get("displayName"),
+                "token": uuid4().hex,
+                "projectId": int(project_id),
+                "createdAt": now_iso(),
+            }
+        )
+
+
+class FakeQFieldCloud(FakeService):
+    """QFieldCloud API, as used by qfieldcloud-sdk."""
+
+    name = "qfc"
+    prefix = "/qfc/api/v1/"
+
+    def __init__(self):
+        """Register the QFieldCloud routes used during project creation."""
+        super().__init__()
+        self.projects: dict[str, dict] = {}
+        self.collaborators: dict[str, dict[str, str]] = defaultdict(dict)
+        self.members: dict[str, set[str]] = defaultdict(set)
+
+        self.add("POST", "auth/login", self.login)
+        self.add("POST", "auth/logout", self.logout)
+        self.add("POST", "users", self.create_user)
+        self.add("GET", "projects", self.list_projects)
+        self.add("POST", "projects", self.create_project)
+        self.add("GET", "projects/{project_id}", self.get_project)
+        self.add("DELETE", "projects/{project_id}", self.delete_project)
+        self.add("POST", "files/{project_id}/{filename}", self.upload_file)
+        self.add("GET", "collaborators/{project_id}", self.list_collaborators)
+        self.add("POST", "collaborators/{project_id}", self.add_collaborator)
+        self.add(
+            "PATCH", "collaborators/{project_id}/{username}", self.add_collaborator
+        )
+        self.add(
+            "DELETE",
+            "collaborators/{project_id}/{username}",
+            self.remove_collaborator,
+        )
+        self.add("GET", "members/{organization}", self.list_members)
+        self.add("POST", "members/{organization}", self.add_member)
+
+    async def login(self, request: web.Request) -> web.Response:
+        """Log in, returning a token."""
+        payload = await read_payload(request)
+        return web.json_response(
+            {
+                "token": uuid4().hex,
+                "username": payload.get("username"),
+                "expires_at": now_iso(),
+            }
+        )
+
+    async def logout(self, request: web.Request) -> web.Response:
+        """Log out."""
+        return web.json_response({"detail": "Successfully logged out."})
+
+    async def create_user(self, request: web.Request) -> web.Response:
+        """Create a user account."""
+        payload = await read_payload(request)
+        return web.json_response(
+            {"username": payload.get("username"), "email": payload.get("email")},
+            status=201,
+        )
+
+    async def list_projects(self, request: web.Request) -> web.Response:
+        """List projects created on this stand-in."""
+        return web.json_response(list(self.projects.values()))
+
+    async def create_project(self, request: web.Request) -> web.Response:
+        """Create a project."""
+        payload = await read_payload(request)
+        project_id = str(uuid4())
+        project = {
+            "id": project_id,
+            "name": payload.get("name"),
+            "owner": payload.get("owner") or "loadtest",
+            "description": payload.get("description", ""),
+            "is_public": False,
+            "created_at": now_iso(),
+        }
+        self.projects[project_id] = project
+        return web.json_response(project, status=201)
+
+    async def get_project(self, request: web.Request, project_id: str):
+        """Get a project."""
+        project = self.projects.get(project_id)
+        if not project:
+            return web.json_response({"code": "object_not_found"}, status=404)
+        return web.json_response(project)
+
+    async def delete_project(self, request: web.Request, project_id: str):
+        """Delete a project."""
+        self.projects.pop(project_id, None)
+        self.collaborators.pop(project_id, None)
+        return web.Response(status=204)
+
+    async def upload_file(self, request: web.Request, project_id: str, filename: str):
+        """Accept (and discard) an uploaded project file."""
+        size = len(await request.read())
+        return web.json_response({"name": filename, "size": size}, status=201)
+
+    async def list_collaborators(self, request: web.Request, project_id: str):
+        """List project collaborators."""
+        return web.json_response(
+            [
+                {"collaborator": username, "role": role}
+                for username, role in self.collaborators[project_id].items()
+            ]
+        )
+
+    async def add_collaborator(
+        self, request: web.Request, project_id: str, username: str | None = None
+    ) -> web.Response:
+        """Add a collaborator, or change their role."""
+        payload = await read_payload(request)
+        username = username or payload.get("collaborator")
+        self.collaborators[project_id][username] = payload.get("role", "reader")
+        return web.json_response(
+            {"collaborator": username, "role": self.collaborators[project_id][username]}
+        )
+
+    async def remove_collaborator(
+        self, request: web.Request, project_id: str, username: str
+    ) -> web.Response:
+        """Remove a collaborator."""
+        self.collaborators[project_id].pop(username, None)
+        return web.Response(status=204)
+
+    async def list_members(self, request: web.Request, organization: str):
+        """List organization members."""
+        return web.json_response(
+            [
+                {"member": username, "role": "member"}
+                for username in self.members[organization]
+            ]
+        )
+
+    async def add_member(self, request: web.Request, organization: str):
+        """Add an organization member."""
+        payload = await read_payload(request)
+        self.members[organization].add(payload.get("member"))
+        return web.json_response({"member": payload.get("member"), "role": "member"})
+
+
+class FakeRawDataApi(FakeService):
+    """raw-data-api, as used by raw-data-api-py (snapshot, poll, download)."""
+
+    name = "raw-data"
+    prefix = "/raw-data/v1/"
+
+    def __init__(self, features_per_extract: int):
+        """Register the snapshot routes."""
+        super().__init__()
+        self.features_per_extract = features_per_extract
+        # task id -> (bbox, geometry type)
+        self.tasks: dict[str, tuple[tuple, str]] = {}
+
+        self.add("POST", "snapshot", self.create_snapshot)
+        self.add("GET", "tasks/status/{task_id}", self.task_status)
+        self.add("GET", "downloads/{task_id}.geojson", self.download)
+
+    async def create_snapshot(self, request: web.Request) -> web.Response:
+        """Queue an extract. raw-data-api-py sends JSON without a content type."""
+        payload = json.loads(await request.read())
+        task_id = uuid4().hex
+        geom_types = payload.get("geometryType") or ["polygon"]
+        self.tasks[task_id] = (geometry_bbox(payload["geometry"]), geom_types[0])
+        return web.json_response(
+            {"task_id": task_id, "track_link": f"/tasks/status/{task_id}/"}
+        )
+
+    async def task_status(self, request: web.Request, task_id: str):
+        """Report the extract as finished, with a download link."""
+        if task_id not in self.tasks:
+            return web.json_response({"detail": "Task not found"}, status=404)
+        bbox, _geom_type = self.tasks[task_id]
+        download_url = (
+            f"{request.scheme}://{request.host}{self.prefix}downloads/{task_id}.geojson"
+        )
+        return web.json_response(
+            {
+                "id": task_id,
+                "status": "SUCCESS",
+                "result": {
+                    "download_url": download_url,
+                    "file_name": task_id,
+                    "response_time": "0:00:01",
+                    "query_area": "1 Sq Km",
+                    "queryArea": f"bbox[{','.join(str(value) for value in bbox)}]",
+                    "zip_file_size_bytes": 0,
+                },
+            }
+        )
+
+    async def download(self, request: web.Request, task_id: str):
+        """Return the extract GeoJSON, then forget the task."""
+        if task_id not in self.tasks:
+            return web.json_response({"detail": "Task not found"}, status=404)
+        bbox, geom_type = self.tasks.pop(task_id)
+        return web.json_response(
+            make_osm_features(bbox, geom_type, self.features_per_extract)
+        )
+
+
+class FakeQgisWrapper(FakeService):
+    """QGIS wrapper: writes output files for a job to the qgis_jobs table."""
+
+    name = "qgis"
+    prefix = "/qgis/"
+
+    def __init__(self, db_url: str):
+        """Register the wrapper routes."""
+        super().__init__()
+        self.db_url = db_url
+        self.output_files = self._build_output_files()
+
+        self.add("POST", "", self.generate)
+        self.add("POST", "basemap", self.generate)
+
+    @staticmethod
+    def _build_output_files() -> dict[str, str]:
+        """A minimal .qgz (a zip holding a .qgs), base64 encoded."""
+        qgz = io.BytesIO()
+        with zipfile.ZipFile(qgz, "w") as archive:
+            archive.writestr("project.qgs", '<qgis version="3.40"></qgis>')
+        return {"project.qgz": base64.b64encode(qgz.getvalue()).decode()}
+
+    async def generate(self, request: web.Request) -> web.Response:
+        """Write the job outputs, as the real wrapper does on success."""
+        import psycopg
+
+        payload = await read_payload(request)
+        async with await psycopg.AsyncConnection.connect(
+            self.db_url, application_name=APP_NAME, autocommit=True
+        ) as db:
+            await db.execute(
+                "UPDATE qgis_jobs SET output_files = %s WHERE job_id = %s",
+                (json.dumps(self.output_files), payload["job_id"]),
+            )
+        return web.json_response({"status": "success"})
+
+
+def build_fakes_app(
+    services: list[FakeService],
+    latency_ms: dict[str, float],
+    jitter: float,
+) -> web.Application:
+    """Serve all stand-ins from one app, dispatching on path prefix."""
+    rng = random.Random()  # noqa: S311
+    counts: dict[str, int] = defaultdict(int)
+
+    async def handle(request: web.Request) -> web.StreamResponse:
+        for service in services:
+            if request.path.startswith(service.prefix.rstrip("/")):
+                break
+        else:
+            return web.json_response({"message": "Unknown service"}, status=404)
+
+        delay = latency_ms.get(service.name, latency_ms["default"]) / 1000
+        if delay:
+            await asyncio.sleep(delay * rng.uniform(1 - jitter, 1 + jitter))
+        counts[f"{service.name} {request.method}"] += 1
+        return await service.dispatch(
+            request, request.path.removeprefix(service.prefix.rstrip("/")).strip("/")
+        )
+
+    async def stats(_request: web.Request) -> web.Response:
+        return web.json_response(dict(counts))
+
+    app = web.Application(client_max_size=1024**3)
+    app.router.add_get("/__stats__", stats)
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+def parse_latencies(values: list[str], default_ms: float) -> dict[str, float]:
+    """Parse repeated SERVICE=MS options into a dict."""
+    latency_ms = {"default": default_ms}
+    for value in values:
+        service, _, ms = value.partition("=")
+        latency_ms[service] = float(ms)
+    return latency_ms
+
+
+def run_fakes(args: argparse.Namespace) -> int:
+    """Serve the stand-ins until interrupted."""
+    from app.config import settings
+
+    services = [
+        FakeOdkCentral(),
+        FakeQFieldCloud(),
+        FakeRawDataApi(args.extract_features),
+        FakeQgisWrapper(settings.FTM_DB_URL),
+    ]
+    latency_ms = parse_latencies(args.service_latency, args.latency_ms)
+    print(
+        f"Serving {', '.join(service.prefix for service in services)} "
+        f"on {args.host}:{args.port} (latency {latency_ms} ms)",
+        flush=True,
+    )
+    web.run_app(
+        build_fakes_app(services, latency_ms, args.jitter),
+        host=args.host,
+        port=args.port,
+        print=None,
+    )
+    return 0
+
+
+# --------------------------------------------------------------------------
+# Load generator
+# --------------------------------------------------------------------------
+
+
+@dataclass
+class RouteStats:
+    """Timings and failures for one route."""
+
+    durations: list[float] = field(default_factory=list)
+    errors: int = 0
+    error_samples: list[str] = field(default_factory=list)
+
+    def summary(self, elapsed: float) -> dict:
+        """Count, throughput and latency percentiles in milliseconds."""
+        durations = sorted(self.durations)
+        result = {
+            "requests": len(durations),
+            "errors": self.errors,
+            "rps": len(durations) / elapsed if elapsed else 0.0,
+        }
+        if not durations:
+            return result
+        if len(durations) >= MIN_PERCENTILE_SAMPLES:
+            cuts = quantiles(durations, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        else:
+            p50 = p95 = p99 = durations[0]
+        result.update(
+            {
+                "mean_ms": fmean(durations) * 1000,
+                "p50_ms": p50 * 1000,
+                "p95_ms": p95 * 1000,
+                "p99_ms": p99 * 1000,
+                "max_ms": durations[-1] * 1000,
+            }
+        )
+        return result
+
+
+@dataclass
+class PoolSamples:
+    """Samples of app DB connections from pg_stat_activity."""
+
+    busy: list[int] = field(default_factory=list)
+    total: list[int] = field(default_factory=list)
+
+    def summary(self, pool_size: int) -> dict:
+        """Peak/mean busy connections, and time spent at pool capacity."""
+        if not self.busy:
+            return {"samples": 0}
+        saturated = sum(1 for busy in self.busy if busy >= pool_size)
+        return {
+            "samples": len(self.busy),
+            "pool_size": pool_size,
+            "busy_peak": max(self.busy),
+            "busy_mean": fmean(self.busy),
+            "connections_peak": max(self.total),
+            "saturated_pct": saturated / len(self.busy) * 100,
+        }
+
+
+class LoadTest:
+    """Virtual users running weighted scenarios against the backend."""
+
+    def __init__(self, args: argparse.Namespace, api_key: str, template_id: int):
+        """Store options and prepare empty results."""
+        self.args = args
+        self.base_url = args.base_url.rstrip("/")
+        self.fakes_url = args.fakes_url.rstrip("/")
+        self.api_key = api_key
+        self.template_id = template_id
+        self.project_ids: list[int] = []
+        self.stats: dict[str, RouteStats] = defaultdict(RouteStats)
+        self.pool = PoolSamples()
+        self.rng = random.Random(args.seed)  # noqa: S311
+        self.scenarios = {
+            "htmx": self.htmx_pages,
+            "api": self.api_reads,
+            "create-odk": self.create_odk_project,
+            "create-qfield": self.create_qfield_project,
+        }
+
+    async def request(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        path: str,
+        route: str | None = None,
+        **kwargs,
+    ) -> dict | list | None:
+        """Time one request, recording it under a route label.
+
+        Returns the decoded JSON body, if any.
+        """
+        stats = self.stats[route or f"{method} {path}"]
+        start = perf_counter()
+        try:
+            async with session.request(
+                method, f"{self.base_url}{path}", **kwargs
+            ) as response:
+                body = await response.read()
+                elapsed = perf_counter() - start
+                if response.status >= 400:  # noqa: PLR2004
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        (),
+                        status=response.status,
+                        message=body[:200].decode(errors="replace"),
+                    )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            stats.errors += 1
+            if len(stats.error_samples) < MAX_ERRORS_KEPT:
+                stats.error_samples.append(str(exc) or type(exc).__name__)
+            return None
+
+        stats.durations.append(elapsed)
+        if response.content_type == "application/json" and body:
+            return json.loads(body)
+        return None
+
+    async def htmx_pages(self, session: aiohttp.ClientSession) -> None:
+        """Browse the landing page, project listing and a project."""
+        await self.request(session, "GET", "/")
+        await self.request(session, "GET", "/metrics", headers={"HX-Request": "true"})
+        await self.request(session, "GET", "/projects")
+        await self.request(
+            session, "GET", "/projects?search=test", route="GET /projects?search"
+        )
+        if self.project_ids:
+            project_id = self.rng.choice(self.project_ids)
+            await self.request(
+                session, "GET", f"/projects/{project_id}", route="GET /projects/{id}"
+            )
+
+    async def api_reads(self, session: aiohttp.ClientSession) -> None:
+        """List projects and fetch one via the JSON API."""
+        projects = await self.request(session, "GET", "/api/v1/projects")
+        if projects:
+            self.project_ids = [project["id"] for project in projects]
+        if self.project_ids:
+            project_id = self.rng.choice(self.project_ids)
+            await self.request(
+                session,
+                "GET",
+                f"/api/v1/projects/{project_id}",
+                route="GET /api/v1/projects/{id}",
+            )
+
+    def _create_payload(self, field_mapping_app: str) -> dict:
+        """Project creation payload with an AOI, template form and splitting."""
+        aoi = make_aoi(self.rng)
+        payload = {
+            "project_name": f"load-test-{uuid4()}",
+            "field_mapping_app": field_mapping_app,
+            "description": "Created by tasks/scripts/load_test.py",
+            "outline": aoi,
+            "hashtags": ["#loadtest"],
+            "template_form_id": self.template_id,
+            "use_odk_collect": field_mapping_app == "ODK",
+            "geom_type": "POLYGON",
+            "algorithm": "DIVIDE_BY_SQUARE",
+            "dimension_meters": 100,
+            "cleanup": True,
+        }
+        if self.args.extract == "inline":
+            payload["geojson"] = make_osm_features(
+                geometry_bbox(aoi), "polygon", self.args.extract_features
+            )
+        else:
+            payload["osm_category"] = "buildings"
+        return payload
+
+    async def create_odk_project(self, session: aiohttp.ClientSession) -> None:
+        """Create and finalize an ODK project against the Central stand-in."""
+        payload = self._create_payload("ODK")
+        payload.update(
+            {
+                "external_project_instance_url": f"{self.fakes_url}/odk",
+                "external_project_username": FAKE_USER,
+                "external_project_password": FAKE_PASSWORD,
+            }
+        )
+        await self.request(
+            session,
+            "POST",
+            "/api/v1/projects",
+            route="POST /api/v1/projects (ODK)",
+            json=payload,
+            headers={"X-API-KEY": self.api_key},
+        )
+
+    async def create_qfield_project(self, session: aiohttp.ClientSession) -> None:
+        """Create and finalize a QField project against the QFieldCloud stand-in."""
+        payload = self._create_payload("QField")
+        payload.update(
+            {
+                "qfield_cloud_url": f"{self.fakes_url}/qfc",
+                "qfield_cloud_user": "loadtest",
+                "qfield_cloud_password": FAKE_PASSWORD,
+            }
+        )
+        await self.request(
+            session,
+            "POST",
+            "/api/v1/projects",
+            route="POST /api/v1/projects (QField)",
+            json=payload,
+            headers={"X-API-KEY": self.api_key},
+        )
+
+    async def virtual_user(
+        self, session: aiohttp.ClientSession, index: int, deadline: float
+    ) -> None:
+        """Run weighted scenarios back to back until the deadline."""
+        await asyncio.sleep(self.args.ramp_up * index / self.args.concurrency)
+        names = list(self.args.weights)
+        weights = [self.args.weights[name] for name in names]
+        while perf_counter() < deadline:
+            name = self.rng.choices(names, weights)[0]
+            await self.scenarios[name](session)
+
+    async def sample_pool(self, db_url: str, stop: asyncio.Event) -> None:
+        """Count the app's busy and open DB connections until stopped."""
+        import psycopg
+
+        async with await psycopg.AsyncConnection.connect(
+            db_url, application_name=APP_NAME, autocommit=True
+        ) as db:
+            while not stop.is_set():
+                cur = await db.execute(
+                    """
+                    SELECT
+                        count(*) FILTER (WHERE state <> 'idle'),
+                        count(*)
+                    FROM pg_stat_activity
+                    WHERE datname = current_database()
+                        AND usename = current_user
+                        AND backend_type = 'client backend'
+                        AND application_name <> %s
+                    """,
+                    (APP_NAME,),
+                )
+                busy, total = await cur.fetchone()
+                self.pool.busy.append(busy)
+                self.pool.total.append(total)
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop.wait(), SATURATION_SAMPLE_SECONDS)
+
+    async def run(self, db_url: str) -> float:
+        """Run the load test, returning the elapsed seconds."""
+        timeout = aiohttp.ClientTimeout(total=self.args.timeout)
+        connector = aiohttp.TCPConnector(limit=self.args.concurrency)
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(self.sample_pool(db_url, stop))
+
+        start = perf_counter()
+        deadline = start + self.args.duration
+        async with aiohttp.ClientSession(
+            timeout=timeout, connector=connector
+        ) as session:
+            await self.api_reads(session)
+            await asyncio.gather(
+                *(
+                    self.virtual_user(session, index, deadline)
+                    for index in range(self.args.concurrency)
+                )
+            )
+        elapsed = perf_counter() - start
+
+        stop.set()
+        await sampler
+        return elapsed
+
+    def report(self, elapsed: float) -> dict:
+        """Print a table of per-route latency and pool saturation."""
+        routes = {
+            route: stats.summary(elapsed) for route, stats in sorted(self.stats.items())
+        }
+        pool = self.pool.summary(self.args.pool_size)
+
+        print(
+            f"\n{'route':<40} {'reqs':>6} {'errs':>5} {'rps':>7} "
+            f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+        )
+        for route, summary in routes.items():
+            print(
+                f"{route:<40} {summary['requests']:>6} {summary['errors']:>5} "
+                f"{summary['rps']:>7.2f} {summary.get('p50_ms', 0):>9.1f} "
+                f"{summary.get('p95_ms', 0):>9.1f} {summary.get('p99_ms', 0):>9.1f}"
+            )
+
+        if pool["samples"]:
+            print(
+                f"\nDB pool ({pool['samples']} samples, size {pool['pool_size']}): "
+                f"busy peak {pool['busy_peak']}, mean {pool['busy_mean']:.1f}, "
+                f"open peak {pool['connections_peak']}, "
+                f"saturated {pool['saturated_pct']:.0f}% of the time"
+            )
+
+        for route, stats in sorted(self.stats.items()):
+            for sample in stats.error_samples:
+                print(f"  {route}: {sample}")
+
+        return {
+            "elapsed_seconds": elapsed,
+            "concurrency": self.args.concurrency,
+            "weights": self.args.weights,
+            "routes": routes,
+            "db_pool": pool,
+        }
+
+
+async def setup_load_test(db_url: str) -> tuple[str, int]:
+    """Create an API key for localadmin, and find the buildings template."""
+    import psycopg
+
+    from app.auth.api_key import generate_api_key, hash_api_key
+    from app.auth.auth_schemas import AuthUser
+    from app.auth.user_crud import get_or_create_user
+    from app.db.models import DbApiKey, DbTemplateXLSForm
+
+    async with await psycopg.AsyncConnection.connect(
+        db_url, application_name=APP_NAME
+    ) as db:
+        user = await get_or_create_user(
+            db, AuthUser(sub="custom|1", username="localadmin", is_admin=True)
+        )
+        api_key = generate_api_key()
+        await DbApiKey.create(
+            db,
+            DbApiKey(user_sub=user.sub, key_hash=hash_api_key(api_key), name=APP_NAME),
+        )
+        await db.commit()
+
+        templates = await DbTemplateXLSForm.all(db) or []
+
+    template_id = next(
+        (t["id"] for t in templates if "building" in t["title"].lower()), None
+    )
+    if template_id is None:
+        raise SystemExit("Buildings XLSForm template not found in the database")
+    return api_key, template_id
+
+
+def parse_weights(values: list[str]) -> dict[str, float]:
+    """Parse repeated SCENARIO=WEIGHT options into a dict."""
+    weights = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+async def run_load_test(args: argparse.Namespace) -> int:
+    """Run the load test and print (and optionally save) the report."""
+    from app.config import settings
+
+    args.weights = parse_weights(args.scenario)
+    unknown = set(args.weights) - {"htmx", "api", "create-odk", "create-qfield"}
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    api_key, template_id = await setup_load_test(settings.FTM_DB_URL)
+    load_test = LoadTest(args, api_key, template_id)
+    print(
+        f"Running {args.concurrency} virtual users for {args.duration}s "
+        f"against {args.base_url} (scenarios {args.weights})",
+        flush=True,
+    )
+    elapsed = await load_test.run(settings.FTM_DB_URL)
+    results = load_test.report(elapsed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+    return 1 if any(route["errors"] for route in results["routes"].values()) else 0
+
+
+def main() -> int:
+    """Parse arguments and run the selected command."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fakes = commands.add_parser("fakes", help="Serve the external service stand-ins")
+    fakes.add_argument("--host", default="0.0.0.0")  # noqa: S104
+    fakes.add_argument("--port", type=int, default=DEFAULT_FAKES_PORT)
+    fakes.add_argument(
+        "--latency-ms", type=float, default=50, help="Added to every response"
+    )
+    fakes.add_argument(
+        "--service-latency",
+        action="append",
+        default=[],
+        metavar="SERVICE=MS",
+        help="Per-service latency: odk, qfc, raw-data or qgis (repeatable)",
+    )
+    fakes.add_argument(
+        "--jitter", type=float, default=0.2, help="Random latency variation (0-1)"
+    )
+    fakes.add_argument(
+        "--extract-features",
+        type=int,
+        default=200,
+        help="Features returned per raw-data-api extract",
+    )
+
+    run = commands.add_parser("run", help="Run the load generator")
+    run.add_argument("--base-url", default="http://localhost:8000")
+    run.add_argument("--fakes-url", default=DEFAULT_FAKES_URL)
+    run.add_argument("--concurrency", type=int, default=10)
+    run.add_argument("--duration", type=float, default=60, help="Seconds")
+    run.add_argument(
+        "--ramp-up", type=float, default=5, help="Seconds to start all users"
+    )
+    run.add_argument(
+        "--scenario",
+        action="append",
+        metavar="NAME=WEIGHT",
+        help=(
+            "Scenario to run, one of htmx, api, create-odk, create-qfield "
+            "(repeatable; default htmx=6 api=3 create-odk=1)"
+        ),
+    )
+    run.add_argument(
+        "--extract",
+        choices=["osm", "inline"],
+        default="osm",
+        help="Fetch project data extracts from the raw-data-api stand-in, "
+        "or send them inline",
+    )
+    run.add_argument("--extract-features", type=int, default=200)
+    run.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Total DB pool capacity across workers, to measure saturation",
+    )
+    run.add_argument("--timeout", type=float, default=300, help="Per request")
+    run.add_argument("--seed", type=int, default=None)
+    run.add_argument("--output", help="Write results as JSON to this path")
+
+    args = parser.parse_args()
+    if args.command == "fakes":
+        return run_fakes(args)
+    args.scenario = args.scenario or ["htmx=6", "api=3", "create-odk=1"]
+    return asyncio.run(run_load_test(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())